@@ -1,9 +1,4 @@
-import json
-import os
-import sys
-import uuid
-import requests
-from typing import List, Dict, Optional
+from kore_client import AgentProfile, run_agent
 
 API_KEY = "<your_api_key>"
 BASE_URL = "https://api.on-demand.io/chat/v1"
@@ -135,7 +130,7 @@ COMMAND FORMATTING:
 - Handle paths with spaces (quotes)
 - Escape special characters
 
-Be precise, safe, and helpful in development tasks."
+Be precise, safe, and helpful in development tasks."""
 STOP_SEQUENCES = []  # Dynamic list
 TEMPERATURE = 0.7
 TOP_P = 1
@@ -146,262 +141,26 @@ FREQUENCY_PENALTY = 0
 # File upload configuration
 FILE_PATH = "<path_to_your_file>"  # e.g., "/Users/username/Downloads/image.png"
 FILE_NAME = "<file_name>"  # e.g., "image.png"
-CREATED_BY = "AIREV"
-UPDATED_BY = "AIREV"
-"""
-class ContextField:
-    def __init__(self, key: str, value: str):
-        self.key = key
-        self.value = value
 
-class SessionData:
-    def __init__(self, id: str, context_metadata: List[ContextField]):
-        self.id = id
-        self.context_metadata = context_metadata
-
-class CreateSessionResponse:
-    def __init__(self, data: SessionData):
-        self.data = data
-
-class MediaUploadResponse:
-    def __init__(self, data: Dict):
-        self.data = data
-
-def upload_media_file(file_path: str, file_name: str, agents: List[str], session_id: str) -> Optional[Dict]:
-    """
-    Upload a media file to the API
-
-    Args:
-        file_path: Path to the file to upload
-        file_name: Name for the uploaded file
-        plugins: List of plugin IDs to process the file
-
-    Returns:
-        Dictionary containing upload response data or None if failed
-    """
-    url = f"{MEDIA_BASE_URL}/public/file/raw"
-
-    if not os.path.exists(file_path):
-        print(f"❌ File not found: {file_path}")
-        return None
-
-    print(f"\n--- Uploading Media File ---")
-    print(f"📁 File: {file_path}")
-    print(f"📝 Name: {file_name}")
-    print(f"🔌 Plugins: {plugins}")
-
-    headers = {
-        "apikey": API_KEY
-    }
-
-    # Prepare multipart form data
-    files = {
-        'file': (os.path.basename(file_path), open(file_path, 'rb'))
-    }
-
-    data = {
-        'createdBy': CREATED_BY,
-        'updatedBy': UPDATED_BY,
-        'name': file_name,
-        'responseMode': RESPONSE_MODE,
-        "sessionId": session_id,
-    }
-
-    # Add plugins to the form data
-    for agent in agents:
-        if 'agents' not in data:
-            data['agents'] = []
-        data['agents'].append(agent)
-
-    try:
-        response = requests.post(url, headers=headers, files=files, data=data)
-
-        if response.status_code == 201 or response.status_code == 200:
-            media_response = response.json()
-            print(f"✅ Media file uploaded successfully!")
-            print(f"📄 File ID: {media_response['data']['id']}")
-            print(f"🔗 URL: {media_response['data']['url']}")
-
-            if 'context' in media_response['data']:
-                print(f"📋 Context: {media_response['data']['context'][:200]}...")
-
-            return media_response['data']
-        else:
-            print(f"❌ Error uploading media file: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"❌ Exception during file upload: {str(e)}")
-        return None
-    finally:
-        files['file'][1].close()
+PROFILE = AgentProfile(
+    name="Code Assistant",
+    agent_ids=AGENT_IDS,
+    file_agent_ids=FILE_AGENT_IDS,
+    endpoint_id=ENDPOINT_ID,
+    reasoning_mode=REASONING_MODE,
+    response_mode=RESPONSE_MODE,
+    fulfillment_prompt=FULFILLMENT_PROMPT,
+    stop_sequences=STOP_SEQUENCES,
+    temperature=TEMPERATURE,
+    top_p=TOP_P,
+    max_tokens=MAX_TOKENS,
+    presence_penalty=PRESENCE_PENALTY,
+    frequency_penalty=FREQUENCY_PENALTY,
+)
 
 def main():
-    if API_KEY == "<your_api_key>" or not API_KEY:
-        print("❌ Please set API_KEY.")
-        sys.exit(1)
-
-    global EXTERNAL_USER_ID
-    if EXTERNAL_USER_ID == "<your_external_user_id>" or not EXTERNAL_USER_ID:
-        EXTERNAL_USER_ID = str(uuid.uuid4())
-        print(f"⚠️  Generated EXTERNAL_USER_ID: {EXTERNAL_USER_ID}")
-
-
-    context_metadata = [
-        {"key": "userId", "value": "1"},
-        {"key": "name", "value": "John"},
-    ]
-
-
-    session_id = create_chat_session(context_metadata)
-    if session_id:
-        print("\n--- Submitting Query ---")
-        print(f"Using query: '{QUERY}'")
-        print(f"Using responseMode: '{RESPONSE_MODE}'")
-        # Optional: Upload media file if configured
-        media_data = None
-        if FILE_PATH != "<path_to_your_file>" and FILE_PATH and os.path.exists(FILE_PATH):
-            media_data = upload_media_file(FILE_PATH, FILE_NAME, FILE_AGENT_IDS, session_id)
-            if media_data:
-                print(f"\n✅ Media uploaded. You can reference it in your query or session.")
-        submit_query(session_id, context_metadata)
-
-def create_chat_session(context_metadata: List[Dict[str, str]]) -> str:
-    url = BASE_URL + "/sessions"
-
-    body = {
-        "agentIds": AGENT_IDS,
-        "externalUserId": EXTERNAL_USER_ID,
-        "contextMetadata": context_metadata,
-    }
-
-    json_body = json.dumps(body)
-
-    print(f"\n--- Creating Chat Session ---")
-    print(f"📡 Creating session with URL: {url}")
-    print(f"📝 Request body: {json_body}")
-
-    headers = {
-        "apikey": API_KEY,
-        "Content-Type": "application/json"
-    }
-
-    response = requests.post(url, data=json_body, headers=headers)
-
-    if response.status_code == 201:
-        session_resp_data = response.json()
-        session_data = SessionData(
-            id=session_resp_data["data"]["id"],
-            context_metadata=[ContextField(field["key"], field["value"]) for field in session_resp_data["data"].get("contextMetadata", [])]
-        )
-        session_resp = CreateSessionResponse(data=session_data)
-
-        print(f"✅ Chat session created. Session ID: {session_resp.data.id}")
-
-        if session_resp.data.context_metadata:
-            print("📋 Context Metadata:")
-            for field in session_resp.data.context_metadata:
-                print(f" - {field.key}: {field.value}")
-
-        return session_resp.data.id
-    else:
-        print(f"❌ Error creating chat session: {response.status_code} - {response.text}")
-        return ""
-
-def submit_query(session_id: str, context_metadata: List[Dict[str, str]]):
-    url = f"{BASE_URL}/sessions/{session_id}/query"
-    body = {
-        "endpointId": ENDPOINT_ID,
-        "query": QUERY,
-        "agentIds": AGENT_IDS,
-        "responseMode": RESPONSE_MODE,
-        "reasoningMode": REASONING_MODE,
-        "modelConfigs": {
-            "fulfillmentPrompt": FULFILLMENT_PROMPT,
-            "stopSequences": STOP_SEQUENCES,
-            "temperature": TEMPERATURE,
-            "topP": TOP_P,
-            "maxTokens": MAX_TOKENS,
-            "presencePenalty": PRESENCE_PENALTY,
-            "frequencyPenalty": FREQUENCY_PENALTY,
-        },
-    }
-
-    json_body = json.dumps(body)
-
-    print(f"🚀 Submitting query to URL: {url}")
-    print(f"📝 Request body: {json_body}")
-
-    headers = {
-        "apikey": API_KEY,
-        "Content-Type": "application/json"
-    }
-
-    response = requests.post(url, data=json_body, headers=headers, stream=RESPONSE_MODE == "stream")
-
-    print()
-
-    if RESPONSE_MODE == "sync":
-        if response.status_code == 200:
-            original = response.json()
-
-            # Append context metadata at the end
-            if "data" in original:
-                original["data"]["contextMetadata"] = context_metadata
-
-            final = json.dumps(original, indent=2)
-            print("✅ Final Response (with contextMetadata appended):")
-            print(final)
-        else:
-            print(f"❌ Error submitting sync query: {response.status_code} - {response.text}")
-    elif RESPONSE_MODE == "stream":
-        print("✅ Streaming Response...")
-
-        full_answer = ""
-        final_session_id = ""
-        final_message_id = ""
-        metrics = {}
-
-        for line in response.iter_lines():
-            if line:
-                line_str = line.decode('utf-8').strip()
-
-                if line_str.startswith("data:"):
-                    data_str = line_str[len("data:"):].strip()
-
-                    if data_str == "[DONE]":
-                        break
-
-                    try:
-                        event = json.loads(data_str)
-                    except json.JSONDecodeError:
-                        continue
-
-                    if event.get("eventType") == "fulfillment":
-                        if "answer" in event:
-                            full_answer += event["answer"]
-                        if "sessionId" in event:
-                            final_session_id = event["sessionId"]
-                        if "messageId" in event:
-                            final_message_id = event["messageId"]
-                    elif event.get("eventType") == "metricsLog":
-                        if "publicMetrics" in event:
-                            metrics = event["publicMetrics"]
-
-        final_response = {
-            "message": "Chat query submitted successfully",
-            "data": {
-                "sessionId": final_session_id,
-                "messageId": final_message_id,
-                "answer": full_answer,
-                "metrics": metrics,
-                "status": "completed",
-                "contextMetadata": context_metadata,
-            },
-        }
-
-        formatted = json.dumps(final_response, indent=2)
-        print("\n✅ Final Response (with contextMetadata appended):")
-        print(formatted)
+    run_agent(PROFILE, QUERY, API_KEY, EXTERNAL_USER_ID, file_path=FILE_PATH, file_name=FILE_NAME,
+              base_url=BASE_URL, media_base_url=MEDIA_BASE_URL)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: app catalog vs. os.walk over a synthetic Program Files tree
+Times the old per-call os.walk search, the one-off catalog build, load from disk,
+lookups (exact, vendor-less alias, fuzzy) and an incremental refresh after one
+install and one uninstall
+
+Usage: python benchmarks/bench_app_catalog.py [--apps 400] [--files-per-app 500]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kore_app_catalog import AppCatalog
+
+VENDORS = ["Microsoft", "Adobe", "Google", "Mozilla", "JetBrains", "Autodesk", "Oracle"]
+PRODUCTS = ["Photo Studio", "Code Forge", "Sound Mixer", "Map Viewer", "Note Keeper", "Tax Planner",
+            "Video Cutter", "Chess Master", "Mail Desk", "Data Grid"]
+
+
+def install_app(root, shortcut_root, vendor, product, files, rng):
+    """One install folder: nested resource folders, the app exe and some helper exes"""
+    group = os.path.join(root, f"{vendor} {product}")
+    folders = [group]
+    for i in range(max(files // 25, 1)):
+        folder = os.path.join(rng.choice(folders), rng.choice(["bin", "lib", "locales", "resources", "plugins"]) + f"_{i}")
+        os.makedirs(folder, exist_ok=True)
+        folders.append(folder)
+    for i in range(files):
+        ext = rng.choice([".dll", ".pak", ".json", ".png", ".dat"])
+        open(os.path.join(rng.choice(folders), f"res_{i}{ext}"), "w").close()
+
+    exe_name = product.replace(" ", "")
+    os.makedirs(os.path.join(group, "bin"), exist_ok=True)
+    for name in (exe_name, "unins000", f"{exe_name}Updater", "crashpad_handler"):
+        open(os.path.join(group, "bin", f"{name}.exe"), "w").close()
+    if shortcut_root and rng.random() < 0.5:
+        open(os.path.join(shortcut_root, f"{vendor} {product}.lnk"), "w").close()
+    return exe_name
+
+
+def walk_search(roots, app_name):
+    """The old open_application fallback"""
+    for base_path in roots:
+        for root, dirs, files in os.walk(base_path):
+            for file in files:
+                if app_name.lower() in file.lower() and file.endswith('.exe'):
+                    return os.path.join(root, file)
+    return None
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apps", type=int, default=400)
+    parser.add_argument("--files-per-app", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    workdir = tempfile.mkdtemp()
+    try:
+        program_files = os.path.join(workdir, "Program Files")
+        start_menu = os.path.join(workdir, "Start Menu", "Programs")
+        os.makedirs(program_files)
+        os.makedirs(start_menu)
+
+        installed = []
+        for i in range(args.apps):
+            vendor, product = rng.choice(VENDORS), f"{rng.choice(PRODUCTS)} {i}"
+            installed.append((vendor, product, install_app(program_files, start_menu, vendor, product,
+                                                           args.files_per_app, rng)))
+        print(f"synthetic Program Files: {args.apps} apps, ~{args.apps * args.files_per_app} files\n")
+
+        samples = rng.sample(installed, 5)
+        walk_ms = [timed(walk_search, [program_files], exe)[1] for _, _, exe in samples]
+        print(f"os.walk per launch:          {statistics.median(walk_ms):>10.1f} ms (median of 5)")
+
+        catalog = AppCatalog(path=os.path.join(workdir, "catalog.json"),
+                             exe_roots=[program_files], shortcut_roots=[start_menu])
+        count, build_ms = timed(catalog.build)
+        print(f"catalog build (once):        {build_ms:>10.1f} ms ({count} apps)")
+
+        reloaded = AppCatalog(path=catalog.path, exe_roots=[program_files], shortcut_roots=[start_menu])
+        _, load_ms = timed(reloaded.load)
+        print(f"catalog load from disk:      {load_ms:>10.1f} ms")
+
+        vendor, product, exe = samples[0]
+        queries = {
+            "exact name": f"{vendor} {product}",
+            "without vendor": product,
+            "exe name": exe,
+            "misspelled": product[0] + product[2:]
+        }
+        for label, query in queries.items():
+            target = reloaded.find(query)
+            assert target and (product in target or exe in target), (query, target)
+            _, total_ms = timed(lambda: [reloaded.find(query) for _ in range(args.lookups)])
+            print(f"lookup, {label:<20} {total_ms / args.lookups * 1000:>8.2f} us")
+
+        _, idle_ms = timed(reloaded.refresh)
+        print(f"\nrefresh, nothing changed:    {idle_ms:>10.1f} ms")
+
+        time.sleep(0.05)
+        shutil.rmtree(os.path.join(program_files, f"{installed[0][0]} {installed[0][1]}"))
+        new_exe = install_app(program_files, start_menu, "Adobe", "Brand New App", args.files_per_app, rng)
+        changed, refresh_ms = timed(reloaded.refresh)
+        print(f"refresh, 1 install/1 remove: {refresh_ms:>10.1f} ms ({changed} install folders re-scanned)")
+        assert reloaded.find("brand new app") and reloaded.find(new_exe)
+        print(f"\nstats: {reloaded.stats}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
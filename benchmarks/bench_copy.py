@@ -0,0 +1,96 @@
+"""
+Benchmark: kore_copy.copy_path vs. shutil.copytree
+Two trees: many small files (--small files of 1-16 KB in nested folders) and a few
+huge ones (--huge files of --huge-mb MB); each is copied with shutil.copytree and
+with the copy engine, and the copies are compared
+
+Usage: python benchmarks/bench_copy.py [--small 20000] [--huge 3] [--huge-mb 512] [--workers 8]
+"""
+
+import argparse
+import filecmp
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kore_copy import copy_path
+
+
+def make_small_tree(root, count, rng):
+    folders = [root]
+    os.makedirs(root)
+    for i in range(max(count // 100, 1)):
+        folder = os.path.join(rng.choice(folders), f"dir_{i}")
+        os.mkdir(folder)
+        folders.append(folder)
+    for i in range(count):
+        with open(os.path.join(rng.choice(folders), f"file_{i}.dat"), 'wb') as f:
+            f.write(os.urandom(rng.randint(1, 16) * 1024))
+
+
+def make_huge_tree(root, count, megabytes):
+    os.makedirs(root)
+    block = os.urandom(1024 * 1024)
+    for i in range(count):
+        with open(os.path.join(root, f"huge_{i}.bin"), 'wb') as f:
+            for _ in range(megabytes):
+                f.write(block)
+
+
+def same_tree(first, second):
+    comparison = filecmp.dircmp(first, second)
+    if comparison.left_only or comparison.right_only or comparison.diff_files:
+        return False
+    return all(same_tree(os.path.join(first, d), os.path.join(second, d)) for d in comparison.common_dirs)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--small", type=int, default=20000)
+    parser.add_argument("--huge", type=int, default=3)
+    parser.add_argument("--huge-mb", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    workdir = tempfile.mkdtemp()
+    try:
+        trees = {
+            f"{args.small} small files": os.path.join(workdir, "small"),
+            f"{args.huge} x {args.huge_mb} MB files": os.path.join(workdir, "huge"),
+        }
+        small_src, huge_src = trees.values()
+        make_small_tree(small_src, args.small, rng)
+        make_huge_tree(huge_src, args.huge, args.huge_mb)
+
+        for label, source in trees.items():
+            _, copytree_s = timed(shutil.copytree, source, source + "_copytree")
+            updates = []
+            result, engine_s = timed(copy_path, source, source + "_engine", workers=args.workers,
+                                     progress=lambda done, total: updates.append(done))
+            same = same_tree(source, source + "_engine")
+            print(f"{label}:")
+            print(f"  shutil.copytree   {copytree_s:>8.2f} s")
+            print(f"  copy engine       {engine_s:>8.2f} s  ({result['bytes'] / 1e6:.0f} MB, "
+                  f"{len(updates)} progress updates, {len(result['errors'])} errors, identical: {same})")
+            shutil.rmtree(source + "_copytree")
+            shutil.rmtree(source + "_engine")
+            if not same:
+                sys.exit(1)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: file-name index on a synthetic tree
+Builds an in-memory index of --entries names (1M by default), times save/load and
+substring, multi-word, wildcard and fuzzy queries; with --tree it also crawls a real
+on-disk tree and compares a query against a recursive os.walk scan
+
+Usage: python benchmarks/bench_file_index.py [--entries 1000000] [--tree 50000]
+"""
+
+import argparse
+import fnmatch
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kore_file_index import FileIndex
+
+WORDS = ["report", "invoice", "photo", "project", "notes", "budget", "draft", "final", "backup",
+         "resume", "tax", "meeting", "holiday", "scan", "config", "data", "summary", "design"]
+EXTENSIONS = [".pdf", ".docx", ".xlsx", ".jpg", ".png", ".txt", ".py", ".json", ".zip", ".mp4"]
+TOP_DIRS = ["Desktop", "Documents", "Downloads", "Pictures", "AppData/Local/Cache", "Projects"]
+
+QUERIES = [
+    ("substring, common", "report", None),
+    ("substring, rare", "needle_quarterly", None),
+    ("multi-word", "tax summary", None),
+    ("wildcard", "budget*2019*.xlsx", None),
+    ("fuzzy", "ndlqrtly", None),
+    ("folder only", "holiday", "dir"),
+]
+
+
+def synthetic_entries(count, home, seed=7):
+    """(directory, name, mtime, is_dir) tuples spread over ~count/50 folders"""
+    rng = random.Random(seed)
+    now = time.time()
+    folders = [os.path.join(home, rng.choice(TOP_DIRS), f"{rng.choice(WORDS)}_{i}") for i in range(max(count // 50, 1))]
+    for folder in folders[:50]:
+        yield os.path.dirname(folder), os.path.basename(folder), now - rng.random() * 3e7, True
+    for i in range(count):
+        name = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{rng.randint(2010, 2024)}_{i}{rng.choice(EXTENSIONS)}"
+        yield rng.choice(folders), name, now - rng.random() * 3e7, False
+    # A few needles to find
+    for i in range(3):
+        yield rng.choice(folders), f"needle_quarterly_{i}.pdf", now, False
+
+
+def time_query(index, query, kind, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = index.search(query, kind=kind)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(results)
+
+
+def make_tree(root, count, seed=7):
+    rng = random.Random(seed)
+    folders = [root]
+    for i in range(max(count // 40, 1)):
+        folder = os.path.join(rng.choice(folders), f"{rng.choice(WORDS)}_{i}")
+        os.makedirs(folder, exist_ok=True)
+        folders.append(folder)
+    for i in range(count):
+        name = f"{rng.choice(WORDS)}_{i}{rng.choice(EXTENSIONS)}"
+        open(os.path.join(rng.choice(folders), name), "w").close()
+    target = os.path.join(folders[-1], "needle_quarterly.pdf")
+    open(target, "w").close()
+    return target
+
+
+def walk_search(root, pattern):
+    for folder, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            if fnmatch.fnmatch(name.lower(), pattern):
+                return os.path.join(folder, name)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tree", type=int, default=0, help="also crawl an on-disk tree of this many files")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        index = FileIndex(path=os.path.join(workdir, "index.tsv"), roots=[workdir])
+
+        start = time.perf_counter()
+        index.build(synthetic_entries(args.entries, os.path.expanduser("~")))
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.save()
+        save_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.load()
+        load_s = time.perf_counter() - start
+
+        size_mb = os.path.getsize(index.path) / 1e6
+        print(f"{len(index)} entries: build {build_s:.2f} s, save {save_s:.2f} s, load {load_s:.2f} s, {size_mb:.0f} MB on disk\n")
+        print(f"{'query':<20}{'text':<22}{'median':>10}{'results':>9}")
+        for label, query, kind in QUERIES:
+            median_ms, found = time_query(index, query, kind, args.repeat)
+            print(f"{label:<20}{query:<22}{median_ms:>7.1f} ms{found:>9}")
+
+        if args.tree:
+            tree = os.path.join(workdir, "tree")
+            target = make_tree(tree, args.tree)
+
+            crawler = FileIndex(path=None, roots=[tree])
+            start = time.perf_counter()
+            crawled = crawler.crawl()
+            crawl_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            hit = crawler.search("needle_quarterly")
+            index_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            walked = walk_search(tree, "*needle_quarterly*")
+            walk_ms = (time.perf_counter() - start) * 1000
+
+            assert hit and hit[0] == target and walked == target
+            print(f"\non-disk tree: crawled {crawled} entries in {crawl_s:.2f} s")
+            print(f"find 'needle_quarterly': index {index_ms:.2f} ms vs os.walk {walk_ms:.0f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
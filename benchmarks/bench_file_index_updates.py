@@ -0,0 +1,134 @@
+"""
+Benchmark: keeping the file index current after changes, without a full re-crawl
+Builds an on-disk tree (1M files by default), crawls it once, then applies --changes
+creates/deletes/renames and compares:
+  - journal catch-up (stat every folder, re-list only the changed ones)
+  - immediate notify() after each change (what kore_control's file operations do)
+  - a full re-crawl
+and checks that the incrementally updated index matches a fresh crawl
+
+Usage: python benchmarks/bench_file_index_updates.py [--files 1000000] [--changes 10000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kore_file_index import FileIndex
+
+FILES_PER_DIR = 50
+
+
+def make_tree(root, files, rng):
+    folders = [root]
+    for i in range(max(files // FILES_PER_DIR, 1)):
+        folder = os.path.join(rng.choice(folders[-200:]), f"dir_{i}")
+        os.mkdir(folder)
+        folders.append(folder)
+    for i in range(files):
+        open(os.path.join(folders[1 + i % (len(folders) - 1)], f"file_{i}.txt"), "w").close()
+    return folders
+
+
+def apply_changes(folders, count, rng, tag, on_change=None):
+    """count mixed changes: 50% create, 30% delete, 20% rename"""
+    for i in range(count):
+        folder = rng.choice(folders)
+        roll = rng.random()
+        if roll < 0.5:
+            path = os.path.join(folder, f"{tag}_{i}.doc")
+            open(path, "w").close()
+            changed = (path,)
+        else:
+            with os.scandir(folder) as it:
+                files = [entry.path for entry in it if entry.is_file()]
+            if not files:
+                continue
+            victim = rng.choice(files)
+            if roll < 0.8:
+                os.remove(victim)
+                changed = (victim,)
+            else:
+                renamed = os.path.join(folder, f"{tag}_renamed_{i}.txt")
+                os.rename(victim, renamed)
+                changed = (victim, renamed)
+        if on_change:
+            on_change(*changed)
+
+
+def index_paths(index):
+    return {os.path.join(index.dirs[parent], name) for parent, name, _, _ in index._live_entries()}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--changes", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    workdir = tempfile.mkdtemp()
+    try:
+        tree = os.path.join(workdir, "tree")
+        os.mkdir(tree)
+        _, make_s = timed(make_tree, tree, args.files, rng)
+        folders = [tree] + [os.path.join(folder, d) for folder, dirs, _ in os.walk(tree) for d in dirs]
+        print(f"tree: {args.files} files in {len(folders)} folders (created in {make_s:.1f} s)")
+
+        index = FileIndex(path=os.path.join(workdir, "index.tsv"), roots=[tree])
+        entries, crawl_s = timed(index.crawl)
+        print(f"full crawl:                 {crawl_s * 1000:>9.0f} ms  ({entries} entries)")
+
+        changed, idle_s = timed(index.journal_scan)
+        print(f"journal scan, no changes:   {idle_s * 1000:>9.0f} ms  ({changed} changes)")
+
+        # Let directory mtimes tick past the journalled values on coarse-grained filesystems
+        time.sleep(0.05)
+        apply_changes(folders, args.changes, rng, "batch")
+        rescanned_before = index.stats["rescanned_dirs"]
+        changed, catch_up_s = timed(index.journal_scan)
+        rescanned = index.stats["rescanned_dirs"] - rescanned_before
+        print(f"journal catch-up:           {catch_up_s * 1000:>9.0f} ms  "
+              f"({args.changes} changes, {rescanned} folders re-listed, {changed} entries updated)")
+
+        start = time.perf_counter()
+        apply_changes(folders, args.changes, rng, "live", on_change=index.notify)
+        with_notify_s = time.perf_counter() - start
+        start = time.perf_counter()
+        apply_changes(folders, args.changes, rng, "plain")
+        plain_s = time.perf_counter() - start
+        print(f"notify() per change:        {(with_notify_s - plain_s) / args.changes * 1000:>9.2f} ms  "
+              f"(overhead on top of the file operation)")
+        index.journal_scan()
+
+        _, search_s = timed(index.search, "batch_1")
+        _, compact_s = timed(index.compact)
+        print(f"search with delta segment:  {search_s * 1000:>9.1f} ms")
+        print(f"compaction:                 {compact_s * 1000:>9.0f} ms  (runs in the watcher thread)")
+
+        fresh = FileIndex(path=None, roots=[tree])
+        _, recrawl_s = timed(fresh.crawl)
+        print(f"full re-crawl for compare:  {recrawl_s * 1000:>9.0f} ms")
+
+        same = index_paths(index) == index_paths(fresh)
+        print(f"\nincremental index matches fresh crawl: {same}")
+        if not same:
+            sys.exit(1)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
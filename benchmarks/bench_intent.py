@@ -0,0 +1,79 @@
+"""
+Benchmark: local intent fast-path against the labelled command corpus
+Reports hit rate, precision of local plans, match latency and router round trips saved
+
+Usage: python benchmarks/bench_intent.py [--router-ms 900] [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kore_intent import LocalIntentMatcher
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_corpus.jsonl")
+
+
+def load_corpus(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def same_parameter(expected, actual):
+    if expected is None:
+        return True
+    if isinstance(expected, str) and isinstance(actual, str):
+        return expected.lower() == actual.lower()
+    return expected == actual
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--router-ms", type=float, default=900.0, help="assumed Command Router round trip")
+    parser.add_argument("--repeat", type=int, default=200, help="timing repetitions per command")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    matcher = LocalIntentMatcher()
+
+    hits, correct, wrong = 0, 0, []
+    latencies_us = []
+
+    for row in corpus:
+        plan = matcher.match(row["command"])
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            matcher.classify(row["command"])
+        latencies_us.append((time.perf_counter() - start) / args.repeat * 1e6)
+
+        if plan is None:
+            continue
+        hits += 1
+        if plan["tool"] == row["tool"] and same_parameter(row["parameter"], plan["parameter"]):
+            correct += 1
+        else:
+            wrong.append((row["command"], row["tool"], plan["tool"], plan["parameter"]))
+
+    total = len(corpus)
+    precision = correct / hits if hits else 0.0
+    saved_ms = correct * args.router_ms
+
+    print(f"{total} commands, router round trip assumed {args.router_ms:.0f} ms\n")
+    print(f"hit rate:         {hits}/{total} ({hits / total:.0%})")
+    print(f"precision:        {correct}/{hits} ({precision:.0%})")
+    print(f"match latency:    median {statistics.median(latencies_us):.1f} us, max {max(latencies_us):.1f} us")
+    print(f"latency saved:    {saved_ms / 1000:.1f} s total, {saved_ms / total:.0f} ms per command on average")
+
+    for command, expected, tool, parameter in wrong:
+        print(f"  mismatch: {command!r} -> {tool} {parameter!r} (expected {expected})")
+
+
+if __name__ == "__main__":
+    main()
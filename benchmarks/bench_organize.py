@@ -0,0 +1,145 @@
+"""
+Benchmark: organize_files planner/executor vs. the old per-file loop
+Fills two identical folders with --files files (mixed extensions, some names already
+taken in existing category folders), organizes one with the old listdir/isfile/
+linear-category-search/exists-probe loop and the other with plan_organize +
+execute_plan (journalled, as organize_files does), checks both end up with the
+same layout, then times the bulk undo from the journal
+
+Usage: python benchmarks/bench_organize.py [--files 100000] [--workers 8]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kore_journal import FileJournal
+from kore_organize import FILE_CATEGORIES, execute_plan, plan_organize
+
+EXTENSIONS = [".jpg", ".png", ".mp4", ".mp3", ".pdf", ".docx", ".txt", ".xlsx", ".pptx", ".zip",
+              ".py", ".exe", ".psd", ".blend", ".iso", ""]
+
+
+def make_folder(folder, files, seed=3):
+    """files entries plus a few pre-existing category folders with clashing names"""
+    rng = random.Random(seed)
+    os.makedirs(folder)
+    for i in range(files):
+        open(os.path.join(folder, f"file_{i % (files // 2 or 1)}_{rng.randint(0, 3)}{rng.choice(EXTENSIONS)}"), "a").close()
+    for category in ("Images", "Documents"):
+        os.makedirs(os.path.join(folder, category))
+        for i in range(files // 100):
+            open(os.path.join(folder, category, f"file_{i}_0{'.jpg' if category == 'Images' else '.pdf'}"), "w").close()
+
+
+def legacy_organize(folder_path):
+    """The loop organize_files used before the planner"""
+    files = [f for f in os.listdir(folder_path) if os.path.isfile(os.path.join(folder_path, f))]
+    moved = 0
+    for filename in files:
+        file_path = os.path.join(folder_path, filename)
+        file_ext = os.path.splitext(filename)[1].lower()
+        category_found = False
+        for category, extensions in FILE_CATEGORIES.items():
+            if file_ext in extensions:
+                category_folder = os.path.join(folder_path, category)
+                os.makedirs(category_folder, exist_ok=True)
+                destination = os.path.join(category_folder, filename)
+                if os.path.exists(destination):
+                    base, ext = os.path.splitext(filename)
+                    counter = 1
+                    while os.path.exists(destination):
+                        destination = os.path.join(category_folder, f"{base}_{counter}{ext}")
+                        counter += 1
+                shutil.move(file_path, destination)
+                moved += 1
+                category_found = True
+                break
+        if not category_found and file_ext:
+            others_folder = os.path.join(folder_path, "Others")
+            os.makedirs(others_folder, exist_ok=True)
+            destination = os.path.join(others_folder, filename)
+            if os.path.exists(destination):
+                base, ext = os.path.splitext(filename)
+                counter = 1
+                while os.path.exists(destination):
+                    destination = os.path.join(others_folder, f"{base}_{counter}{ext}")
+                    counter += 1
+            shutil.move(file_path, destination)
+            moved += 1
+    return moved
+
+
+def layout(folder):
+    """Category -> number of files, plus the files left in the top folder"""
+    counts = {}
+    for entry in os.scandir(folder):
+        if entry.is_dir():
+            counts[entry.name] = len(os.listdir(entry.path))
+        else:
+            counts["<top>"] = counts.get("<top>", 0) + 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        old_folder, new_folder = os.path.join(workdir, "old"), os.path.join(workdir, "new")
+        make_folder(old_folder, args.files)
+        make_folder(new_folder, args.files)
+        original = sorted(os.listdir(new_folder))
+        print(f"{len(original)} entries per folder\n")
+
+        start = time.perf_counter()
+        moved = legacy_organize(old_folder)
+        legacy_s = time.perf_counter() - start
+        print(f"old loop:          {legacy_s:>8.2f} s  ({moved} files moved)")
+
+        updates = []
+        journal = FileJournal(os.path.join(workdir, "journal.jsonl"))
+        start = time.perf_counter()
+        plan = plan_organize(new_folder)
+        steps = [["mkdir", None, folder] for folder in plan.folders]
+        steps += [["move", source, destination] for source, destination in plan.moves]
+        txn = journal.begin("organize", steps, label=new_folder)
+        offset = len(plan.folders)
+        result = execute_plan(plan, workers=args.workers, progress=lambda done, total: updates.append(done),
+                              on_moved=lambda moved: journal.completed(txn, [offset + i for i in moved]))
+        journal.completed(txn, range(offset))
+        journal.commit(txn)
+        new_s = time.perf_counter() - start
+        print(f"planner/executor:  {new_s:>8.2f} s  ({result['moved']} files moved, "
+              f"plan {plan.plan_ms:.0f} ms, {len(updates)} progress updates, {len(result['errors'])} errors)")
+        print(f"speed-up:          {legacy_s / new_s:>8.1f}x")
+
+        same = layout(old_folder) == layout(new_folder)
+        print(f"\nsame layout as the old loop: {same}")
+        if not same:
+            print(layout(old_folder), layout(new_folder), sep="\n")
+            sys.exit(1)
+
+        start = time.perf_counter()
+        journal.undo()
+        undo_s = time.perf_counter() - start
+        restored = sorted(os.listdir(new_folder)) == original
+        print(f"bulk undo from journal: {undo_s:.2f} s (journal {os.path.getsize(journal.path) / 1e6:.1f} MB), "
+              f"folder restored: {restored}")
+        if not restored:
+            sys.exit(1)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: compound plan executed step by step vs. by the parallel plan executor
+The plan is "check my disk space and organize my downloads" plus two specialist
+questions: two local tools (simulated with --local-ms sleeps, since kore_control is
+Windows-only) and two ASK_AGENT steps answered by the mock OnDemand server after
+--agent-ms, one of which depends on the disk step's output. It runs --runs times
+serially, on the command scheduler, and as a job on a one-worker scheduler (the
+executor then runs its steps on the plan's own thread instead of deadlocking).
+
+Usage: python benchmarks/bench_planner.py [--runs 5] [--local-ms 150] [--agent-ms 250]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_ondemand import MockOnDemandServer, write_mock_config
+from kore_ondemand import KoreOnDemand
+from kore_planner import AGENT_KEYS, PlanExecutor, PlanGraph
+from kore_scheduler import CommandScheduler
+from kore_tools import ToolRegistry, ToolResult
+
+PLAN = {
+    "thought": "Checking your disk and tidying Downloads at the same time",
+    "agent": "MULTI", "tool": "PLAN", "parameter": None,
+    "steps": [
+        {"id": "disk", "agent": "SYSTEM_MONITOR", "tool": "SYSTEM_INFO", "parameter": "disk"},
+        {"id": "organize", "agent": "FILE_NAVIGATOR", "tool": "ORGANIZE_FILES", "parameter": "Downloads"},
+        {"id": "news", "agent": "WEB_RESEARCH", "tool": "ASK_AGENT",
+         "parameter": {"agent": "WEB_RESEARCH", "query": "Any news on cheap SSDs?"}},
+        {"id": "advice", "agent": "SYSTEM_MONITOR", "tool": "ASK_AGENT", "after": ["disk"],
+         "parameter": {"agent": "SYSTEM_MONITOR", "query": "Is this much free space enough? {disk}"}}
+    ]
+}
+
+
+def make_tools(ondemand, local_ms, questions):
+    tools = ToolRegistry()
+
+    @tools.register("SYSTEM_INFO")
+    def system_info_tool(param, progress):
+        time.sleep(local_ms / 1000)
+        return ToolResult(True, "Disk C: 112 GB free of 476 GB", output='{"disk_free_gb": 112}')
+
+    @tools.register("ORGANIZE_FILES")
+    def organize_files_tool(param, progress):
+        time.sleep(local_ms / 1000)
+        return ToolResult(True, "Files organized!", "Files organized")
+
+    @tools.register("ASK_AGENT", schema={"type": "object", "required": ["agent", "query"]})
+    def ask_agent_tool(param, progress):
+        questions.append(param["query"])
+        answer = ondemand.ask_agent(AGENT_KEYS[param["agent"]], param["query"])
+        return ToolResult(bool(answer), (answer or "")[:40], output=answer)
+
+    return tools
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--local-ms", type=int, default=150)
+    parser.add_argument("--agent-ms", type=int, default=250)
+    args = parser.parse_args()
+
+    server = MockOnDemandServer(first_token_delay=args.agent_ms / 1000,
+                                answer="That is plenty of room. Nothing to clean up yet.").start()
+    try:
+        config_path = write_mock_config(os.path.join(tempfile.mkdtemp(), "config.json"), server)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ondemand = KoreOnDemand(config_path)
+            ondemand.sessions.fill()
+        questions = []
+        tools = make_tools(ondemand, args.local_ms, questions)
+        graph = PlanGraph.from_plan(PLAN)
+
+        def run_step(step, param):
+            return tools.dispatch(step.tool, param)
+
+        print(f"4-step plan: 2 local tools of {args.local_ms} ms, 2 specialist questions of "
+              f"~{args.agent_ms} ms (one after the disk step), {args.runs} runs\n")
+        print(f"{'':<28}{'avg':>10}{'p95':>10}{'sum of steps':>15}")
+
+        four_workers, one_worker = CommandScheduler(workers=4), CommandScheduler(workers=1)
+        runs = (
+            ("one step at a time", lambda: PlanExecutor(run_step).execute(graph)),
+            ("plan executor, 4 workers", lambda: PlanExecutor(run_step, four_workers).execute(graph)),
+            ("plan executor, 1 worker", lambda: one_worker.wait(
+                one_worker.submit(lambda: PlanExecutor(run_step, one_worker).execute(graph))))
+        )
+        for label, execute in runs:
+            elapsed, step_ms = [], []
+            for _ in range(args.runs):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    outcome = execute()
+                    elapsed.append((time.perf_counter() - start) * 1000)
+                assert outcome.success, outcome.summary
+                step_ms.append(outcome.stats()["step_ms"])
+            p95 = statistics.quantiles(elapsed, n=20)[-1] if len(elapsed) > 1 else elapsed[0]
+            print(f"{label:<28}{statistics.mean(elapsed):>7.1f} ms{p95:>7.1f} ms"
+                  f"{statistics.mean(step_ms):>12.1f} ms")
+
+        print(f"\nmerged summary: {outcome.summary}")
+        print(f"dependent step saw the disk output: {any('disk_free_gb' in q for q in questions)}")
+        four_workers.stop()
+        one_worker.stop()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ondemand.close()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
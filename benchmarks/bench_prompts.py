@@ -0,0 +1,84 @@
+"""
+Benchmark: prompt registry vs. the full fulfillment prompt on every query
+Sends --queries queries per session for each of the seven agent profiles to the mock,
+which charges --prompt-ms-per-kb of prompt processing whenever a full prompt arrives,
+and reports request bytes per query and time to first event, once with every query
+carrying its prompt (as before) and once with the prompt bound to the session.
+Finally the mock forgets all prompts (as after a restart) to show the client rebinding.
+
+Usage: python benchmarks/bench_prompts.py [--queries 10] [--prompt-ms-per-kb 4]
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_ondemand import MockOnDemandServer
+from kore_client import OnDemandClient
+from kore_prompts import PromptRegistry
+from kore_ratelimit import TokenBucket
+
+PROFILES = [importlib.import_module(f"agent{i}").PROFILE for i in range(1, 8)]
+
+
+def make_client(server, bind_prompts):
+    return OnDemandClient("mock-key", f"{server.url}/chat/v1", f"{server.url}/media/v1",
+                          limiter=TokenBucket(rate=1000, burst=1000),
+                          prompts=PromptRegistry(), bind_prompts=bind_prompts)
+
+
+def run(client, server, queries):
+    """Returns (bytes per query, first-event ms per query, sessions by agent name)"""
+    bytes_before, requests_before = server.stats["bytes_received"], server.stats["requests"]
+    first_events = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        sessions = {profile.name: client.create_session(profile) for profile in PROFILES}
+        session_bytes = server.stats["bytes_received"] - bytes_before
+        for profile in PROFILES:
+            for i in range(queries):
+                before = client.stats["query"].first_event_ms
+                client.query(profile, sessions[profile.name], f"status check {i}")
+                first_events.append(client.stats["query"].first_event_ms - before)
+    sent = server.stats["bytes_received"] - bytes_before - session_bytes
+    count = server.stats["requests"] - requests_before - len(PROFILES)
+    return sent / count, first_events, sessions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--prompt-ms-per-kb", type=float, default=4.0)
+    args = parser.parse_args()
+
+    server = MockOnDemandServer(prompt_ms_per_kb=args.prompt_ms_per_kb).start()
+    try:
+        sizes = ", ".join(f"{profile.prompt.size / 1024:.1f}" for profile in PROFILES)
+        print(f"7 agents x {args.queries} queries per session, prompts of {sizes} KB\n")
+        print(f"{'':<22}{'bytes/query':>13}{'first event avg':>18}{'p95':>10}")
+        for label, bind_prompts in (("full prompt per query", False), ("prompt registry", True)):
+            client = make_client(server, bind_prompts)
+            bytes_per_query, first_events, sessions = run(client, server, args.queries)
+            p95 = statistics.quantiles(first_events, n=20)[-1]
+            print(f"{label:<22}{bytes_per_query:>13.0f}{statistics.mean(first_events):>15.1f} ms"
+                  f"{p95:>7.1f} ms")
+
+        # Server-side prompts are gone: every reference is refused once, then rebound
+        server.session_prompts.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for profile in PROFILES:
+                answered = client.query(profile, sessions[profile.name], "after restart") is not None
+        print(f"\nafter the server lost its prompts: answered={answered}, "
+              f"rebinds={client.prompts.stats['rebinds']}, "
+              f"saved {client.prompts.stats['bytes_saved'] / 1024:.0f} KB in total")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
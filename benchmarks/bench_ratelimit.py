@@ -0,0 +1,89 @@
+"""
+Benchmark: shared token-bucket limiter vs. uncoordinated calls against a rate-limited server
+The mock answers 429 + Retry-After above --server-rps. A burst of --queries router queries
+is sent from --threads worker threads and, separately, as concurrent coroutines on one
+event loop: once with no client-side pacing and no 429 retries (as before), and once
+with the token bucket paced just under the server's limit
+
+Usage: python benchmarks/bench_ratelimit.py [--queries 40] [--threads 8] [--server-rps 5]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_ondemand import MockOnDemandServer, write_mock_config
+from kore_ondemand import AsyncKoreOnDemand, KoreOnDemand
+
+
+def make_client(server, rate_limit):
+    config_path = write_mock_config(os.path.join(tempfile.mkdtemp(), "config.json"), server,
+                                    rate_limit=rate_limit)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ondemand = KoreOnDemand(config_path)
+        ondemand.create_session()
+    return ondemand
+
+
+def run_threads(ondemand, queries, threads):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(lambda i: ondemand.query_agent(f"open chrome {i}"), range(queries)))
+
+
+def run_async(ondemand, queries):
+    async def burst():
+        client = AsyncKoreOnDemand(ondemand)
+        try:
+            return await asyncio.gather(*(client.query_agent(f"open chrome {i}") for i in range(queries)))
+        finally:
+            await client.close()
+    return asyncio.run(burst())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=40)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--server-rps", type=int, default=5)
+    args = parser.parse_args()
+
+    server = MockOnDemandServer(max_rps=args.server_rps, retry_after=1).start()
+    limits = {
+        "no pacing/retries": {"rate": 1000, "burst": 1000, "throttle_retries": 0},
+        "token bucket": {"rate": args.server_rps * 0.9, "burst": args.server_rps - 1, "throttle_retries": 2},
+    }
+    try:
+        print(f"{args.queries} queries, server allows {args.server_rps}/s\n")
+        print(f"{'':<32}{'answered':>10}{'429s':>8}{'total':>10}{'avg wait':>12}{'queue peak':>12}")
+        for mode, runner in (("threads", lambda c: run_threads(c, args.queries, args.threads)),
+                             ("asyncio", lambda c: run_async(c, args.queries))):
+            for label, rate_limit in limits.items():
+                time.sleep(1.1)     # let the server's window drain
+                ondemand = make_client(server, rate_limit)
+                peak = [0]
+                ondemand.limiter.on_wait = lambda delay, depth: peak.__setitem__(0, max(peak[0], depth))
+                throttled_before = server.stats["throttled"]
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    plans = runner(ondemand)
+                total_s = time.perf_counter() - start
+                stats = ondemand.limiter.stats()
+                answered = sum(1 for plan in plans if plan)
+                print(f"{label + ' (' + mode + ')':<32}{answered:>10}{server.stats['throttled'] - throttled_before:>8}"
+                      f"{total_s:>8.2f} s{stats['avg_wait_ms']:>9.0f} ms{peak[0]:>12}")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    ondemand.close()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: READ_FILE preview on a large log vs. the old whole-file read
+Writes a --mb sized log, then times and measures peak Python memory for the old
+open().read(), and for the streaming reader's head, tail and random-line previews
+
+Usage: python benchmarks/bench_reader.py [--mb 500]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kore_reader import FileReader, preview_file
+
+
+def make_log(path, megabytes):
+    line = "2024-05-01 12:00:00,123 INFO  [worker-7] request handled in 12 ms status=200 id={}\n"
+    lines = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while f.tell() < megabytes * 1024 * 1024:
+            f.write("".join(line.format(lines + i) for i in range(10000)))
+            lines += 10000
+    return lines
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    print(f"{label:<28}{elapsed_ms:>10.1f} ms{peak_mb:>10.1f} MB peak")
+    return result
+
+
+def old_read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()[:200]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, "app.log")
+        lines = make_log(path, args.mb)
+        print(f"log: {os.path.getsize(path) / 1e6:.0f} MB, {lines} lines\n")
+
+        measure("old read_file (whole file)", lambda: old_read(path))
+        measure("preview: head", lambda: preview_file(path))
+        measure("preview: last 50 lines", lambda: preview_file(path, tail=True, line_count=50))
+        measure("preview: line N (cold)", lambda: preview_file(path, start_line=lines * 3 // 4, line_count=20))
+
+        with FileReader(path) as reader:
+            reader.line_count()
+            measure("random line (index built)", lambda: reader.lines(lines // 3, 20))
+            expected = f"id={lines // 3}"
+            assert reader.lines(lines // 3, 1)[0].endswith(expected)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
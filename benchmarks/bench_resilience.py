@@ -0,0 +1,131 @@
+"""
+Benchmark: OnDemand transport under injected faults
+Runs KoreOnDemand (threads) and AsyncKoreOnDemand (asyncio) against the fault-injecting
+mock and reports, per scenario, how long each call took and how it ended:
+  - flaky session creation (500s) recovered by jittered retries
+  - stalled streams / hung requests / dropped connections bounded by read timeouts
+  - the circuit breaker failing fast once the service looks down, then closing again
+    after the reset timeout when the service is back
+The old behaviour (no timeout) is shown for one stalled stream of --stall seconds.
+
+Usage: python benchmarks/bench_resilience.py [--calls 8] [--stall 3]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_ondemand import MockOnDemandServer, write_mock_config
+from kore_ondemand import AsyncKoreOnDemand, KoreOnDemand
+
+RESILIENCE = {
+    "timeouts": {"session": [0.5, 0.5], "query": [0.5, 0.5], "upload": [0.5, 0.5]},
+    "retries": {"attempts": 4, "base_delay": 0.05, "max_delay": 0.4},
+    "breaker": {"failure_threshold": 3, "reset_timeout": 1.0}
+}
+
+
+def make_client(server):
+    config_path = write_mock_config(os.path.join(tempfile.mkdtemp(), "config.json"), server,
+                                    resilience=RESILIENCE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return KoreOnDemand(config_path)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def report(label, results):
+    """results: [(ok, ms, breaker state)]"""
+    calls = " ".join(f"{'ok' if ok else 'x'}:{ms:.0f}" for ok, ms, _ in results)
+    print(f"  {label:<24} {calls}")
+    print(f"  {'':<24} breaker: {' '.join(state for _, _, state in results)}")
+
+
+def query_series(ondemand, session_id, calls):
+    results = []
+    for i in range(calls):
+        plan, ms = timed(lambda: ondemand.query_agent(f"open chrome {i}", session_id=session_id))
+        results.append((plan is not None, ms, ondemand.resilience.breaker.state))
+    return results
+
+
+def async_query_series(ondemand, session_id, calls):
+    async def run():
+        client = AsyncKoreOnDemand(ondemand)
+        results = []
+        try:
+            for i in range(calls):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    plan = await client.query_agent(f"open chrome {i}", session_id=session_id)
+                results.append((plan is not None, (time.perf_counter() - start) * 1000,
+                                ondemand.resilience.breaker.state))
+        finally:
+            await client.close()
+        return results
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=8)
+    parser.add_argument("--stall", type=float, default=3.0, help="seconds a stalled stream stays silent")
+    args = parser.parse_args()
+
+    server = MockOnDemandServer(chunk_size=16).start()
+    try:
+        print("call results as ok/x:milliseconds\n")
+
+        print("flaky session creation (first 2 attempts answer 500)")
+        ondemand = make_client(server)
+        server.inject("error", count=2)
+        session_id, ms = timed(ondemand.create_session)
+        print(f"  session {'created' if session_id else 'FAILED'} in {ms:.0f} ms after "
+              f"{ondemand.resilience.retries} retries\n")
+        server.inject(None)
+
+        print(f"stalled stream, old transport (no timeout, stream resumes after {args.stall:.0f} s)")
+        server.inject("stall", stall_seconds=args.stall)
+        start = time.perf_counter()
+        response = requests.post(f"{server.url}/chat/v1/sessions/{session_id}/query", json={"query": "open chrome"},
+                                 headers={"apikey": "mock-key"}, stream=True)
+        for _ in response.iter_lines():
+            pass
+        print(f"  worker blocked for {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"(forever if the stream never resumes)\n")
+
+        for fault in ("stall", "hang", "reset"):
+            print(f"{fault}: {args.calls} queries, then the service recovers")
+            for mode, series in (("threads", query_series), ("asyncio", async_query_series)):
+                ondemand = make_client(server)
+                server.inject(fault, stall_seconds=args.stall)
+                failing = series(ondemand, session_id, args.calls)
+                server.inject(None)
+                time.sleep(RESILIENCE["breaker"]["reset_timeout"])
+                recovered = series(ondemand, session_id, 2)
+                report(f"{mode}, faulty", failing)
+                report(f"{mode}, recovered", recovered)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    ondemand.close()
+            print()
+    finally:
+        server.inject(None)
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: command scheduler vs. one thread per command
+Fires a burst of --commands typed commands (each a --work-ms blocking action), then
+one voice command, and reports peak thread count, total time and how long the voice
+command waited to start with a new thread per command and with the scheduler
+
+Usage: python benchmarks/bench_scheduler.py [--commands 200] [--work-ms 20] [--workers 4]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kore_scheduler import TYPED, VOICE, CommandScheduler
+
+
+class Probe:
+    """Tracks peak live threads and when the voice command started"""
+
+    def __init__(self):
+        self.peak_threads = threading.active_count()
+        self.voice_started = None
+        self._lock = threading.Lock()
+
+    def action(self, work_ms, voice=False):
+        with self._lock:
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            if voice:
+                self.voice_started = time.perf_counter()
+        time.sleep(work_ms / 1000)
+
+
+def thread_per_command(commands, work_ms):
+    probe = Probe()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=probe.action, args=(work_ms,), daemon=True) for _ in range(commands)]
+    for thread in threads:
+        thread.start()
+    voice_submitted = time.perf_counter()
+    voice = threading.Thread(target=probe.action, args=(work_ms, True), daemon=True)
+    voice.start()
+    for thread in threads + [voice]:
+        thread.join()
+    return probe, time.perf_counter() - start, probe.voice_started - voice_submitted
+
+
+def scheduled(commands, work_ms, workers):
+    probe = Probe()
+    scheduler = CommandScheduler(workers=workers, max_queue=commands + 1)
+    start = time.perf_counter()
+    jobs = [scheduler.submit(probe.action, work_ms, priority=TYPED) for _ in range(commands)]
+    voice_submitted = time.perf_counter()
+    jobs.append(scheduler.submit(probe.action, work_ms, True, priority=VOICE))
+    for job in jobs:
+        job.result()
+    elapsed = time.perf_counter() - start
+    scheduler.stop()
+    return probe, elapsed, probe.voice_started - voice_submitted
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commands", type=int, default=200)
+    parser.add_argument("--work-ms", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.commands} typed commands of {args.work_ms} ms, then one voice command\n")
+    print(f"{'':<22}{'peak threads':>14}{'total':>12}{'voice wait':>14}")
+    for label, run in (("thread per command", lambda: thread_per_command(args.commands, args.work_ms)),
+                       (f"scheduler ({args.workers} workers)", lambda: scheduled(args.commands, args.work_ms, args.workers))):
+        probe, total_s, voice_wait_s = run()
+        print(f"{label:<22}{probe.peak_threads:>14}{total_s:>10.2f} s{voice_wait_s * 1000:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: pre-created session pool vs. a new session per request
+The mock takes --session-ms to create a session. --requests queries spread over the
+seven configured agents are sent from --threads worker threads, once creating a
+session for every request (as the agent scripts do) and once taking pooled sessions
+that were pre-created before the burst. A third run starts from an empty pool to
+show concurrent callers of one agent sharing a single creation.
+
+Usage: python benchmarks/bench_sessions.py [--requests 70] [--threads 7] [--session-ms 150]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_ondemand import MockOnDemandServer, write_mock_config
+from kore_ondemand import KoreOnDemand
+
+
+def make_client(server):
+    config_path = write_mock_config(os.path.join(tempfile.mkdtemp(), "config.json"), server)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return KoreOnDemand(config_path)
+
+
+def burst(requests, threads, agents, request):
+    """Run request(i, agent_key) for every request; returns per-request latencies in ms"""
+    def timed(i):
+        start = time.perf_counter()
+        request(i, agents[i % len(agents)])
+        return (time.perf_counter() - start) * 1000
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(timed, range(requests)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=70)
+    parser.add_argument("--threads", type=int, default=7)
+    parser.add_argument("--session-ms", type=int, default=150)
+    args = parser.parse_args()
+
+    server = MockOnDemandServer(session_delay=args.session_ms / 1000).start()
+    try:
+        print(f"{args.requests} queries over 7 agents from {args.threads} threads, "
+              f"session creation takes {args.session_ms} ms\n")
+        print(f"{'':<26}{'avg':>10}{'p95':>10}{'sessions created':>18}")
+
+        def per_request(ondemand):
+            def request(i, agent_key):
+                session_id = ondemand.create_session(agent_key)
+                ondemand.query_agent(f"open chrome {i}", session_id=session_id)
+            return request
+
+        def pooled(ondemand):
+            def request(i, agent_key):
+                ondemand.query_agent(f"open chrome {i}", session_id=ondemand.sessions.get(agent_key))
+            return request
+
+        for label, make_request, prefill in (("new session per request", per_request, False),
+                                             ("pre-created pool", pooled, True),
+                                             ("cold pool (first burst)", pooled, False)):
+            ondemand = make_client(server)
+            with contextlib.redirect_stdout(io.StringIO()):
+                if prefill:
+                    ondemand.sessions.fill()
+                sessions_before = server.stats["sessions"]
+                latencies = burst(args.requests, args.threads, ondemand.sessions.agents, make_request(ondemand))
+                ondemand.close()
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(f"{label:<26}{statistics.mean(latencies):>7.1f} ms{p95:>7.1f} ms"
+                  f"{server.stats['sessions'] - sessions_before:>18}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
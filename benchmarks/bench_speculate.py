@@ -0,0 +1,108 @@
+"""
+Benchmark: speculative prefetch while the router is thinking
+Builds a synthetic file index of --entries names, then runs a mix of commands that
+need the router (simulated as a --router-ms wait) followed by the planned tool:
+file-index lookups for FIND_FILE / OPEN_FOLDER and a --system-ms snapshot for
+SYSTEM_INFO. Some router plans match the speculative guess, some do not (different
+parameter or tool). Reports command latency with and without speculation, hit
+rate, time saved and work wasted on discarded guesses.
+
+Usage: python benchmarks/bench_speculate.py [--entries 500000] [--router-ms 300] [--system-ms 40]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_file_index import synthetic_entries
+from kore_file_index import FileIndex
+from kore_intent import get_intent_matcher
+from kore_scheduler import CommandScheduler
+from kore_speculate import Speculator
+
+# Command -> what the router decides
+COMMANDS = {
+    "find budget 2019 summary": ("FIND_FILE", "budget 2019 summary"),
+    "find my tax summary": ("FIND_FILE", "tax summary"),
+    "where is ndlqrtly": ("FIND_FILE", "ndlqrtly"),
+    "locate the needle_quarterly report": ("FIND_FILE", "needle_quarterly"),     # guess misses
+    "how is my cpu doing today": ("SYSTEM_INFO", "cpu"),
+    "is my disk getting full": ("SYSTEM_INFO", "disk"),
+    "why is the computer slow": ("SYSTEM_INFO", "all"),                         # guess misses
+    "open holiday photos": ("OPEN_FOLDER", "holiday"),                           # guess misses
+    "show me design_1": ("OPEN_FOLDER", "design_1"),
+    "tell me a joke": ("CHAT", None),                                           # nothing to guess
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=500000)
+    parser.add_argument("--router-ms", type=int, default=300)
+    parser.add_argument("--system-ms", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    index = FileIndex(path=None)
+    index.build(synthetic_entries(args.entries, os.path.expanduser("~")))
+
+    def system_info(info_type):
+        time.sleep(args.system_ms / 1000)
+        return {"info_type": info_type}
+
+    work = {
+        "FIND_FILE": lambda param: index.search(param, limit=5),
+        "OPEN_FOLDER": lambda param: index.search(param, kind="dir", limit=5),
+        "SYSTEM_INFO": system_info,
+    }
+
+    scheduler = CommandScheduler(workers=4)
+    speculator = Speculator(scheduler, classify=get_intent_matcher().classify)
+    for tool, fn in work.items():
+        speculator.preparer(tool)(fn)
+
+    def run(command, speculate):
+        tool, param = COMMANDS[command]
+        start = time.perf_counter()
+        if speculate:
+            speculator.speculate(command)
+        time.sleep(args.router_ms / 1000)       # the router round trip
+        action_start = time.perf_counter()
+        if tool in work:
+            if speculate:
+                speculator.take(tool, param, lambda: work[tool](param))
+            else:
+                work[tool](param)
+        action_ms = (time.perf_counter() - action_start) * 1000
+        speculator.discard(command)
+        return (time.perf_counter() - start) * 1000, action_ms
+
+    print(f"{args.entries} indexed names, router {args.router_ms} ms, "
+          f"{len(COMMANDS)} commands x {args.repeat}\n")
+    print(f"{'':<22}{'command avg':>13}{'action avg':>13}{'action p95':>13}")
+    for label, speculate in (("no speculation", False), ("speculative prefetch", True)):
+        totals, actions = [], []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.repeat):
+                for command in COMMANDS:
+                    total_ms, action_ms = run(command, speculate)
+                    totals.append(total_ms)
+                    actions.append(action_ms)
+        p95 = statistics.quantiles(actions, n=20)[-1]
+        print(f"{label:<22}{statistics.mean(totals):>10.1f} ms{statistics.mean(actions):>10.1f} ms"
+              f"{p95:>10.1f} ms")
+
+    stats = speculator.snapshot()
+    print(f"\nspeculations started {stats['started']}, hit rate {stats['hit_rate']:.0%}, "
+          f"saved {stats['saved_ms']:.0f} ms, wasted {stats['wasted_ms']:.0f} ms of background work")
+    scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark: streaming recognition vs. record-then-upload on WAV fixtures (no microphone)
+Synthesizes --utterances voice-like WAV files (harmonic "words" with short gaps, in
+background noise) with known speech start/end and transcript, and runs them through
+kore_stream_asr: energy VAD endpointing plus a recognizer backend. Without a Vosk
+model the backend is a stand-in that reveals each word once its audio has been fed
+and takes --finish-ms to finalize, so the numbers measure the pipeline, not a model.
+With --fixtures DIR (utterance.wav + utterance.txt pairs) and --model, real recordings
+go through the offline Vosk backend.
+
+The old path waits for 0.8 s of silence (speech_recognition's pause_threshold), then
+uploads the clip and waits --cloud-ms for Google's answer.
+
+Usage: python benchmarks/bench_stream_asr.py [--utterances 20] [--cloud-ms 900] [--finish-ms 60]
+       python benchmarks/bench_stream_asr.py --fixtures recordings/ --model vosk-model-small-en-us-0.15
+"""
+
+import argparse
+import glob
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kore_stream_asr import SAMPLE_RATE, StreamingRecognizer, VoskBackend, WavSource
+
+PAUSE_THRESHOLD_MS = 800        # speech_recognition's default end-of-phrase silence
+COMMANDS = ["find my tax summary", "open downloads", "how much ram do i have", "take a screenshot",
+            "organize my desktop please", "open chrome", "what is using my cpu", "empty the recycle bin"]
+
+
+def synth_word(rng, ms):
+    """A voiced syllable: a few harmonics of a wobbling pitch under a smooth envelope"""
+    n = SAMPLE_RATE * ms // 1000
+    t = np.arange(n) / SAMPLE_RATE
+    f0 = rng.uniform(110, 220) * (1 + 0.05 * np.sin(2 * np.pi * 3 * t))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    wave_ = sum(np.sin(k * phase) / k for k in range(1, 6))
+    return wave_ * np.hanning(n) * rng.uniform(3000, 6000)
+
+
+def synth_utterance(path, text, rng):
+    """Write the WAV; returns (speech_start_ms, speech_end_ms, word_end_ms list)"""
+    lead_ms = rng.randint(400, 1000)
+    parts = [np.zeros(SAMPLE_RATE * lead_ms // 1000)]
+    position, word_ends = lead_ms, []
+    for i, word in enumerate(text.split()):
+        if i:
+            gap = rng.randint(80, 200)
+            parts.append(np.zeros(SAMPLE_RATE * gap // 1000))
+            position += gap
+        length = 120 + 45 * len(word)
+        parts.append(synth_word(rng, length))
+        position += length
+        word_ends.append(position)
+    parts.append(np.zeros(SAMPLE_RATE * 1500 // 1000))
+    samples = np.concatenate(parts)
+    samples += np.random.default_rng(rng.randint(0, 10**6)).normal(0, 60, len(samples))
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(np.clip(samples, -32768, 32767).astype(np.int16).tobytes())
+    return lead_ms, position, word_ends
+
+
+class FixtureBackend:
+    """Stand-in recognizer: a word shows up in the partial once its audio has been fed"""
+
+    name = "fixture"
+
+    def __init__(self, text, word_ends, finish_ms):
+        self.words = text.split()
+        self.word_ends = word_ends      # audio ms where each word is complete
+        self.finish_ms = finish_ms
+        self.recognizer = None
+        self.fed_ms = 0.0
+
+    def start(self):
+        self.fed_ms = 0.0
+
+    def accept(self, pcm):
+        self.fed_ms += len(pcm) / 2 / SAMPLE_RATE * 1000
+        # The first chunk fed is the pre-roll, from before the detected start
+        heard = self.recognizer.timings["fed_from_ms"] + self.fed_ms
+        return " ".join(w for w, end in zip(self.words, self.word_ends) if end <= heard)
+
+    def finish(self):
+        time.sleep(self.finish_ms / 1000)
+        return " ".join(self.words)
+
+
+def run_synthetic(args):
+    rng = random.Random(11)
+    folder = tempfile.mkdtemp()
+    rows = []
+    for i in range(args.utterances):
+        text = COMMANDS[i % len(COMMANDS)]
+        path = os.path.join(folder, f"utterance_{i}.wav")
+        start, end, word_ends = synth_utterance(path, text, rng)
+        backend = FixtureBackend(text, word_ends, args.finish_ms)
+        recognizer = backend.recognizer = StreamingRecognizer(backend)
+        partials = []
+        wall = time.perf_counter()
+        result = recognizer.listen(WavSource(path), on_partial=partials.append)
+        wall_ms = (time.perf_counter() - wall) * 1000
+        t = recognizer.timings
+        rows.append({
+            "correct": result == text,
+            "start_error": t["speech_start_ms"] - start,
+            "first_partial": t["first_partial_ms"] - start,
+            "stream_final": t["endpoint_ms"] - end + t["final_ms"],
+            "batch_final": PAUSE_THRESHOLD_MS + args.cloud_ms,
+            "rtf": (wall_ms - t["final_ms"]) / (os.path.getsize(path) / 2 / SAMPLE_RATE * 1000),
+            "partials": t["partials"],
+        })
+    return rows
+
+
+def run_fixtures(args):
+    backend = VoskBackend(args.model)
+    rows = []
+    for path in sorted(glob.glob(os.path.join(args.fixtures, "*.wav"))):
+        transcript_path = os.path.splitext(path)[0] + ".txt"
+        expected = open(transcript_path).read().strip().lower() if os.path.exists(transcript_path) else None
+        recognizer = StreamingRecognizer(backend)
+        wall = time.perf_counter()
+        result = recognizer.listen(WavSource(path))
+        wall_ms = (time.perf_counter() - wall) * 1000
+        t = recognizer.timings
+        if t["speech_start_ms"] is None:
+            print(f"   no speech found in {os.path.basename(path)}")
+            continue
+        rows.append({
+            "correct": expected is not None and result == expected,
+            "start_error": 0.0,
+            "first_partial": (t["first_partial_ms"] or t["endpoint_ms"]) - t["speech_start_ms"],
+            "stream_final": recognizer.end_ms + t["final_ms"],
+            "batch_final": PAUSE_THRESHOLD_MS + args.cloud_ms,
+            "rtf": wall_ms / (os.path.getsize(path) / 2 / SAMPLE_RATE * 1000),
+            "partials": t["partials"],
+        })
+        print(f"   {os.path.basename(path)}: {result!r}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--utterances", type=int, default=20)
+    parser.add_argument("--cloud-ms", type=int, default=900)
+    parser.add_argument("--finish-ms", type=int, default=60)
+    parser.add_argument("--fixtures", help="folder of real .wav recordings with .txt transcripts")
+    parser.add_argument("--model", help="Vosk model folder for --fixtures")
+    args = parser.parse_args()
+
+    rows = run_fixtures(args) if args.fixtures else run_synthetic(args)
+    if not rows:
+        print("No utterances")
+        return
+
+    def mean(key):
+        return statistics.mean(row[key] for row in rows)
+
+    print(f"{len(rows)} utterances, {'Vosk on ' + args.fixtures if args.fixtures else 'synthetic fixtures'}\n")
+    print(f"first partial after speech start      {mean('first_partial'):>8.0f} ms")
+    print(f"final transcript after speech end:")
+    print(f"  record then upload (0.8 s pause + cloud) {mean('batch_final'):>5.0f} ms")
+    print(f"  streaming (VAD endpoint + finalize)      {mean('stream_final'):>5.0f} ms")
+    print(f"partials per utterance                 {mean('partials'):>8.1f}")
+    print(f"VAD start error                        {mean('start_error'):>8.0f} ms")
+    print(f"transcripts correct                    {sum(r['correct'] for r in rows)}/{len(rows)}")
+    print(f"pipeline cost per second of audio      {mean('rtf') * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: time to first action with the incremental plan parser (early dispatch)
+versus today's time to [DONE] (parse only after the whole stream)
+
+Usage: python benchmarks/bench_stream_dispatch.py [--queries 10] [--chunk-ms 25]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_ondemand import MockOnDemandServer, write_mock_config
+from kore_ondemand import KoreOnDemand
+
+ANSWERS = {
+    "thought last": {
+        "agent": "FILE_NAVIGATOR",
+        "tool": "FIND_FILE",
+        "parameter": "quarterly_report.pdf",
+        "thought": "Looking through your files for the quarterly report, this may take a moment while I check Documents and Downloads"
+    },
+    "thought first": {
+        "thought": "Looking for your quarterly report",
+        "agent": "FILE_NAVIGATOR",
+        "tool": "FIND_FILE",
+        "parameter": "quarterly_report.pdf"
+    }
+}
+
+
+def run(ondemand, session_id, queries):
+    first_action, done = [], []
+    for _ in range(queries):
+        marks = {}
+        start = time.perf_counter()
+        ondemand.query_agent(
+            "find my quarterly report", session_id,
+            on_action=lambda fields: marks.setdefault("action", time.perf_counter())
+        )
+        end = time.perf_counter()
+        first_action.append((marks.get("action", end) - start) * 1000)
+        done.append((end - start) * 1000)
+    return statistics.median(first_action), statistics.median(done)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--chunk-ms", type=float, default=25.0, help="delay between streamed chunks")
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    print(f"{args.queries} queries per case, {args.chunk_ms:.0f} ms/chunk, first token after {args.first_token_ms:.0f} ms\n")
+    print(f"{'answer order':<16}{'first action':>16}{'[DONE]':>12}{'saved':>12}")
+
+    for label, answer in ANSWERS.items():
+        server = MockOnDemandServer(
+            first_token_delay=args.first_token_ms / 1000,
+            chunk_delay=args.chunk_ms / 1000,
+            answer=json.dumps(answer)
+        ).start()
+        try:
+            config_path = write_mock_config(os.path.join(tempfile.mkdtemp(), "config.json"), server)
+            with contextlib.redirect_stdout(io.StringIO()):
+                ondemand = KoreOnDemand(config_path)
+                session_id = ondemand.create_session()
+                first_action_ms, done_ms = run(ondemand, session_id, args.queries)
+            print(f"{label:<16}{first_action_ms:>13.0f} ms{done_ms:>9.0f} ms{done_ms - first_action_ms:>9.0f} ms")
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: reading CPU usage from the background sampler vs. psutil.cpu_percent(interval=1)
+Times the old blocking read, one sampler tick, and the snapshot + 1/5-minute window reads
+that get_system_info now does
+
+Usage: python benchmarks/bench_sysmon.py [--interval 0.5] [--warmup 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kore_sysmon import SystemSampler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--interval", type=float, default=0.5, help="sampler interval in seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of history to collect first")
+    parser.add_argument("--reads", type=int, default=10000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    psutil.cpu_percent(interval=1)
+    blocking_ms = (time.perf_counter() - start) * 1000
+    print(f"psutil.cpu_percent(interval=1): {blocking_ms:>10.1f} ms per SYSTEM_INFO request")
+
+    sampler = SystemSampler(interval=args.interval)
+    sampler.start()
+    time.sleep(args.warmup)
+    print(f"sampler tick (background):      {sampler.stats['sample_ms']:>10.2f} ms every {args.interval} s")
+
+    timings = []
+    for _ in range(args.reads):
+        start = time.perf_counter()
+        sampler.latest()
+        sampler.window(60)
+        sampler.window(300)
+        timings.append((time.perf_counter() - start) * 1e6)
+    print(f"snapshot + 1m/5m windows:       {statistics.median(timings):>10.1f} us "
+          f"({len(sampler.samples)} samples in history)")
+
+    window = sampler.window(300)
+    print(f"\n5-minute window: cpu avg {window['cpu_percent_avg']:.1f}%, max {window['cpu_percent_max']:.1f}%, "
+          f"per core {window['per_cpu_avg']}")
+    sampler.stop()
+
+
+if __name__ == "__main__":
+    main()
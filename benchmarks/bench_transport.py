@@ -0,0 +1,87 @@
+"""
+Benchmark: per-query latency with bare requests.post (cold, one connection per call)
+versus KoreOnDemand's pooled keep-alive transport (warm)
+
+Usage: python benchmarks/bench_transport.py [--queries 30] [--handshake-ms 150]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_ondemand import MockOnDemandServer, write_mock_config
+from kore_ondemand import KoreOnDemand
+
+
+def summarize(label, samples):
+    samples_ms = [s * 1000 for s in samples]
+    p95 = sorted(samples_ms)[int(len(samples_ms) * 0.95) - 1]
+    print(f"{label:<28} median {statistics.median(samples_ms):8.1f} ms   p95 {p95:8.1f} ms")
+    return statistics.median(samples_ms)
+
+
+def cold_query(base_url, session_id):
+    """The old code path: a fresh connection for every request"""
+    response = requests.post(
+        f"{base_url}/sessions/{session_id}/query",
+        json={"query": "open chrome", "agentIds": ["agent-router"], "responseMode": "stream"},
+        headers={"apikey": "mock-key", "Content-Type": "application/json"},
+        stream=True
+    )
+    for _ in response.iter_lines():
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--handshake-ms", type=float, default=150.0,
+                        help="simulated TCP+TLS handshake cost per new connection")
+    args = parser.parse_args()
+
+    server = MockOnDemandServer(connect_delay=args.handshake_ms / 1000).start()
+    config_path = write_mock_config(os.path.join(tempfile.mkdtemp(), "config.json"), server)
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ondemand = KoreOnDemand(config_path)
+            ondemand.warm_up()
+            session_id = ondemand.create_session()
+
+        connections_before = server.stats["connections"]
+        cold = []
+        for _ in range(args.queries):
+            start = time.perf_counter()
+            cold_query(ondemand.base_url, session_id)
+            cold.append(time.perf_counter() - start)
+        cold_connections = server.stats["connections"] - connections_before
+
+        connections_before = server.stats["connections"]
+        warm = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.queries):
+                start = time.perf_counter()
+                ondemand.query_agent("open chrome", session_id)
+                warm.append(time.perf_counter() - start)
+        warm_connections = server.stats["connections"] - connections_before
+
+        print(f"{args.queries} queries, simulated handshake {args.handshake_ms:.0f} ms\n")
+        cold_ms = summarize("cold (requests.post)", cold)
+        warm_ms = summarize("warm (pooled KoreOnDemand)", warm)
+        print(f"\nnew connections: cold {cold_connections}, warm {warm_connections}")
+        print(f"saved per query: {cold_ms - warm_ms:.1f} ms")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
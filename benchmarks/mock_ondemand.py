@@ -0,0 +1,273 @@
+"""
+Local mock of the OnDemand Chat and Media APIs for benchmarks
+Speaks HTTP/1.1 keep-alive and streams query answers as SSE `data:` events, and can
+inject faults: 500s, hung requests, streams that stall mid-answer and dropped connections
+"""
+
+import json
+import random
+import socket
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_ANSWER = json.dumps({
+    "thought": "Launching Chrome browser for you right away",
+    "agent": "APP_LAUNCHER",
+    "tool": "OPEN_APP",
+    "parameter": "Chrome"
+})
+
+
+class MockOnDemandHandler(BaseHTTPRequestHandler):
+    """Request handler for the mock OnDemand server"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        # Simulate the TCP + TLS handshake cost paid once per new connection
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.stats["connections"] += 1
+        if self.server.connect_delay:
+            time.sleep(self.server.connect_delay)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        body = self._read_body()
+        self.server.stats["requests"] += 1
+        self.server.stats["bytes_received"] += len(body)
+
+        fault = self.server.take_fault()
+        if fault == "error":
+            self._send_json(500, {"message": "injected failure"})
+            return
+        if fault == "hang":
+            # Never answers: only a client read timeout gets the worker back
+            time.sleep(self.server.stall_seconds)
+            return
+        if fault == "reset":
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        self._stall = fault == "stall"
+
+        if not self.server.admit():
+            self.server.stats["throttled"] += 1
+            self.send_response(429)
+            self.send_header("Retry-After", str(self.server.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.path.endswith("/sessions"):
+            if self.server.session_delay:
+                time.sleep(self.server.session_delay)
+            self.server.stats["sessions"] += 1
+            self._send_json(201, {"data": {"id": uuid.uuid4().hex, "contextMetadata": []}})
+        elif self.path.endswith("/query"):
+            if self._load_prompt(body):
+                self._stream_answer()
+        elif self.path.endswith("/public/file/raw"):
+            self._send_json(201, {"data": {"id": uuid.uuid4().hex, "url": "http://mock/file"}})
+        else:
+            self._send_json(404, {"message": "not found"})
+
+    def _load_prompt(self, body: bytes) -> bool:
+        """
+        Fulfillment prompt handling: a full prompt costs prompt_ms_per_kb to process and
+        is kept for the session under its fulfillmentPromptRef; a bare reference is only
+        accepted for the session that received the prompt (422 otherwise)
+        """
+        server = self.server
+        try:
+            configs = json.loads(body).get("modelConfigs", {})
+        except ValueError:
+            return True
+        session_id = self.path.split("/")[-2]
+        prompt, ref = configs.get("fulfillmentPrompt"), configs.get("fulfillmentPromptRef")
+        if prompt is not None:
+            if server.prompt_ms_per_kb:
+                time.sleep(len(prompt.encode("utf-8")) / 1024 * server.prompt_ms_per_kb / 1000)
+            if ref:
+                server.session_prompts[session_id] = ref
+            return True
+        if ref and server.session_prompts.get(session_id) != ref:
+            self._send_json(422, {"message": "unknown fulfillmentPromptRef"})
+            return False
+        return True
+
+    def _stream_answer(self):
+        server = self.server
+        if server.first_token_delay:
+            time.sleep(server.first_token_delay)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        answer = server.answer
+        size = server.chunk_size
+        for i in range(0, len(answer), size):
+            event = {"eventType": "fulfillment", "answer": answer[i:i + size]}
+            self._send_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            if self._stall:
+                # Headers and a first chunk, then silence for stall_seconds
+                time.sleep(server.stall_seconds)
+                self._stall = False
+            if server.chunk_delay:
+                time.sleep(server.chunk_delay)
+
+        self._send_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class MockOnDemandServer(ThreadingHTTPServer):
+    """Threaded mock server; run with start() and stop()"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, connect_delay=0.0, first_token_delay=0.0,
+                 chunk_delay=0.0, chunk_size=8, answer=DEFAULT_ANSWER, max_rps=None, retry_after=1,
+                 session_delay=0.0, prompt_ms_per_kb=0.0):
+        super().__init__(("127.0.0.1", port), MockOnDemandHandler)
+        self.connect_delay = connect_delay
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.session_delay = session_delay
+        self.prompt_ms_per_kb = prompt_ms_per_kb
+        self.session_prompts = {}
+        self.chunk_size = chunk_size
+        self.answer = answer
+        self.stats = {"connections": 0, "requests": 0, "bytes_received": 0, "throttled": 0, "faults": 0,
+                      "sessions": 0}
+        self._thread = None
+
+        # Server-side rate limit: at most max_rps requests per rolling second, 429 beyond it
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self._recent = []
+        self._admit_lock = threading.Lock()
+
+        self.fault = None
+        self.fault_rate = 1.0
+        self.fault_count = None
+        self.stall_seconds = 30.0
+
+    def inject(self, fault=None, rate=1.0, count=None, stall_seconds=None):
+        """
+        Fault for POSTs: "error" (500), "hang" (no response), "stall" (stream goes silent
+        after the first chunk), "reset" (connection dropped) or None; `count` heals after that many
+        """
+        with self._admit_lock:
+            self.fault = fault
+            self.fault_rate = rate
+            self.fault_count = count
+            if stall_seconds is not None:
+                self.stall_seconds = stall_seconds
+
+    def take_fault(self):
+        with self._admit_lock:
+            if not self.fault or random.random() >= self.fault_rate:
+                return None
+            if self.fault_count is not None:
+                if self.fault_count <= 0:
+                    return None
+                self.fault_count -= 1
+            self.stats["faults"] += 1
+            return self.fault
+
+    def admit(self) -> bool:
+        if not self.max_rps:
+            return True
+        with self._admit_lock:
+            now = time.monotonic()
+            self._recent = [t for t in self._recent if now - t < 1.0]
+            if len(self._recent) >= self.max_rps:
+                return False
+            self._recent.append(now)
+            return True
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up on injected faults are expected; don't print tracebacks
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def write_mock_config(path: str, server: MockOnDemandServer, **overrides) -> str:
+    """Write a KoreOnDemand config pointing at the mock server"""
+    config = {
+        "api_key": "mock-key",
+        "external_user_id": "mock-user",
+        "base_url": f"{server.url}/chat/v1",
+        "media_base_url": f"{server.url}/media/v1",
+        "agents": {
+            "agent1_command_router": "agent-router",
+            "agent2_file_navigator": "agent-files",
+            "agent3_system_monitor": "agent-monitor",
+            "agent4_web_research": "agent-web",
+            "agent5_code_assistant": "agent-code",
+            "agent6_visual_ai": "agent-visual",
+            "agent7_conversational": "agent-dll"
+        },
+        "response_mode": "stream",
+        "temperature": 0.7,
+        # Benchmarks repeat the same command; measure the wire, not the plan cache
+        "plan_cache": {"enabled": False},
+        # ...and not the client-side rate limiter either, unless a benchmark asks for it
+        "rate_limit": {"rate": 1000, "burst": 1000}
+    }
+    config.update(overrides)
+    with open(path, 'w') as f:
+        json.dump(config, f, indent=2)
+    return path
+
+
+if __name__ == "__main__":
+    server = MockOnDemandServer(port=8765, connect_delay=0.15).start()
+    print(f"Mock OnDemand running at {server.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
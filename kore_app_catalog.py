@@ -0,0 +1,356 @@
+"""
+Kore Application Catalog
+Persistent name -> executable catalog built from Program Files and Start Menu shortcuts,
+so open_application is a dictionary lookup instead of an os.walk per call
+"""
+
+import difflib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+CATALOG_VERSION = 1
+DEFAULT_CATALOG_PATH = "kore_app_catalog.json"
+
+# Group name for everything found under the Start Menu roots
+SHORTCUTS = "<start menu>"
+
+# Executables and shortcuts that are never what "open X" means
+IGNORED_NAMES = re.compile(
+    r"^(unins\d*|uninstall.*|.* uninstall.*|setup|install.*|.*updater?|update.*|.*crash.*|.*helper.*|"
+    r"vc_?redist.*|dxsetup|.*elevat.*|.*service|.*website|.*read ?me|.*help|.*documentation|.*release notes)$"
+)
+
+VENDOR_WORDS = {"microsoft", "adobe", "google", "mozilla", "jetbrains", "autodesk", "apple", "oracle", "the"}
+NOISE_WORDS = {"x64", "x86", "64", "32", "bit", "64bit", "32bit", "portable", "beta", "preview"}
+
+# Fuzzy matches below this similarity are not launched
+FUZZY_CUTOFF = 0.8
+
+# A miss re-checks the install folders in the background, at most this often (seconds)
+MISS_REFRESH_INTERVAL = 30.0
+
+
+def default_exe_roots() -> List[str]:
+    local_appdata = os.environ.get("LOCALAPPDATA",
+                                   f"C:\\Users\\{os.environ.get('USERNAME', 'User')}\\AppData\\Local")
+    return [
+        "C:\\Program Files",
+        "C:\\Program Files (x86)",
+        os.path.join(local_appdata, "Programs")
+    ]
+
+
+def default_shortcut_roots() -> List[str]:
+    appdata = os.environ.get("APPDATA",
+                             f"C:\\Users\\{os.environ.get('USERNAME', 'User')}\\AppData\\Roaming")
+    programdata = os.environ.get("PROGRAMDATA", "C:\\ProgramData")
+    return [
+        os.path.join(appdata, "Microsoft", "Windows", "Start Menu", "Programs"),
+        os.path.join(programdata, "Microsoft", "Windows", "Start Menu", "Programs")
+    ]
+
+
+def normalize_app_name(name: str) -> str:
+    """'Notepad++ (x64) 8.6.lnk' -> 'notepad plus plus'"""
+    name = re.sub(r"\.(exe|lnk)$", "", name.lower())
+    name = re.sub(r"\(.*?\)", " ", name)
+    name = re.sub(r"\bv?\d+(\.\d+)+\b", " ", name)     # versions
+    name = re.sub(r"\b(19|20)\d{2}\b", " ", name)      # release years
+    name = name.replace("+", " plus ")
+    words = [w for w in re.findall(r"[a-z0-9]+", name) if w not in NOISE_WORDS]
+    return " ".join(words)
+
+
+def app_aliases(name: str) -> List[str]:
+    """Every normalized form a user might say for an app name"""
+    full = normalize_app_name(name)
+    if not full:
+        return []
+    aliases = [full]
+    words = full.split()
+    if len(words) > 1 and words[0] in VENDOR_WORDS:
+        aliases.append(" ".join(words[1:]))
+    if "plus plus" in full:
+        aliases.append(full.replace(" plus plus", "").strip())
+    return aliases
+
+
+class AppCatalog:
+    """
+    Catalog of launchable apps, grouped by top-level install folder
+    (e.g. C:\\Program Files\\Mozilla Firefox) so one install or uninstall
+    only re-scans its own group
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CATALOG_PATH, exe_roots: Optional[List[str]] = None,
+                 shortcut_roots: Optional[List[str]] = None):
+        self.path = path
+        self.exe_roots = exe_roots if exe_roots is not None else default_exe_roots()
+        self.shortcut_roots = shortcut_roots if shortcut_roots is not None else default_shortcut_roots()
+
+        self.groups = {}        # group folder -> [{"name", "target", "rank"}]
+        self.journal = {}       # group folder -> {folder: mtime} for the folders that reveal changes
+        self.aliases = {}       # normalized alias -> app
+        self.built_at = 0.0
+
+        self.ready = False
+        self.building = False
+        self.stats = {"lookups": 0, "hits": 0, "fuzzy_hits": 0, "misses": 0, "groups_scanned": 0}
+        self._fuzzy_cache = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._miss_refresh_at = 0.0
+
+    # ---------- lookup ----------
+
+    def find(self, app_name: str) -> Optional[str]:
+        """Launch target (.exe or .lnk) for a spoken/typed app name, or None"""
+        key = normalize_app_name(app_name)
+        self.stats["lookups"] += 1
+        if not key:
+            self.stats["misses"] += 1
+            return None
+
+        app = self.aliases.get(key)
+        if app is not None:
+            self.stats["hits"] += 1
+            return app["target"]
+
+        # Close spelling ("fire fox", "spotifiy"); difflib is linear, so remember the answer
+        if key not in self._fuzzy_cache:
+            close = difflib.get_close_matches(key, list(self.aliases), n=1, cutoff=FUZZY_CUTOFF)
+            self._fuzzy_cache[key] = close[0] if close else None
+        alias = self._fuzzy_cache[key]
+        if alias is not None and alias in self.aliases:
+            self.stats["fuzzy_hits"] += 1
+            return self.aliases[alias]["target"]
+
+        self.stats["misses"] += 1
+        # Installed since the last refresh? Catch up in the background so a retry finds it
+        if self.ready and time.monotonic() - self._miss_refresh_at >= MISS_REFRESH_INTERVAL:
+            self._miss_refresh_at = time.monotonic()
+            self.start_refresh()
+        return None
+
+    def __len__(self):
+        return sum(len(apps) for apps in self.groups.values())
+
+    # ---------- building ----------
+
+    def build(self) -> int:
+        """Full scan of every root; returns the number of apps"""
+        groups, journal = {}, {}
+        for group in self._list_groups():
+            groups[group], journal[group] = self._scan_group(group)
+        groups[SHORTCUTS], journal[SHORTCUTS] = self._scan_shortcuts()
+        self.stats["groups_scanned"] += len(groups)
+
+        with self._lock:
+            self.groups, self.journal = groups, journal
+            self.built_at = time.time()
+            self._reindex()
+        self.save()
+        return len(self)
+
+    def refresh(self) -> int:
+        """
+        Incremental update: re-scan only groups whose journalled folders changed,
+        add new install folders and drop uninstalled ones. Returns groups re-scanned.
+        """
+        current = set(self._list_groups()) | {SHORTCUTS}
+        with self._lock:
+            known = dict(self.journal)
+
+        rescan = [group for group in current if group not in known or self._changed(known[group])]
+        removed = [group for group in known if group not in current]
+        if not rescan and not removed:
+            return 0
+
+        scanned = {}
+        for group in rescan:
+            scanned[group] = self._scan_shortcuts() if group == SHORTCUTS else self._scan_group(group)
+        self.stats["groups_scanned"] += len(scanned)
+
+        with self._lock:
+            for group in removed:
+                self.groups.pop(group, None)
+                self.journal.pop(group, None)
+            for group, (apps, journal) in scanned.items():
+                self.groups[group], self.journal[group] = apps, journal
+            self._reindex()
+        self.save()
+        return len(rescan) + len(removed)
+
+    def start_refresh(self) -> threading.Thread:
+        """Build (first run) or refresh the catalog in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        def run():
+            self.building = True
+            try:
+                if self.ready:
+                    changed = self.refresh()
+                    if changed:
+                        print(f"   [Apps] Catalog refreshed ({changed} install folders changed)")
+                else:
+                    count = self.build()
+                    print(f"   [Apps] Catalog built with {count} apps")
+            except Exception as e:
+                print(f"   [Apps Error] Catalog update failed: {e}")
+            finally:
+                self.building = False
+
+        self._thread = threading.Thread(target=run, name="kore-app-catalog", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _list_groups(self) -> List[str]:
+        groups = []
+        for root in self.exe_roots:
+            try:
+                with os.scandir(root) as iterator:
+                    groups.extend(item.path for item in iterator if item.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+        return groups
+
+    @staticmethod
+    def _changed(journal: Dict[str, float]) -> bool:
+        for folder, mtime in journal.items():
+            try:
+                if os.stat(folder).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _scan_group(self, group: str) -> Tuple[List[Dict], Dict[str, float]]:
+        """All launchable .exe files below one install folder"""
+        apps, journal = [], {}
+        stack = [(group, 0)]
+        while stack:
+            folder, depth = stack.pop()
+            try:
+                # Installs and uninstalls show up in the top two levels
+                if depth <= 1:
+                    journal[folder] = os.stat(folder).st_mtime
+                with os.scandir(folder) as iterator:
+                    for item in iterator:
+                        if item.is_dir(follow_symlinks=False):
+                            stack.append((item.path, depth + 1))
+                        elif item.name.lower().endswith(".exe"):
+                            stem = item.name[:-4]
+                            if not IGNORED_NAMES.match(stem.lower()):
+                                apps.append({"name": stem, "target": item.path, "rank": 1 + depth})
+            except OSError:
+                continue
+        return apps, journal
+
+    def _scan_shortcuts(self) -> Tuple[List[Dict], Dict[str, float]]:
+        """Start Menu .lnk files: the names users actually know apps by"""
+        apps, journal = [], {}
+        stack = [root for root in self.shortcut_roots]
+        while stack:
+            folder = stack.pop()
+            try:
+                journal[folder] = os.stat(folder).st_mtime
+                with os.scandir(folder) as iterator:
+                    for item in iterator:
+                        if item.is_dir(follow_symlinks=False):
+                            stack.append(item.path)
+                        elif item.name.lower().endswith(".lnk"):
+                            stem = item.name[:-4]
+                            if not IGNORED_NAMES.match(stem.lower()):
+                                apps.append({"name": stem, "target": item.path, "rank": 0})
+            except OSError:
+                continue
+        return apps, journal
+
+    @staticmethod
+    def _main_app(group: str, apps: List[Dict]) -> Dict:
+        """The executable an install folder is named after: "Code Forge 9" -> CodeForge.exe"""
+        folder = normalize_app_name(os.path.basename(group)).replace(" ", "")
+
+        def key(app):
+            name = normalize_app_name(app["name"]).replace(" ", "")
+            return (not (name and name in folder), app["rank"], len(app["target"]))
+        return min(apps, key=key)
+
+    def _reindex(self):
+        # Shortcuts beat executables, shallow executables beat deeply nested ones
+        aliases = {}
+        for apps in self.groups.values():
+            for app in apps:
+                for alias in app_aliases(app["name"]):
+                    best = aliases.get(alias)
+                    if best is None or (app["rank"], len(app["target"])) < (best["rank"], len(best["target"])):
+                        aliases[alias] = app
+        # Install folder names ("Microsoft Code Forge 9") for names no app already claims
+        for group, apps in self.groups.items():
+            if group != SHORTCUTS and apps:
+                app = self._main_app(group, apps)
+                for alias in app_aliases(os.path.basename(group)):
+                    aliases.setdefault(alias, app)
+        self.aliases = aliases
+        self._fuzzy_cache = {}
+        self.ready = True
+
+    # ---------- persistence ----------
+
+    def save(self):
+        """Save catalog and journal as JSON"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                "version": CATALOG_VERSION,
+                "built_at": self.built_at,
+                "groups": self.groups,
+                "journal": self.journal
+            }
+            try:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"   [Apps Error] Could not save catalog: {e}")
+
+    def load(self) -> bool:
+        """Load a saved catalog; returns False when there is none"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != CATALOG_VERSION:
+                return False
+        except Exception as e:
+            print(f"   [Apps Warning] Could not load {self.path}: {e}")
+            return False
+
+        with self._lock:
+            self.groups = data["groups"]
+            self.journal = data["journal"]
+            self.built_at = data.get("built_at", 0.0)
+            self._reindex()
+        return True
+
+
+# Global instance
+_catalog_instance = None
+
+def get_app_catalog() -> AppCatalog:
+    """Get or create the global app catalog; loads it from disk and refreshes it in the background"""
+    global _catalog_instance
+    if _catalog_instance is None:
+        _catalog_instance = AppCatalog()
+        if _catalog_instance.load():
+            print(f"   [Apps] Loaded {len(_catalog_instance)} apps from {_catalog_instance.path}")
+        _catalog_instance.start_refresh()
+    return _catalog_instance
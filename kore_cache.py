@@ -0,0 +1,175 @@
+"""
+Kore Plan Cache
+Remembers the Command Router's plan for repeated commands so they skip the round trip
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+# Tools whose plans are never replayed from cache: a stale or misheard repeat must
+# always be confirmed by the router before anything is deleted, killed or moved
+NEVER_CACHE = {
+    "DELETE_FILE", "KILL_PROCESS", "EMPTY_RECYCLE_BIN", "RUN_CMD",
+    "MOVE_FILE", "EDIT_FILE", "ORGANIZE_FILES", "FIX_DLL_ERROR", "UNDO_FILE_OPERATION",
+    # Conversational replies should not repeat word for word
+    "CHAT"
+}
+
+# Bumped whenever normalize() changes, so keys saved under the old rules are dropped
+CACHE_VERSION = 2
+
+# Politeness and filler only: directions, prepositions and single letters ("up", "to",
+# "move a to b") change what a command means
+STOP_WORDS = {
+    "an", "the", "me", "please", "kore", "hey", "hi", "can", "could", "would",
+    "will", "you", "just", "ahead", "want", "need", "wanna", "some"
+}
+
+# Words kept together: file names, paths and dotted versions ("report.pdf", "c:\\temp")
+TOKEN = re.compile(r"[a-z0-9]+(?:[._\-\\/:]+[a-z0-9]+)*")
+
+
+class PlanCache:
+    """LRU + TTL cache of router plans keyed on the normalized command, persisted as JSON"""
+
+    def __init__(self, path: Optional[str] = "kore_plan_cache.json", max_entries: int = 256,
+                 ttl: float = 24 * 3600, never_cache: Iterable[str] = NEVER_CACHE):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.never_cache = set(never_cache)
+
+        self.entries = OrderedDict()    # key -> {"plan": dict, "time": float}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.load()
+
+    @staticmethod
+    def normalize(command: str) -> str:
+        """Case, whitespace, punctuation and stop words don't change the plan"""
+        tokens = TOKEN.findall(command.lower())
+        words = [t for t in tokens if t not in STOP_WORDS]
+        # A command made only of stop words ("hi kore") still needs a key of its own
+        return " ".join(words or tokens)
+
+    def get(self, command: str, allow_stale: bool = False) -> Optional[Dict]:
+        """Cached plan for the command, or None; allow_stale also returns expired plans (router down)"""
+        key = self.normalize(command)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and not allow_stale and self._expired(entry):
+                del self.entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            plan = dict(entry["plan"])
+
+        plan["source"] = "cache"
+        return plan
+
+    def cacheable(self, plan: Optional[Dict]) -> bool:
+        """False for plans using a never-cache tool, including any step of a compound plan"""
+        if not plan:
+            return False
+        steps = plan.get("steps") if isinstance(plan.get("steps"), list) else []
+        tools = [plan.get("tool")] + [step.get("tool") for step in steps if isinstance(step, dict)]
+        return not any(tool in self.never_cache for tool in tools)
+
+    def put(self, command: str, plan: Optional[Dict]) -> bool:
+        """Remember a router plan; returns False when the plan is not cacheable"""
+        if not self.cacheable(plan):
+            return False
+
+        key = self.normalize(command)
+        if not key:
+            return False
+
+        stored = {k: v for k, v in plan.items() if k != "source"}
+        with self._lock:
+            self.entries[key] = {"plan": stored, "time": time.time()}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        self.save()
+        return True
+
+    def invalidate(self, command: Optional[str] = None, tool: Optional[str] = None) -> int:
+        """
+        Drop entries for one command, for every plan using a tool, or everything when
+        called without arguments. Returns how many entries were removed.
+        """
+        with self._lock:
+            if command is None and tool is None:
+                keys = list(self.entries)
+            else:
+                keys = []
+                if command is not None and self.normalize(command) in self.entries:
+                    keys.append(self.normalize(command))
+                if tool is not None:
+                    keys += [k for k, e in self.entries.items()
+                             if e["plan"].get("tool") == tool and k not in keys]
+
+            for key in keys:
+                del self.entries[key]
+
+        if keys:
+            self.save()
+        return len(keys)
+
+    @property
+    def stats(self) -> Dict:
+        """Hit/miss counters for the current run"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries)
+        }
+
+    def _expired(self, entry: Dict) -> bool:
+        return self.ttl is not None and time.time() - entry["time"] > self.ttl
+
+    def load(self):
+        """Load persisted entries, dropping expired and no-longer-cacheable ones"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"   [Cache Warning] Could not load {self.path}: {e}")
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+
+        entries = sorted(data.get("entries", {}).items(), key=lambda item: item[1]["time"])
+        for key, entry in entries[-self.max_entries:]:
+            if not self._expired(entry) and self.cacheable(entry["plan"]):
+                self.entries[key] = entry
+
+    def save(self):
+        """Write entries to disk (atomically, so a crash never leaves half a file)"""
+        if not self.path:
+            return
+        with self._lock:
+            try:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump({"version": CACHE_VERSION, "entries": self.entries}, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"   [Cache Error] Could not save: {e}")
@@ -0,0 +1,414 @@
+"""
+Kore OnDemand Client
+Shared request stack for the agent scripts (agent1.py - agent7.py): one pooled
+keep-alive transport with the shared timeouts, retries and rate limiter, one SSE
+parser, one media uploader, per-call instrumentation, and an AgentProfile holding
+everything that differs between agents
+"""
+
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from kore_prompts import PromptRegistry, get_prompt_registry
+from kore_ratelimit import THROTTLE_STATUSES, TokenBucket
+from kore_resilience import CircuitOpenError, ResiliencePolicy
+
+BASE_URL = "https://api.on-demand.io/chat/v1"
+MEDIA_BASE_URL = "https://api.on-demand.io/media/v1"
+
+PLACEHOLDER_API_KEY = "<your_api_key>"
+PLACEHOLDER_USER_ID = "<your_external_user_id>"
+PLACEHOLDER_FILE_PATH = "<path_to_your_file>"
+
+CREATED_BY = "AIREV"
+UPDATED_BY = "AIREV"
+
+# Answer to a prompt reference the server does not know (e.g. after a restart)
+PROMPT_REJECTED_STATUSES = (409, 422)
+
+
+def parse_sse_line(line_str: str):
+    """
+    Parse one SSE line
+    Returns "[DONE]", an event dict, or None for anything else
+    """
+    if not line_str.startswith("data:"):
+        return None
+
+    data_str = line_str[len("data:"):].strip()
+    if data_str == "[DONE]":
+        return data_str
+
+    try:
+        return json.loads(data_str)
+    except json.JSONDecodeError:
+        return None
+
+
+def iter_sse_events(lines: Iterable[bytes]) -> Iterator[Dict]:
+    """SSE event dicts from a response's raw lines, up to [DONE]"""
+    for line in lines:
+        if not line:
+            continue
+        event = parse_sse_line(line.decode('utf-8').strip())
+        if event == "[DONE]":
+            return
+        if event:
+            yield event
+
+
+class AgentProfile:
+    """What one agent sends: agent IDs, endpoint, prompt and model settings"""
+
+    def __init__(self, name: str, agent_ids: List[str], endpoint_id: str, fulfillment_prompt: str,
+                 reasoning_mode: str = "grok-4-fast", file_agent_ids: Optional[List[str]] = None,
+                 response_mode: str = "stream", stop_sequences: Optional[List[str]] = None,
+                 temperature: float = 0.7, top_p: float = 1, max_tokens: int = 0,
+                 presence_penalty: float = 0, frequency_penalty: float = 0):
+        self.name = name
+        self.agent_ids = list(agent_ids)
+        self.file_agent_ids = list(file_agent_ids or [])
+        self.endpoint_id = endpoint_id
+        self.reasoning_mode = reasoning_mode
+        self.response_mode = response_mode
+
+        # Versioned by content hash: a session gets the text once, then only the reference
+        self.prompt = get_prompt_registry().register(name, fulfillment_prompt)
+
+        # Built once; only the query text changes between requests. The reference is an
+        # extension of servers that keep prompts per session, not part of the OnDemand API
+        settings = {
+            "stopSequences": list(stop_sequences or []),
+            "temperature": temperature,
+            "topP": top_p,
+            "maxTokens": max_tokens,
+            "presencePenalty": presence_penalty,
+            "frequencyPenalty": frequency_penalty,
+        }
+        self.model_configs = dict(settings, fulfillmentPrompt=fulfillment_prompt)
+        self.model_configs_bind = dict(self.model_configs, fulfillmentPromptRef=self.prompt.digest)
+        self.model_configs_ref = dict(settings, fulfillmentPromptRef=self.prompt.digest)
+
+    @property
+    def streamed(self) -> bool:
+        return self.response_mode == "stream"
+
+    def session_body(self, external_user_id: str, context_metadata: List[Dict[str, str]]) -> Dict:
+        return {
+            "agentIds": self.agent_ids,
+            "externalUserId": external_user_id,
+            "contextMetadata": context_metadata,
+        }
+
+    def query_body(self, query: str, prompt_bound: bool = False, bind: bool = False) -> Dict:
+        """
+        prompt_bound: the session already has this prompt, send only its reference
+        bind: send the full prompt tagged with its reference so the server keeps it
+        """
+        if prompt_bound:
+            configs = self.model_configs_ref
+        else:
+            configs = self.model_configs_bind if bind else self.model_configs
+        return {
+            "endpointId": self.endpoint_id,
+            "query": query,
+            "agentIds": self.agent_ids,
+            "responseMode": self.response_mode,
+            "reasoningMode": self.reasoning_mode,
+            "modelConfigs": configs,
+        }
+
+
+class CallStats:
+    """Count, errors and latency for one call kind"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.first_event_ms = 0.0    # streamed queries: time to the first SSE event
+
+    def record(self, ms: float, ok: bool, first_event_ms: Optional[float] = None):
+        self.calls += 1
+        self.total_ms += ms
+        if not ok:
+            self.errors += 1
+        if first_event_ms is not None:
+            self.first_event_ms += first_event_ms
+
+    def as_dict(self) -> Dict:
+        calls = max(self.calls, 1)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / calls, 1),
+            "avg_first_event_ms": round(self.first_event_ms / calls, 1),
+        }
+
+
+class OnDemandClient:
+    """
+    One client per API key, shared by every agent profile in the process
+        client = get_client(API_KEY)
+        session_id = client.create_session(profile, context_metadata)
+        result = client.query(profile, session_id, "Is Chrome running?")
+    """
+
+    def __init__(self, api_key: str, base_url: str = BASE_URL, media_base_url: str = MEDIA_BASE_URL,
+                 external_user_id: Optional[str] = None, pool_size: int = 10,
+                 resilience: Optional[ResiliencePolicy] = None, limiter: Optional[TokenBucket] = None,
+                 throttle_retries: int = 2, prompts: Optional[PromptRegistry] = None,
+                 bind_prompts: bool = False):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.media_base_url = media_base_url
+        self.external_user_id = external_user_id or str(uuid.uuid4())
+        self.resilience = resilience or ResiliencePolicy()
+        self.limiter = limiter or TokenBucket()
+        self.throttle_retries = throttle_retries
+        self.prompts = prompts or get_prompt_registry()
+        # Only for servers that keep prompts per session (fulfillmentPromptRef); the
+        # OnDemand API does not, so by default the full prompt goes with every query
+        self.bind_prompts = bind_prompts
+
+        self.http = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, pool_block=False)
+        self.http.mount("https://", self._adapter)
+        self.http.mount("http://", self._adapter)
+        self.http.headers.update({"apikey": api_key, "Connection": "keep-alive"})
+
+        self.stats = {kind: CallStats() for kind in ("session", "query", "upload")}
+
+    # ---------- transport ----------
+
+    def _send(self, url: str, timeout, **kwargs) -> requests.Response:
+        """One POST through the rate limiter; 429/503 are sent again after Retry-After"""
+        for attempt in range(self.throttle_retries + 1):
+            self.limiter.acquire()
+            response = self.http.post(url, timeout=timeout, **kwargs)
+            if response.status_code not in THROTTLE_STATUSES:
+                self.limiter.succeeded()
+                return response
+            self.limiter.throttled(response.headers.get("Retry-After"))
+            if attempt < self.throttle_retries:
+                response.close()
+                for _, file_tuple in (kwargs.get("files") or {}).items():
+                    file_tuple[1].seek(0)
+        return response
+
+    def _post(self, url: str, kind: str, **kwargs) -> requests.Response:
+        return self.resilience.call(kind, lambda timeout: self._send(url, timeout, **kwargs),
+                                    streamed=kwargs.get("stream", False))
+
+    def connections(self) -> int:
+        """TCP connections opened so far (fewer than calls means they were reused)"""
+        pools = self._adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    # ---------- calls ----------
+
+    def create_session(self, profile: AgentProfile,
+                       context_metadata: Optional[List[Dict[str, str]]] = None) -> Optional[str]:
+        """Create a chat session for the profile's agents; returns its ID"""
+        start = time.perf_counter()
+        session_id = None
+        try:
+            response = self._post(f"{self.base_url}/sessions", "session",
+                                  json=profile.session_body(self.external_user_id, context_metadata or []))
+            if response.status_code == 201:
+                session_id = response.json()["data"]["id"]
+            else:
+                print(f"   [Client Error] {profile.name}: session creation failed: "
+                      f"{response.status_code} - {response.text}")
+        except CircuitOpenError as e:
+            print(f"   [Client] {e}")
+        except Exception as e:
+            print(f"   [Client Error] {profile.name}: {e}")
+        self._record("session", profile, start, session_id is not None)
+        return session_id
+
+    def query(self, profile: AgentProfile, session_id: str, query: str,
+              on_answer: Optional[Callable[[str], None]] = None) -> Optional[Dict]:
+        """
+        Submit a query; returns the response "data" (answer, sessionId, messageId,
+        metrics, status). Streamed answers are passed to on_answer as they arrive.
+        """
+        start = time.perf_counter()
+        first_event_ms = None
+        result = None
+        url = f"{self.base_url}/sessions/{session_id}/query"
+        bound = self.bind_prompts and self.prompts.bound(session_id) == profile.prompt.digest
+        try:
+            response = self._post(url, "query", json=profile.query_body(query, bound, self.bind_prompts),
+                                  stream=profile.streamed)
+            if bound and response.status_code in PROMPT_REJECTED_STATUSES:
+                # The server lost the session's prompt; send the text again
+                self._release(response)
+                self.prompts.unbind(session_id)
+                bound = False
+                response = self._post(url, "query", json=profile.query_body(query, bind=True),
+                                      stream=profile.streamed)
+
+            if response.status_code == 200 and self.bind_prompts:
+                if bound:
+                    self.prompts.referenced(profile.prompt)
+                else:
+                    self.prompts.bind(session_id, profile.prompt)
+
+            if response.status_code != 200:
+                print(f"   [Client Error] {profile.name}: query failed: {response.status_code} - {response.text}")
+            elif not profile.streamed:
+                result = response.json().get("data", {})
+            else:
+                result = {"sessionId": "", "messageId": "", "answer": "", "metrics": {}, "status": "completed"}
+                try:
+                    for event in iter_sse_events(response.iter_lines()):
+                        if first_event_ms is None:
+                            first_event_ms = (time.perf_counter() - start) * 1000
+                        self._apply_event(result, event, on_answer)
+                except Exception:
+                    self.resilience.stream_done(False)
+                    raise
+                self.resilience.stream_done(True)
+            self._release(response)
+        except CircuitOpenError as e:
+            print(f"   [Client] {e}")
+        except Exception as e:
+            print(f"   [Client Error] {profile.name}: query failed: {e}")
+            result = None
+        self._record("query", profile, start, result is not None, first_event_ms)
+        return result
+
+    @staticmethod
+    def _release(response):
+        """Read what is left after [DONE] so the connection goes back to the pool"""
+        try:
+            response.raw.drain_conn()
+            response.raw.release_conn()
+        except Exception:
+            response.close()
+
+    @staticmethod
+    def _apply_event(result: Dict, event: Dict, on_answer: Optional[Callable[[str], None]]):
+        if event.get("eventType") == "fulfillment":
+            if "answer" in event:
+                result["answer"] += event["answer"]
+                if on_answer:
+                    on_answer(event["answer"])
+            if "sessionId" in event:
+                result["sessionId"] = event["sessionId"]
+            if "messageId" in event:
+                result["messageId"] = event["messageId"]
+        elif event.get("eventType") == "metricsLog" and "publicMetrics" in event:
+            result["metrics"] = event["publicMetrics"]
+
+    def upload_media(self, profile: AgentProfile, session_id: str, file_path: str,
+                     file_name: Optional[str] = None) -> Optional[Dict]:
+        """Upload a file for the profile's file agents; returns the media "data" dict"""
+        if not os.path.exists(file_path):
+            print(f"   [Client Error] File not found: {file_path}")
+            return None
+
+        start = time.perf_counter()
+        media = None
+        data = {
+            'createdBy': CREATED_BY,
+            'updatedBy': UPDATED_BY,
+            'name': file_name or os.path.basename(file_path),
+            'responseMode': profile.response_mode,
+            'sessionId': session_id,
+            'agents': profile.file_agent_ids,
+        }
+        try:
+            with open(file_path, 'rb') as f:
+                response = self._post(f"{self.media_base_url}/public/file/raw", "upload",
+                                      files={'file': (os.path.basename(file_path), f)}, data=data)
+            if response.status_code in (200, 201):
+                media = response.json()['data']
+            else:
+                print(f"   [Client Error] {profile.name}: upload failed: {response.status_code} - {response.text}")
+        except CircuitOpenError as e:
+            print(f"   [Client] {e}")
+        except Exception as e:
+            print(f"   [Client Error] {profile.name}: upload failed: {e}")
+        self._record("upload", profile, start, media is not None)
+        return media
+
+    def _record(self, kind: str, profile: AgentProfile, start: float, ok: bool,
+                first_event_ms: Optional[float] = None):
+        ms = (time.perf_counter() - start) * 1000
+        self.stats[kind].record(ms, ok, first_event_ms)
+        first = f", first event {first_event_ms:.0f} ms" if first_event_ms is not None else ""
+        print(f"   [Client] {profile.name} {kind} {'ok' if ok else 'failed'} in {ms:.0f} ms{first}")
+
+    def snapshot(self) -> Dict:
+        snapshot = {kind: stats.as_dict() for kind, stats in self.stats.items()}
+        snapshot["connections"] = self.connections()
+        snapshot["resilience"] = self.resilience.stats()
+        return snapshot
+
+    def close(self):
+        self.http.close()
+
+
+def run_agent(profile: AgentProfile, query: str, api_key: str, external_user_id: Optional[str] = None,
+              file_path: Optional[str] = None, file_name: Optional[str] = None,
+              context_metadata: Optional[List[Dict[str, str]]] = None,
+              base_url: str = BASE_URL, media_base_url: str = MEDIA_BASE_URL) -> Optional[Dict]:
+    """
+    What every agentN.py does when run: create a session, upload the optional file,
+    submit the query and print the final response with the context metadata appended
+    """
+    if not api_key or api_key == PLACEHOLDER_API_KEY:
+        print("❌ Please set API_KEY.")
+        sys.exit(1)
+
+    if not external_user_id or external_user_id == PLACEHOLDER_USER_ID:
+        external_user_id = str(uuid.uuid4())
+        print(f"⚠️  Generated EXTERNAL_USER_ID: {external_user_id}")
+
+    context_metadata = context_metadata or [
+        {"key": "userId", "value": "1"},
+        {"key": "name", "value": "John"},
+    ]
+
+    client = get_client(api_key, base_url, media_base_url)
+    client.external_user_id = external_user_id
+
+    session_id = client.create_session(profile, context_metadata)
+    if not session_id:
+        return None
+    print(f"✅ Chat session created. Session ID: {session_id}")
+
+    if file_path and file_path != PLACEHOLDER_FILE_PATH and os.path.exists(file_path):
+        media = client.upload_media(profile, session_id, file_path, file_name)
+        if media:
+            print(f"✅ Media uploaded: {media['id']} ({media.get('url', '')})")
+
+    print(f"\n--- Submitting Query ({profile.response_mode}) ---")
+    result = client.query(profile, session_id, query)
+    if result is None:
+        return None
+
+    result["contextMetadata"] = context_metadata
+    print("\n✅ Final Response (with contextMetadata appended):")
+    print(json.dumps({"message": "Chat query submitted successfully", "data": result}, indent=2))
+    return result
+
+
+# Global instances, one per API key and endpoint
+_clients = {}
+
+def get_client(api_key: str, base_url: str = BASE_URL, media_base_url: str = MEDIA_BASE_URL) -> OnDemandClient:
+    """Get or create the shared client for this API key"""
+    key = (api_key, base_url, media_base_url)
+    if key not in _clients:
+        _clients[key] = OnDemandClient(api_key, base_url, media_base_url)
+    return _clients[key]
@@ -8,6 +8,14 @@ from datetime import datetime
 from pywinauto import Desktop
 import json
 
+from kore_app_catalog import get_app_catalog
+from kore_file_index import IMAGE_EXTENSIONS, get_file_index
+from kore_journal import get_file_journal, plan_paths
+from kore_organize import execute_plan, plan_organize
+from kore_reader import PREVIEW_CHARS, preview_file
+from kore_sysmon import get_system_sampler
+from kore_tables import APP_MAP, get_folder_map
+
 # --- MEMORY SYSTEM ---
 def load_memory():
     """Loads Kore's memory file"""
@@ -45,10 +53,42 @@ def click_desktop_icon(icon_name):
         print(f"   [Error] Icon not found: {e}")
         return None
 
-def find_file_in_system(filename):
-    """Searches for file OR folder using PowerShell - Enhanced for system-wide search"""
+def find_file_in_system(filename, kind=None, extensions=None):
+    """
+    Searches for file OR folder - answered from the file index,
+    PowerShell only while the index is still being built
+    kind: None (either), "file" or "dir"; extensions: e.g. IMAGE_EXTENSIONS
+    """
     print(f"   [System] Searching for '{filename}'...")
     
+    index = get_file_index()
+    if index.ready:
+        for found_path in index.search(filename, kind=kind, extensions=extensions, limit=5):
+            # The index can lag behind the disk; skip entries that are gone
+            if os.path.exists(found_path):
+                print(f"   [Success] Found at: {found_path}")
+                return found_path
+            index.remove(found_path)
+        
+        print(f"   [Error] Could not find '{filename}' anywhere")
+        return None
+    
+    print(f"   [System] File index still building, searching the slow way...")
+    return _find_file_powershell(filename, kind)
+
+def _index_changed(*paths, folders=()):
+    """Tell the file index about files Kore itself created, moved or deleted"""
+    try:
+        index = get_file_index()
+        if index.ready:
+            index.notify(*(os.path.abspath(p) for p in paths))
+            if folders:
+                index.refresh(os.path.abspath(f) for f in folders)
+    except Exception as e:
+        print(f"   [Index Warning] Could not update file index: {e}")
+
+def _find_file_powershell(filename, kind=None):
+    """Searches for file OR folder using PowerShell - Enhanced for system-wide search"""
     # Search in multiple root locations
     search_paths = [
         r"C:\Users",      # User files
@@ -59,6 +99,7 @@ def find_file_in_system(filename):
     ]
     
     safe_filename = f"*{filename}*"
+    kind_flag = {"dir": " -Directory", "file": " -File"}.get(kind, "")
     
     for search_path in search_paths:
         print(f"   [System] Searching in {search_path}...")
@@ -67,7 +108,7 @@ def find_file_in_system(filename):
         # -Directory flag searches for folders, without it searches for files
         # We'll do both in one go
         ps_command = f'''powershell -command "
-        $items = Get-ChildItem -Path '{search_path}' -Filter '{safe_filename}' -Recurse -ErrorAction SilentlyContinue | Select-Object -First 1 -ExpandProperty FullName
+        $items = Get-ChildItem -Path '{search_path}' -Filter '{safe_filename}'{kind_flag} -Recurse -ErrorAction SilentlyContinue | Select-Object -First 1 -ExpandProperty FullName
         if ($items) {{ $items }} else {{ '' }}
         "'''
         
@@ -93,7 +134,7 @@ def find_file_in_system(filename):
     if " " in filename:
         first_part = filename.split(" ")[0]
         print(f"   [System] Trying fallback: '{first_part}'...")
-        return find_file_in_system(first_part)
+        return _find_file_powershell(first_part, kind)
     
     print(f"   [Error] Could not find '{filename}' anywhere")
     return None
@@ -134,6 +175,7 @@ def create_file(path, content=""):
         # Create the file
         with open(path, 'w', encoding='utf-8') as f:
             f.write(content)
+        _index_changed(path)
         print(f"   [Success] Created: {path}")
         return path
     except Exception as e:
@@ -169,6 +211,7 @@ def create_folder(path):
                     break
         
         os.makedirs(path, exist_ok=True)
+        _index_changed(path)
         print(f"   [Success] Created folder: {path}")
         return path
     except Exception as e:
@@ -182,6 +225,7 @@ def delete_file(path):
             os.remove(path)
         elif os.path.isdir(path):
             shutil.rmtree(path)
+        _index_changed(path)
         print(f"   [Success] Deleted: {path}")
         return True
     except Exception as e:
@@ -200,41 +244,123 @@ def edit_file(path, content, mode="append"):
         print(f"   [Error] {e}")
         return False
 
-def read_file(path):
-    """Reads file content"""
+def read_file(path, max_chars=PREVIEW_CHARS, start_line=None, line_count=50, tail=False):
+    """
+    Reads a preview of a file without loading all of it: the first max_chars characters,
+    line_count lines from 1-based start_line, or the last line_count lines with tail=True.
+    Binary files come back as a hex dump.
+    """
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        print(f"   [Success] Read {len(content)} characters from {path}")
+        preview = preview_file(path, max_chars=max_chars, start_line=start_line,
+                               line_count=line_count, tail=tail)
+        content = preview["text"]
+        kind = "binary" if preview["binary"] else preview["encoding"]
+        print(f"   [Success] Read {len(content)} characters of {preview['size']} bytes ({kind}) from {path}")
         return content
     except Exception as e:
         print(f"   [Error] {e}")
         return None
 
-def copy_file(source, destination):
-    """Copies a file"""
+def _final_destination(source, destination):
+    """Where shutil.move/copy2 put source when destination is an existing folder"""
+    if os.path.isdir(destination):
+        return os.path.join(destination, os.path.basename(source.rstrip("\\/")))
+    return destination
+
+def _existing_target(target):
+    """Refuses to overwrite: undo could not bring back what was replaced"""
+    if os.path.lexists(target):
+        print(f"   [Error] {target} already exists; not overwriting it")
+        return True
+    return False
+
+def _run_journalled(kind, steps, label, progress=None, cancel=None):
+    """Runs file operation steps through the journal so they can be undone; returns the first error or None"""
+    journal = get_file_journal()
+    txn = journal.begin(kind, steps, label=label)
+    errors = journal.run(txn, progress=progress, cancel=cancel)
+    if txn.done:
+        journal.commit(txn)
+        _index_changed(*plan_paths(txn))
+    else:
+        journal.abort(txn)
+    return errors[0][1] if errors else None
+
+def copy_file(source, destination, dry_run=False, progress=None, cancel=None):
+    """
+    Copies a file or folder (journalled; with dry_run=True returns the planned steps instead).
+    progress(done_bytes, total_bytes) is called while large files and folders copy;
+    setting the `cancel` event stops the copy and removes what it had copied.
+    """
     try:
-        shutil.copy2(source, destination)
+        target = _final_destination(source, destination)
+        if _existing_target(target):
+            return False
+        steps = [["copy", source, target]]
+        if dry_run:
+            return steps
+        error = _run_journalled("copy", steps, label=source, progress=progress, cancel=cancel)
+        if error:
+            print(f"   [Error] {error}")
+            return False
         print(f"   [Success] Copied: {source} -> {destination}")
         return True
     except Exception as e:
         print(f"   [Error] {e}")
         return False
 
-def move_file(source, destination):
-    """Moves a file"""
+def move_file(source, destination, dry_run=False):
+    """Moves a file (journalled; with dry_run=True returns the planned steps instead)"""
     try:
-        shutil.move(source, destination)
+        target = _final_destination(source, destination)
+        if _existing_target(target):
+            return False
+        steps = [["move", source, target]]
+        if dry_run:
+            return steps
+        error = _run_journalled("move", steps, label=source)
+        if error:
+            print(f"   [Error] {error}")
+            return False
         print(f"   [Success] Moved: {source} -> {destination}")
         return True
     except Exception as e:
         print(f"   [Error] {e}")
         return False
 
+def undo_file_operations(count=1):
+    """Reverts the last `count` journalled move/copy/organize operations"""
+    try:
+        undone = get_file_journal().undo(count)
+        if not undone:
+            print(f"   [Warning] Nothing to undo")
+            return False
+        for txn in undone:
+            _index_changed(*plan_paths(txn))
+            print(f"   [Success] Undid {txn.kind} of {txn.label} ({len(txn.done)} steps)")
+        return True
+    except Exception as e:
+        print(f"   [Error] {e}")
+        return False
+
+def recover_file_operations(mode="resume"):
+    """Finishes ("resume") or rolls back ("revert") file operations interrupted by a crash"""
+    try:
+        recovered = get_file_journal().recover(mode)
+        for txn in recovered:
+            _index_changed(*plan_paths(txn))
+            print(f"   [System] Recovered interrupted {txn.kind} of {txn.label} ({mode})")
+        return recovered
+    except Exception as e:
+        print(f"   [Error] Journal recovery failed: {e}")
+        return []
+
 def list_files(directory):
     """Lists files in directory"""
     try:
         files = os.listdir(directory)
+        # Listing is the moment to re-sync this folder in the file index
+        _index_changed(folders=[directory])
         print(f"   [Success] Found {len(files)} items in {directory}")
         return files
     except Exception as e:
@@ -249,6 +375,12 @@ def get_system_info(info_type="all"):
         
         info = {}
         
+        # Latest snapshot and windowed averages from the background sampler (never blocks)
+        sampler = get_system_sampler()
+        latest = sampler.latest()
+        last_minute = sampler.window(60)
+        last_5_minutes = sampler.window(300)
+        
         if info_type in ["basic", "all"]:
             # Computer identification
             info["computer_name"] = socket.gethostname()
@@ -260,10 +392,23 @@ def get_system_info(info_type="all"):
             info["processor"] = platform.processor()
         
         if info_type in ["cpu", "all"]:
-            info["cpu_percent"] = psutil.cpu_percent(interval=1)
+            if latest:
+                info["cpu_percent"] = latest["cpu_percent"]
+                info["cpu_per_core"] = latest["per_cpu"]
+            else:
+                # Sampler only just started; a short read beats a full second
+                info["cpu_percent"] = psutil.cpu_percent(interval=0.1)
+            if last_minute:
+                info["cpu_percent_avg_1m"] = round(last_minute["cpu_percent_avg"], 1)
+            if last_5_minutes:
+                info["cpu_percent_avg_5m"] = round(last_5_minutes["cpu_percent_avg"], 1)
+                info["cpu_percent_max_5m"] = last_5_minutes["cpu_percent_max"]
+                info["cpu_per_core_avg_5m"] = last_5_minutes["per_cpu_avg"]
+            info["cpu_high_seconds"] = round(sampler.sustained_above("cpu_percent", 80))
             info["cpu_count_physical"] = psutil.cpu_count(logical=False)
             info["cpu_count_logical"] = psutil.cpu_count(logical=True)
-            info["cpu_frequency_mhz"] = psutil.cpu_freq().current if psutil.cpu_freq() else "N/A"
+            freq = psutil.cpu_freq()
+            info["cpu_frequency_mhz"] = freq.current if freq else "N/A"
         
         if info_type in ["memory", "all"]:
             mem = psutil.virtual_memory()
@@ -271,6 +416,9 @@ def get_system_info(info_type="all"):
             info["memory_available_gb"] = round(mem.available / (1024**3), 2)
             info["memory_used_gb"] = round(mem.used / (1024**3), 2)
             info["memory_percent"] = mem.percent
+            if last_5_minutes:
+                info["memory_percent_avg_5m"] = round(last_5_minutes["memory_percent_avg"], 1)
+                info["memory_percent_max_5m"] = last_5_minutes["memory_percent_max"]
         
         if info_type in ["disk", "all"]:
             disk = psutil.disk_usage('C:\\')
@@ -278,6 +426,9 @@ def get_system_info(info_type="all"):
             info["disk_used_gb"] = round(disk.used / (1024**3), 2)
             info["disk_free_gb"] = round(disk.free / (1024**3), 2)
             info["disk_percent"] = disk.percent
+            if last_minute:
+                info["disk_read_mb_s"] = round(last_minute["disk_read_bps_avg"] / (1024**2), 2)
+                info["disk_write_mb_s"] = round(last_minute["disk_write_bps_avg"] / (1024**2), 2)
             
             # Get all disk partitions
             partitions = []
@@ -299,14 +450,33 @@ def get_system_info(info_type="all"):
             info["bytes_sent_mb"] = round(net.bytes_sent / (1024**2), 2)
             info["bytes_recv_mb"] = round(net.bytes_recv / (1024**2), 2)
             
-            # Get IP address
-            try:
-                s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                s.connect(("8.8.8.8", 80))
-                info["local_ip"] = s.getsockname()[0]
-                s.close()
-            except:
-                info["local_ip"] = "Unable to determine"
+            # Throughput from the sampler's counter deltas rather than lifetime totals
+            nic_bps = latest["nic_bps"] if latest else {}
+            if latest:
+                info["upload_kb_s"] = round(latest["net_sent_bps"] / 1024, 1)
+                info["download_kb_s"] = round(latest["net_recv_bps"] / 1024, 1)
+            if last_minute:
+                info["upload_kb_s_avg_1m"] = round(last_minute["net_sent_bps_avg"] / 1024, 1)
+                info["download_kb_s_avg_1m"] = round(last_minute["net_recv_bps_avg"] / 1024, 1)
+            
+            # Adapters and IP from the cached interface table (works offline, no socket)
+            adapters = []
+            for adapter in sampler.interfaces.interfaces():
+                if adapter["loopback"]:
+                    continue
+                sent_bps, recv_bps = nic_bps.get(adapter["name"], (0.0, 0.0))
+                adapters.append({
+                    "name": adapter["name"],
+                    "is_up": adapter["is_up"],
+                    "speed_mbps": adapter["speed_mbps"],
+                    "ipv4": adapter["ipv4"],
+                    "ipv6": adapter["ipv6"],
+                    "mac": adapter["mac"],
+                    "upload_kb_s": round(sent_bps / 1024, 1),
+                    "download_kb_s": round(recv_bps / 1024, 1)
+                })
+            info["network_adapters"] = adapters
+            info["local_ip"] = sampler.interfaces.primary_ip() or "Not connected"
         
         if info_type in ["battery", "all"]:
             # Battery info if available (for laptops)
@@ -380,8 +550,11 @@ def empty_recycle_bin():
         print(f"   [Error] {e}")
         return False
 
-def organize_files(folder_path):
-    """Organizes files in a folder by type into subfolders"""
+def organize_files(folder_path, progress=None, dry_run=False):
+    """
+    Organizes files in a folder by type into subfolders; progress(done, total) is called as moves finish.
+    Journalled so it can be undone; with dry_run=True returns the planned steps without moving anything.
+    """
     try:
         print(f"   [System] Organizing files in: {folder_path}")
         
@@ -407,77 +580,32 @@ def organize_files(folder_path):
             print(f"   [Error] Folder does not exist: {folder_path}")
             return False
         
-        # File type categories with extensions
-        file_categories = {
-            "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".ico", ".webp", ".tiff", ".raw"],
-            "Videos": [".mp4", ".avi", ".mkv", ".mov", ".wmv", ".flv", ".webm", ".m4v", ".mpeg", ".mpg"],
-            "Audio": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".opus"],
-            "Documents": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt", ".tex"],
-            "Spreadsheets": [".xls", ".xlsx", ".csv", ".ods"],
-            "Presentations": [".ppt", ".pptx", ".odp"],
-            "Archives": [".zip", ".rar", ".7z", ".tar", ".gz", ".bz2", ".xz"],
-            "Code": [".py", ".js", ".html", ".css", ".java", ".cpp", ".c", ".h", ".php", ".rb", ".go", ".rs"],
-            "Executables": [".exe", ".msi", ".bat", ".sh", ".app", ".dmg"],
-            "Others": []  # Catch-all for unrecognized types
-        }
+        # Plan every move from one directory scan, then run them on a thread pool
+        plan = plan_organize(folder_path)
         
-        # Get all files in the folder (not subfolders)
-        files = [f for f in os.listdir(folder_path) if os.path.isfile(os.path.join(folder_path, f))]
+        steps = [["mkdir", None, folder] for folder in plan.folders]
+        steps += [["move", source, destination] for source, destination in plan.moves]
+        if dry_run:
+            print(f"   [System] Dry run: {len(plan.moves)} files into {len(plan.counts)} categories")
+            return steps
         
-        if not files:
+        if not plan.moves:
             print(f"   [Warning] No files to organize in {folder_path}")
             return False
         
-        files_moved = 0
-        
-        # Organize files by category
-        for filename in files:
-            file_path = os.path.join(folder_path, filename)
-            file_ext = os.path.splitext(filename)[1].lower()
-            
-            # Find which category this file belongs to
-            category_found = False
-            for category, extensions in file_categories.items():
-                if file_ext in extensions:
-                    category_folder = os.path.join(folder_path, category)
-                    
-                    # Create category folder if it doesn't exist
-                    os.makedirs(category_folder, exist_ok=True)
-                    
-                    # Move file to category folder
-                    destination = os.path.join(category_folder, filename)
-                    
-                    # Handle duplicate filenames
-                    if os.path.exists(destination):
-                        base, ext = os.path.splitext(filename)
-                        counter = 1
-                        while os.path.exists(destination):
-                            new_name = f"{base}_{counter}{ext}"
-                            destination = os.path.join(category_folder, new_name)
-                            counter += 1
-                    
-                    shutil.move(file_path, destination)
-                    files_moved += 1
-                    category_found = True
-                    break
-            
-            # If no category matched, move to "Others"
-            if not category_found and file_ext:  # Only if it has an extension
-                others_folder = os.path.join(folder_path, "Others")
-                os.makedirs(others_folder, exist_ok=True)
-                
-                destination = os.path.join(others_folder, filename)
-                if os.path.exists(destination):
-                    base, ext = os.path.splitext(filename)
-                    counter = 1
-                    while os.path.exists(destination):
-                        new_name = f"{base}_{counter}{ext}"
-                        destination = os.path.join(others_folder, new_name)
-                        counter += 1
-                
-                shutil.move(file_path, destination)
-                files_moved += 1
-        
+        # Log the plan before moving anything; moves are recorded per finished batch
+        journal = get_file_journal()
+        txn = journal.begin("organize", steps, label=folder_path)
+        offset = len(plan.folders)
+        result = execute_plan(plan, progress=progress,
+                              on_moved=lambda moved: journal.completed(txn, [offset + i for i in moved]))
+        journal.completed(txn, range(offset))
+        journal.commit(txn)
+        files_moved = result["moved"]
+        for source, error in result["errors"][:5]:
+            print(f"   [Warning] Could not move {os.path.basename(source)}: {error}")
+        
+        _index_changed(folders=[folder_path] + [os.path.join(folder_path, c) for c in plan.counts])
         print(f"   [Success] Organized {files_moved} files into categories")
         return True
         
@@ -535,7 +663,7 @@ def change_wallpaper(image_path=None):
             
             # If just a filename, search for it
             if not os.path.exists(image_path):
-                found_path = find_file_in_system(image_path)
+                found_path = find_file_in_system(image_path, kind="file", extensions=IMAGE_EXTENSIONS)
                 if found_path:
                     image_path = found_path
                 else:
@@ -584,124 +712,16 @@ def open_url(url):
     webbrowser.open(url)
     return True
 
-def open_application(app_name):
-    """Opens application by name or path - Enhanced with Windows Apps"""
+def open_application(app_name, target=None):
+    """
+    Opens application by name or path - Enhanced with Windows Apps
+    target: catalog entry already resolved for app_name (e.g. by speculative prefetch)
+    """
     try:
         app_lower = app_name.lower().strip()
         
         # Common applications mapping
-        app_map = {
-            # Basic Windows Apps
-            "notepad": "notepad.exe",
-            "calculator": "calc.exe",
-            "paint": "mspaint.exe",
-            "cmd": "cmd.exe",
-            "command prompt": "cmd.exe",
-            "powershell": "powershell.exe",
-            "explorer": "explorer.exe",
-            "file explorer": "explorer.exe",
-            
-            # Browsers
-            "chrome": "chrome.exe",
-            "google chrome": "chrome.exe",
-            "firefox": "firefox.exe",
-            "edge": "msedge.exe",
-            "microsoft edge": "msedge.exe",
-            "internet explorer": "iexplore.exe",
-            
-            # Windows Settings & Control Panel
-            "settings": "ms-settings:",
-            "windows settings": "ms-settings:",
-            "control panel": "control.exe",
-            "control": "control.exe",
-            
-            # Specific Settings Pages
-            "wifi settings": "ms-settings:network-wifi",
-            "network settings": "ms-settings:network",
-            "bluetooth settings": "ms-settings:bluetooth",
-            "sound settings": "ms-settings:sound",
-            "display settings": "ms-settings:display",
-            "personalization": "ms-settings:personalization",
-            "privacy settings": "ms-settings:privacy",
-            "update settings": "ms-settings:windowsupdate",
-            "storage settings": "ms-settings:storagesense",
-            "apps settings": "ms-settings:appsfeatures",
-            "power settings": "ms-settings:powersleep",
-            "battery settings": "ms-settings:batterysaver",
-            "notifications settings": "ms-settings:notifications",
-            "accounts settings": "ms-settings:yourinfo",
-            "time settings": "ms-settings:dateandtime",
-            "region settings": "ms-settings:regionlanguage",
-            "accessibility settings": "ms-settings:easeofaccess",
-            
-            # System Tools
-            "task manager": "taskmgr.exe",
-            "taskmgr": "taskmgr.exe",
-            "registry editor": "regedit.exe",
-            "regedit": "regedit.exe",
-            "system information": "msinfo32.exe",
-            "msinfo32": "msinfo32.exe",
-            "device manager": "devmgmt.msc",
-            "disk management": "diskmgmt.msc",
-            "services": "services.msc",
-            "event viewer": "eventvwr.msc",
-            "performance monitor": "perfmon.exe",
-            "resource monitor": "resmon.exe",
-            
-            # Office & Productivity
-            "word": "winword.exe",
-            "excel": "excel.exe",
-            "powerpoint": "powerpnt.exe",
-            "outlook": "outlook.exe",
-            "onenote": "onenote.exe",
-            "teams": "teams.exe",
-            "microsoft teams": "teams.exe",
-            
-            # Media
-            "media player": "wmplayer.exe",
-            "windows media player": "wmplayer.exe",
-            "movies": "ms-video:",
-            "photos": "ms-photos:",
-            "camera": "microsoft.windows.camera:",
-            "voice recorder": "ms-voicerecorder:",
-            
-            # Accessories
-            "snipping tool": "SnippingTool.exe",
-            "snip": "SnippingTool.exe",
-            "screenshot": "SnippingTool.exe",
-            "sticky notes": "ms-stickynotes:",
-            "notes": "ms-stickynotes:",
-            "magnifier": "magnify.exe",
-            "narrator": "narrator.exe",
-            "on-screen keyboard": "osk.exe",
-            "character map": "charmap.exe",
-            
-            # Store & Xbox
-            "store": "ms-windows-store:",
-            "microsoft store": "ms-windows-store:",
-            "xbox": "xbox:",
-            "xbox game bar": "xbox:",
-            
-            # Communication
-            "mail": "outlookmail:",
-            "calendar": "outlookcal:",
-            "skype": "skype.exe",
-            
-            # Development
-            "visual studio code": "code.exe",
-            "vscode": "code.exe",
-            "vs code": "code.exe",
-            "visual studio": "devenv.exe",
-            "git bash": "git-bash.exe",
-            
-            # Other
-            "clock": "ms-clock:",
-            "alarms": "ms-clock:",
-            "weather": "bingweather:",
-            "maps": "bingmaps:",
-            "news": "bingnews:",
-            "cortana": "ms-cortana:",
-        }
+        app_map = APP_MAP
         
         # Check if it's a known application
         if app_lower in app_map:
@@ -718,7 +738,19 @@ def open_application(app_name):
         
         # Try to search for the app in Start Menu
         else:
-            # Method 1: Use Windows Run command
+            # Method 1: Cached catalog of installed apps and Start Menu shortcuts
+            catalog = get_app_catalog()
+            if not target:
+                target = catalog.find(app_name) if catalog.ready else None
+            if target:
+                if target.lower().endswith(".lnk"):
+                    subprocess.Popen(f'start "" "{target}"', shell=True)
+                else:
+                    subprocess.Popen(target)
+                print(f"   [Success] Opened {app_name} at {target}")
+                return True
+            
+            # Method 2: Use Windows Run command
             print(f"   [System] Searching for {app_name} in Start Menu...")
             
             # Try opening via start command
@@ -727,7 +759,11 @@ def open_application(app_name):
                 print(f"   [Success] Opened {app_name}")
                 return True
             
-            # Method 2: Search in Program Files
+            # Method 3: Search in Program Files (only until the catalog is built)
+            if catalog.ready:
+                print(f"   [Error] Could not find application: {app_name}")
+                return False
+            
             program_paths = [
                 "C:\\Program Files",
                 "C:\\Program Files (x86)",
@@ -751,34 +787,14 @@ def open_application(app_name):
         print(f"   [Error] Could not open {app_name}: {e}")
         return False
 
-def open_folder(folder_name):
-    """Opens common system folders or any folder path"""
+def open_folder(folder_name, found_path=None):
+    """
+    Opens common system folders or any folder path
+    found_path: result of the file-index search for folder_name, if already done
+    """
     try:
-        # Get username for dynamic paths
-        username = os.environ.get('USERNAME', 'User')
-        
         # Common folder mappings
-        folder_map = {
-            "downloads": f"C:\\Users\\{username}\\Downloads",
-            "documents": f"C:\\Users\\{username}\\Documents",
-            "desktop": f"C:\\Users\\{username}\\Desktop",
-            "pictures": f"C:\\Users\\{username}\\Pictures",
-            "videos": f"C:\\Users\\{username}\\Videos",
-            "music": f"C:\\Users\\{username}\\Music",
-            "onedrive": f"C:\\Users\\{username}\\OneDrive",
-            "appdata": f"C:\\Users\\{username}\\AppData",
-            "temp": os.environ.get('TEMP', f"C:\\Users\\{username}\\AppData\\Local\\Temp"),
-            "program files": "C:\\Program Files",
-            "program files (x86)": "C:\\Program Files (x86)",
-            "windows": "C:\\Windows",
-            "system32": "C:\\Windows\\System32",
-            "users": "C:\\Users",
-            "c:": "C:\\",
-            "d:": "D:\\",
-            "this pc": "::{20D04FE0-3AEA-1069-A2D8-08002B30309D}",
-            "recycle bin": "::{645FF040-5081-101B-9F08-00AA002F954E}",
-            "network": "::{F02C1A0D-BE21-4350-88B0-7367FC96EF3C}"
-        }
+        folder_map = get_folder_map()
         
         # Normalize the folder name
         folder_lower = folder_name.lower().strip()
@@ -798,7 +814,8 @@ def open_folder(folder_name):
         
         # Try to find the folder
         else:
-            found_path = find_file_in_system(folder_name)
+            if not found_path:
+                found_path = find_file_in_system(folder_name, kind="dir")
             if found_path and os.path.isdir(found_path):
                 subprocess.Popen(f'explorer "{found_path}"')
                 print(f"   [Success] Opened {folder_name} at {found_path}")
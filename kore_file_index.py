@@ -0,0 +1,810 @@
+"""
+Kore File Index
+On-disk file-name index filled by a background crawler; answers substring,
+wildcard and fuzzy name queries in milliseconds instead of recursive PowerShell scans
+"""
+
+import difflib
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+INDEX_VERSION = "2"
+DEFAULT_INDEX_PATH = "kore_file_index.tsv"
+
+# Fold the delta segment and tombstones into the base segment past these sizes
+COMPACT_DELTA = 50000
+COMPACT_TOMBSTONES = 100000
+
+# Stop collecting matches past this many; ranking only needs the best few
+MAX_CANDIDATES = 2000
+
+# Directory names never worth crawling
+SKIP_DIRS = {
+    "$recycle.bin", "system volume information", "$windows.~bt", "$windows.~ws",
+    "winsxs", "node_modules", "__pycache__", ".git", ".cache"
+}
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+# (dir_id, name, mtime, is_dir)
+Entry = Tuple[int, str, float, bool]
+
+
+def default_roots() -> List[str]:
+    """Crawl order mirrors the old search order: user files first, whole drive last"""
+    if os.name == "nt":
+        return [
+            r"C:\Users",
+            r"C:\Program Files",
+            r"C:\Program Files (x86)",
+            r"C:\Windows",
+            "C:\\"
+        ]
+    return [os.path.expanduser("~")]
+
+
+def default_priorities() -> List[Tuple[str, int]]:
+    """Location priority by path prefix (longest prefix wins)"""
+    home = os.path.expanduser("~")
+    priorities = [(os.path.join(home, folder), 3)
+                  for folder in ("Desktop", "Documents", "Downloads", "Pictures", "Videos", "Music", "OneDrive")]
+    priorities += [
+        (os.path.join(home, "AppData"), -1),
+        (home, 2),
+        (r"C:\Users", 1),
+        (r"C:\Program Files", 1),
+        (r"C:\Program Files (x86)", 1),
+        (r"C:\Windows", -1)
+    ]
+    return sorted(((os.path.normcase(p), w) for p, w in priorities), key=lambda item: -len(item[0]))
+
+
+class _Segment:
+    """
+    Immutable block of entries searchable through one lowercase blob:
+    "\\nname0\\nname1\\n..." where offsets[i] is the start of entry i
+    """
+
+    __slots__ = ("names", "parents", "mtimes", "is_dir", "blob", "offsets")
+
+    def __init__(self, entries: Iterable[Entry] = ()):
+        self.names = []
+        self.parents = array("l")
+        self.mtimes = array("d")
+        self.is_dir = bytearray()
+        for parent, name, mtime, is_dir in entries:
+            self.names.append(name)
+            self.parents.append(parent)
+            self.mtimes.append(mtime)
+            self.is_dir.append(1 if is_dir else 0)
+
+        self.blob = "\n" + "\n".join(name.lower() for name in self.names) + "\n"
+        self.offsets = array("q", accumulate((len(name) + 1 for name in self.names), initial=1))
+
+    def __len__(self):
+        return len(self.names)
+
+    def entry_at(self, pos: int) -> int:
+        """Entry whose name contains blob position pos"""
+        return bisect_right(self.offsets, pos) - 1
+
+    def find(self, needle: str) -> Iterator[int]:
+        """
+        Entries whose lowercase name contains needle, in blob order
+        A leading/trailing "\n" anchors the needle to the start/end of the name
+        """
+        find = self.blob.find
+        lead = 1 if needle.startswith("\n") else 0
+        pos = find(needle, 1 - lead)
+        while pos != -1:
+            entry = self.entry_at(pos + lead)
+            yield entry
+            # Skip the rest of this name
+            pos = find(needle, self.offsets[entry + 1] - lead)
+
+    def finditer(self, pattern: "re.Pattern", lead: int = 0) -> Iterator[int]:
+        """
+        Entries with a regex match inside their name; the pattern must not cross
+        newlines except for `lead` leading "\n" characters
+        """
+        last = -1
+        for match in pattern.finditer(self.blob):
+            entry = self.entry_at(match.start() + lead)
+            if entry != last and 0 <= entry < len(self.names):
+                last = entry
+                yield entry
+
+    def entries(self) -> Iterator[Entry]:
+        for i, name in enumerate(self.names):
+            yield self.parents[i], name, self.mtimes[i], bool(self.is_dir[i])
+
+
+class _Collector:
+    """Gathers (quality, parent, name, mtime) matches across segments, tier by tier"""
+
+    def __init__(self, segments, tombstones, kind, extensions, folder_part, dirs):
+        self.segments = segments
+        self.tombstones = tombstones
+        self.kind = kind
+        self.extensions = tuple(e.lower() for e in extensions) if extensions else None
+        self.folder_part = folder_part
+        self.dirs = dirs
+        self.found = []
+        self.seen = set()
+
+    @property
+    def full(self) -> bool:
+        return len(self.found) >= MAX_CANDIDATES
+
+    def tier(self, base_quality: float, matcher: Callable, quality: Optional[Callable] = None):
+        for offset, segment in self.segments:
+            for entry in matcher(segment):
+                if self.full:
+                    return
+                entry_id = offset + entry
+                if entry_id in self.seen or entry_id in self.tombstones:
+                    continue
+                self.seen.add(entry_id)
+
+                is_dir = segment.is_dir[entry]
+                if self.kind == "dir" and not is_dir or self.kind == "file" and is_dir:
+                    continue
+                name = segment.names[entry]
+                lower = name.lower()
+                if self.extensions and not lower.endswith(self.extensions):
+                    continue
+                parent = segment.parents[entry]
+                if self.folder_part and self.folder_part not in self.dirs[parent].lower():
+                    continue
+
+                score = base_quality + (quality(lower) if quality else 0.0)
+                self.found.append((score, parent, name, segment.mtimes[entry]))
+
+
+class FileIndex:
+    """
+    File-name index: a large base segment from the last full crawl, a small delta
+    segment for files added since, and tombstones for entries removed since
+
+    Base entries are sorted by directory id, so one directory's entries are a
+    contiguous range; dir_mtimes is the journal used to find changed directories
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_INDEX_PATH, roots: Optional[List[str]] = None,
+                 priorities: Optional[List[Tuple[str, int]]] = None):
+        self.path = path
+        self.roots = roots or default_roots()
+        self.priorities = priorities if priorities is not None else default_priorities()
+
+        self.dirs = []          # dir_id -> directory path
+        self.dir_ids = {}       # directory path -> dir_id (live directories only)
+        self.dir_mtimes = []    # dir_id -> mtime when last listed, -1 once removed
+        self.base = _Segment()
+        self.delta_entries = []
+        self.delta_by_dir = {}  # dir_id -> indexes into delta_entries
+        self.delta = _Segment()   # Searchable copy of delta_entries
+        self._delta_stale = False
+        self.tombstones = set() # ids into base (0..n-1) and delta (n..)
+        self.built_at = 0.0
+
+        self.ready = False      # True once loaded from disk or crawled
+        self.crawling = False
+        self.crawl_progress = 0
+        self.stats = {"rescanned_dirs": 0, "added": 0, "removed": 0}
+        self._crawl_thread = None
+        self._lock = threading.RLock()
+        self._priority_cache = {}
+        self._version = 0       # Bumped on every change; lets compact() run outside the lock
+        self._saved_version = 0
+
+        self._observer = None
+        self._watch_thread = None
+        self._watch_stop = threading.Event()
+        self._pending_dirs = set()
+
+    # ---------- building ----------
+
+    def crawl(self, roots: Optional[List[str]] = None) -> int:
+        """Walk the roots with os.scandir and replace the index; returns entry count"""
+        roots = roots or self.roots
+        dirs, dir_ids, dir_mtimes, entries = [], {}, [], []
+        done_roots = set()
+        self.crawl_progress = 0
+        start = time.time()
+
+        for root in roots:
+            if not os.path.isdir(root):
+                continue
+            # Later roots (the whole drive) skip subtrees an earlier root covered
+            stack = [root]
+            while stack:
+                folder = stack.pop()
+                key = os.path.normcase(folder)
+                if key in done_roots and folder != root or folder in dir_ids:
+                    continue
+                try:
+                    # Journal the mtime before listing so changes made meanwhile are caught later
+                    folder_mtime = os.stat(folder).st_mtime
+                    iterator = os.scandir(folder)
+                except OSError:
+                    continue
+
+                dir_id = dir_ids[folder] = len(dirs)
+                dirs.append(folder)
+                dir_mtimes.append(folder_mtime)
+
+                with iterator:
+                    for item in iterator:
+                        listed = self._list_item(item)
+                        if listed is None:
+                            continue
+                        name, mtime, is_dir = listed
+                        entries.append((dir_id, name, mtime, is_dir))
+                        if is_dir and name.lower() not in SKIP_DIRS:
+                            stack.append(item.path)
+                self.crawl_progress = len(entries)
+            done_roots.add(os.path.normcase(root))
+
+        self._replace(dirs, dir_ids, dir_mtimes, _Segment(entries), start)
+        self.save()
+        return len(entries)
+
+    @staticmethod
+    def _list_item(item: os.DirEntry) -> Optional[Tuple[str, float, bool]]:
+        name = item.name
+        if "\n" in name or "\t" in name:
+            return None
+        try:
+            return name, item.stat(follow_symlinks=False).st_mtime, item.is_dir(follow_symlinks=False)
+        except OSError:
+            return None
+
+    def start_crawl(self, watch: bool = False) -> Optional[threading.Thread]:
+        """Crawl in a background thread; the old index keeps answering meanwhile"""
+        with self._lock:
+            if self.crawling:
+                return self._crawl_thread
+            self.crawling = True
+
+        def run():
+            try:
+                count = self.crawl()
+                print(f"   [Index] Indexed {count} files and folders")
+                if watch:
+                    self.start_watching()
+            except Exception as e:
+                print(f"   [Index Error] Crawl failed: {e}")
+            finally:
+                self.crawling = False
+
+        self._crawl_thread = threading.Thread(target=run, name="kore-file-index", daemon=True)
+        self._crawl_thread.start()
+        return self._crawl_thread
+
+    def build(self, entries: Iterable[Tuple[str, str, float, bool]]):
+        """Build directly from (directory, name, mtime, is_dir) tuples, e.g. synthetic trees"""
+        dirs, dir_ids, rows = [], {}, []
+        for folder, name, mtime, is_dir in entries:
+            dir_id = dir_ids.get(folder)
+            if dir_id is None:
+                dir_id = dir_ids[folder] = len(dirs)
+                dirs.append(folder)
+            rows.append((dir_id, name, mtime, is_dir))
+        rows.sort(key=lambda row: row[0])
+        self._replace(dirs, dir_ids, [0.0] * len(dirs), _Segment(rows), time.time())
+
+    def _replace(self, dirs, dir_ids, dir_mtimes, base, built_at):
+        with self._lock:
+            self.dirs, self.dir_ids, self.dir_mtimes, self.base = dirs, dir_ids, dir_mtimes, base
+            self.delta_entries, self.delta_by_dir, self.delta = [], {}, _Segment()
+            self.tombstones = set()
+            self.built_at = built_at
+            self._priority_cache = {}
+            self._version += 1
+            self.ready = True
+
+    # ---------- incremental updates ----------
+
+    def notify(self, *paths: str) -> int:
+        """
+        A file or folder was created, deleted, moved or copied: re-list the folders
+        that contain the paths (new subfolders are crawled). Returns entries changed.
+        """
+        return self.refresh(os.path.dirname(path.rstrip("\\/")) for path in paths)
+
+    def add(self, path: str):
+        """Record a new (or changed) file without rebuilding the base segment"""
+        self.notify(path)
+
+    def remove(self, path: str) -> bool:
+        """Tombstone one entry (e.g. a search hit that no longer exists)"""
+        folder, name = os.path.split(path.rstrip("\\/"))
+        with self._lock:
+            dir_id = self.dir_ids.get(folder)
+            entry_id = self._dir_entries(dir_id).get(name) if dir_id is not None else None
+            if entry_id is None:
+                return False
+            self._tombstone(entry_id, os.path.join(folder, name))
+            self._version += 1
+            return True
+
+    def refresh(self, folders: Iterable[str]) -> int:
+        """Re-list folders (and crawl any new subfolders) into the delta segment"""
+        changed = 0
+        stack = []
+        for folder in folders:
+            known = self._nearest_known(folder)
+            if known is not None and known not in stack:
+                stack.append(known)
+
+        while stack:
+            folder = stack.pop()
+            count, new_dirs = self._rescan(folder)
+            changed += count
+            stack.extend(new_dirs)
+
+        if changed:
+            with self._lock:
+                self._delta_stale = True
+                self._version += 1
+        return changed
+
+    def journal_scan(self) -> int:
+        """
+        Fallback when no change notifications are available: stat every indexed
+        directory and re-list only those whose mtime moved. Returns entries changed.
+        """
+        with self._lock:
+            journal = [(folder, self.dir_mtimes[dir_id]) for folder, dir_id in self.dir_ids.items()]
+
+        changed_dirs = []
+        for folder, mtime in journal:
+            try:
+                if os.stat(folder).st_mtime != mtime:
+                    changed_dirs.append(folder)
+            except OSError:
+                changed_dirs.append(folder)
+        return self.refresh(changed_dirs)
+
+    def _nearest_known(self, folder: str) -> Optional[str]:
+        # A brand-new folder is picked up by re-listing its closest indexed ancestor
+        while folder not in self.dir_ids:
+            parent = os.path.dirname(folder)
+            if not parent or parent == folder:
+                return None
+            folder = parent
+        return folder
+
+    def _rescan(self, folder: str) -> Tuple[int, List[str]]:
+        """Diff one folder's listing against the index; returns (changes, new subfolders)"""
+        try:
+            folder_mtime = os.stat(folder).st_mtime
+            with os.scandir(folder) as iterator:
+                # Only new names get stat()ed below; is_dir() is free from the listing
+                listing = {}
+                for item in iterator:
+                    if "\n" not in item.name and "\t" not in item.name:
+                        try:
+                            listing[item.name] = (item.is_dir(follow_symlinks=False), item)
+                        except OSError:
+                            continue
+        except FileNotFoundError:
+            listing, folder_mtime = None, -1.0
+        except OSError:
+            return 0, []
+
+        changed, new_dirs = 0, []
+        with self._lock:
+            dir_id = self.dir_ids.get(folder)
+            if dir_id is None:
+                # Newly found subfolder: start tracking it
+                if listing is None:
+                    return 0, []
+                dir_id = self.dir_ids[folder] = len(self.dirs)
+                self.dirs.append(folder)
+                self.dir_mtimes.append(folder_mtime)
+            elif listing is None:
+                return self._drop_tree(folder), []
+
+            indexed = self._dir_entries(dir_id)
+            for name, entry_id in indexed.items():
+                current = listing.get(name)
+                if current is None or current[0] != self._entry_is_dir(entry_id):
+                    self._tombstone(entry_id, os.path.join(folder, name))
+                    changed += 1
+
+            for name, (is_dir, item) in listing.items():
+                entry_id = indexed.get(name)
+                if entry_id is not None and is_dir == self._entry_is_dir(entry_id):
+                    continue
+                try:
+                    mtime = item.stat(follow_symlinks=False).st_mtime
+                except OSError:
+                    continue
+                self.delta_by_dir.setdefault(dir_id, []).append(len(self.delta_entries))
+                self.delta_entries.append((dir_id, name, mtime, is_dir))
+                self.stats["added"] += 1
+                changed += 1
+                if is_dir and name.lower() not in SKIP_DIRS:
+                    new_dirs.append(os.path.join(folder, name))
+
+            self.dir_mtimes[dir_id] = folder_mtime
+            self.stats["rescanned_dirs"] += 1
+        return changed, new_dirs
+
+    def _dir_entries(self, dir_id: int) -> Dict[str, int]:
+        """Live entries of one directory: {name: entry_id}"""
+        entries = {}
+        lo = bisect_left(self.base.parents, dir_id)
+        hi = bisect_right(self.base.parents, dir_id, lo)
+        for entry_id in range(lo, hi):
+            if entry_id not in self.tombstones:
+                entries[self.base.names[entry_id]] = entry_id
+        offset = len(self.base)
+        for i in self.delta_by_dir.get(dir_id, ()):
+            if offset + i not in self.tombstones:
+                entries[self.delta_entries[i][1]] = offset + i
+        return entries
+
+    def _entry_is_dir(self, entry_id: int) -> bool:
+        if entry_id < len(self.base):
+            return bool(self.base.is_dir[entry_id])
+        return self.delta_entries[entry_id - len(self.base)][3]
+
+    def _tombstone(self, entry_id: int, path: str):
+        self.tombstones.add(entry_id)
+        self.stats["removed"] += 1
+        if self._entry_is_dir(entry_id) and path in self.dir_ids:
+            self._drop_tree(path)
+
+    def _drop_tree(self, folder: str) -> int:
+        """Forget a removed folder and everything indexed below it"""
+        removed = 0
+        prefix = folder.rstrip("\\/") + os.sep
+        gone = [path for path in self.dir_ids if path == folder or path.startswith(prefix)]
+        for path in gone:
+            dir_id = self.dir_ids.pop(path)
+            self.dir_mtimes[dir_id] = -1.0
+            for entry_id in self._dir_entries(dir_id).values():
+                self.tombstones.add(entry_id)
+                removed += 1
+        self.stats["removed"] += removed
+        return removed
+
+    def compact(self) -> bool:
+        """
+        Fold the delta segment and tombstones into a new base segment. The new
+        segment is built outside the lock; returns False if the index changed meanwhile.
+        """
+        with self._lock:
+            version = self._version
+            base, delta_entries, tombstones = self.base, list(self.delta_entries), set(self.tombstones)
+
+        offset = len(base)
+        live_base = (entry for i, entry in enumerate(base.entries()) if i not in tombstones)
+        live_delta = sorted((entry for i, entry in enumerate(delta_entries) if offset + i not in tombstones),
+                            key=lambda entry: entry[0])
+        new_base = _Segment(heapq.merge(live_base, live_delta, key=lambda entry: entry[0]))
+
+        with self._lock:
+            if self._version != version:
+                return False
+            self.base = new_base
+            self.delta_entries, self.delta_by_dir, self.delta = [], {}, _Segment()
+            self.tombstones = set()
+            self._version += 1
+        return True
+
+    def _live_entries(self) -> Iterator[Entry]:
+        offset = len(self.base)
+        for i, entry in enumerate(self.base.entries()):
+            if i not in self.tombstones:
+                yield entry
+        for i, entry in enumerate(self.delta_entries):
+            if offset + i not in self.tombstones:
+                yield entry
+
+    def __len__(self):
+        return len(self.base) + len(self.delta_entries) - len(self.tombstones)
+
+    # ---------- watching ----------
+
+    def start_watching(self, poll_interval: float = 60.0, save_interval: float = 300.0):
+        """
+        Keep the index current in the background: OS change notifications through
+        watchdog when it is installed, otherwise a journal scan every poll_interval.
+        A journal scan always runs first to catch up on changes made while Kore was closed.
+        """
+        if self._watch_thread is not None:
+            return
+
+        if Observer is not None:
+            try:
+                observer = Observer()
+                handler = _ChangeHandler(self)
+                for root in self._watch_roots():
+                    observer.schedule(handler, root, recursive=True)
+                observer.start()
+                self._observer = observer
+                print(f"   [Index] Watching for file changes")
+            except Exception as e:
+                print(f"   [Index Warning] Change notifications unavailable ({e}), polling instead")
+                self._observer = None
+
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(target=self._watch_loop, args=(poll_interval, save_interval),
+                                              name="kore-file-watch", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        """Stop watching and save pending changes"""
+        self._watch_stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout=5)
+            self._watch_thread = None
+        if self._version != self._saved_version:
+            self.save()
+
+    def _watch_roots(self) -> List[str]:
+        # Nested roots are already covered by a recursive watch on their ancestor. Compare
+        # normcased, but schedule the roots as indexed: event paths keep the case they are
+        # watched with and must match the dir_ids keys
+        roots = [r for r in self.roots if os.path.isdir(r)]
+        folded = [os.path.normcase(r.rstrip("\\/")) for r in roots]
+        return [r for r, key in zip(roots, folded)
+                if not any(key != other and key.startswith(other + os.sep) for other in folded)]
+
+    def _queue_change(self, path: str):
+        with self._lock:
+            self._pending_dirs.add(path)
+
+    def _watch_loop(self, poll_interval: float, save_interval: float):
+        try:
+            self.journal_scan()
+        except Exception as e:
+            print(f"   [Index Error] Journal scan failed: {e}")
+        last_poll = last_save = time.time()
+
+        # Notifications are batched once a second; each names a folder to re-list
+        while not self._watch_stop.wait(1.0 if self._observer else poll_interval):
+            try:
+                if self._observer is not None:
+                    with self._lock:
+                        pending, self._pending_dirs = self._pending_dirs, set()
+                    if pending:
+                        self.refresh(pending)
+                elif time.time() - last_poll >= poll_interval:
+                    self.journal_scan()
+                    last_poll = time.time()
+
+                if len(self.delta_entries) > COMPACT_DELTA or len(self.tombstones) > COMPACT_TOMBSTONES:
+                    self.compact()
+                if self._version != self._saved_version and time.time() - last_save >= save_interval:
+                    self.save()
+                    last_save = time.time()
+            except Exception as e:
+                print(f"   [Index Error] Update failed: {e}")
+
+    # ---------- searching ----------
+
+    def search(self, query: str, kind: Optional[str] = None,
+               extensions: Optional[Iterable[str]] = None, limit: int = 10) -> List[str]:
+        """
+        Best matching paths, ranked by match quality, location priority and recency
+        kind: None, "file" or "dir"; extensions: only names ending in one of these
+        """
+        query = query.strip().strip("\"'").lower().replace("/", os.sep)
+        if not query:
+            return []
+
+        # "projects\\kore" - match the name, then require the folder part in the path
+        folder_part = None
+        if os.sep in query:
+            folder_part, query = query.rsplit(os.sep, 1)
+            if not query:
+                return []
+
+        with self._lock:
+            if self._delta_stale:
+                # Rebuilt on demand: a burst of changes costs one rebuild, not one each
+                self.delta = _Segment(self.delta_entries)
+                self._delta_stale = False
+            segments = ((0, self.base), (len(self.base), self.delta))
+            tombstones = set(self.tombstones)
+            dirs = self.dirs
+
+        collect = _Collector(segments, tombstones, kind, extensions, folder_part, dirs)
+        if "*" in query or "?" in query:
+            collect.tier(2, self._wildcard_matcher(query))
+        elif " " in query:
+            collect.tier(1, self._all_words_matcher(query.split()),
+                         quality=lambda name: self._word_bonus(query.split()[0], name))
+        else:
+            quality = lambda name: self._name_quality(query, name)
+            collect.tier(0, lambda segment: segment.find(query), quality)
+            if collect.full:
+                # Too common to rank every hit: gather best tier first instead
+                # (exact name, exact stem, prefix, anywhere) so the cap only trims the weakest
+                collect = _Collector(segments, tombstones, kind, extensions, folder_part, dirs)
+                for needle in (f"\n{query}\n", f"\n{query}.", f"\n{query}", query):
+                    collect.tier(0, lambda segment, needle=needle: segment.find(needle), quality)
+                    if collect.full:
+                        break
+
+        if not collect.found:
+            # Nothing contains the query: fall back to an in-order subsequence match
+            collect.tier(0, self._fuzzy_matcher(query),
+                         quality=lambda name: difflib.SequenceMatcher(None, query, name).ratio())
+
+        now = time.time()
+        ranked = sorted(collect.found, key=lambda m: -self._score(m, now, dirs))
+        return [os.path.join(dirs[parent], name) for _, parent, name, _ in ranked[:limit]]
+
+    @staticmethod
+    def _all_words_matcher(words: List[str]):
+        # "tax summary" finds "summary_of_taxes.pdf": every word, any order
+        lookaheads = "".join(f"(?=[^\n]*{re.escape(word)})" for word in words)
+        pattern = re.compile(f"\n{lookaheads}")
+        return lambda segment: segment.finditer(pattern, lead=1)
+
+    @staticmethod
+    def _wildcard_matcher(query: str):
+        body = "".join("[^\n]*" if ch == "*" else "[^\n]" if ch == "?" else re.escape(ch) for ch in query)
+        pattern = re.compile(f"\n{body}(?=\n)")
+        return lambda segment: segment.finditer(pattern, lead=1)
+
+    @staticmethod
+    def _fuzzy_matcher(query: str):
+        # Subsequence match: "tax rpt" finds "taxes_report_2023.pdf"
+        # Each gap excludes the next char, so the regex never backtracks
+        chars = [ch for ch in query if not ch.isspace()]
+        pattern = re.compile(re.escape(chars[0]) + "".join(
+            f"[^{re.escape(ch)}\n]*{re.escape(ch)}" for ch in chars[1:]))
+        return lambda segment: segment.finditer(pattern)
+
+    @classmethod
+    def _name_quality(cls, query: str, name: str) -> float:
+        if name == query:
+            return 4.0
+        if name.startswith(query + "."):
+            return 3.0
+        if name.startswith(query):
+            return 2.0 + cls._word_bonus(query, name)
+        return 1.0 + cls._word_bonus(query, name)
+
+    @staticmethod
+    def _word_bonus(word: str, name: str) -> float:
+        # Within a tier, prefer the query as a whole word ("tax_2023" over "syntax")
+        return 0.5 if re.search(rf"(?:^|[\W_]){re.escape(word)}(?:$|[\W_])", name) else 0.0
+
+    def _priority(self, parent: int, dirs: List[str]) -> int:
+        priority = self._priority_cache.get(parent)
+        if priority is None:
+            folder = os.path.normcase(dirs[parent])
+            priority = 0
+            for prefix, weight in self.priorities:
+                if folder == prefix or folder.startswith(prefix.rstrip("\\/") + os.sep):
+                    priority = weight
+                    break
+            self._priority_cache[parent] = priority
+        return priority
+
+    def _score(self, match, now: float, dirs: List[str]) -> float:
+        # Match tier dominates; location ranks equal tiers, recency breaks ties after that
+        quality, parent, _, mtime = match
+        age_days = max(now - mtime, 0) / 86400
+        recency = math.exp(-age_days / 30)
+        return quality * 100 + self._priority(parent, dirs) * 10 + recency * 5
+
+    # ---------- persistence ----------
+
+    def save(self):
+        """Write the compacted index to disk as tab-separated text"""
+        if not self.path:
+            return
+        with self._lock:
+            version = self._version
+            # Renumber live directories; sorted entries stay sorted under the new ids
+            renumber = {old: new for new, old in enumerate(sorted(self.dir_ids.values()))}
+            dirs = [(self.dirs[old], self.dir_mtimes[old]) for old in sorted(renumber)]
+            entries = [(renumber[parent], name, mtime, is_dir) for parent, name, mtime, is_dir
+                       in self._live_entries_sorted() if parent in renumber]
+            built_at = self.built_at
+
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8", errors="surrogateescape") as f:
+                f.write(f"KOREIDX\t{INDEX_VERSION}\t{built_at}\t{len(dirs)}\t{len(entries)}\n")
+                f.writelines(f"{mtime!r}\t{folder}\n" for folder, mtime in dirs)
+                f.writelines(f"{parent}\t{mtime:.0f}\t{int(is_dir)}\t{name}\n"
+                             for parent, name, mtime, is_dir in entries)
+            os.replace(tmp_path, self.path)
+            self._saved_version = version
+        except Exception as e:
+            print(f"   [Index Error] Could not save: {e}")
+
+    def _live_entries_sorted(self) -> Iterator[Entry]:
+        offset = len(self.base)
+        yield from heapq.merge(
+            (entry for i, entry in enumerate(self.base.entries()) if i not in self.tombstones),
+            sorted((entry for i, entry in enumerate(self.delta_entries) if offset + i not in self.tombstones),
+                   key=lambda entry: entry[0]),
+            key=lambda entry: entry[0])
+
+    def load(self) -> bool:
+        """Load the on-disk index; returns False when there is none (or it is unreadable)"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8", errors="surrogateescape") as f:
+                magic, version, built_at, dir_count, _ = f.readline().rstrip("\n").split("\t")
+                if magic != "KOREIDX" or version != INDEX_VERSION:
+                    return False
+                dirs, dir_mtimes = [], []
+                for _ in range(int(dir_count)):
+                    mtime, folder = f.readline().rstrip("\n").split("\t", 1)
+                    dirs.append(folder)
+                    dir_mtimes.append(float(mtime))
+                rows = []
+                for line in f:
+                    parent, mtime, is_dir, name = line.rstrip("\n").split("\t", 3)
+                    rows.append((int(parent), name, float(mtime), is_dir == "1"))
+        except Exception as e:
+            print(f"   [Index Warning] Could not load {self.path}: {e}")
+            return False
+
+        self._replace(dirs, {folder: i for i, folder in enumerate(dirs)}, dir_mtimes,
+                      _Segment(rows), float(built_at))
+        self._saved_version = self._version
+        return True
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """watchdog handler: every event just names a folder to re-list"""
+
+    def __init__(self, index: FileIndex):
+        super().__init__()
+        self.index = index
+
+    def on_any_event(self, event):
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if path:
+                self.index._queue_change(os.path.dirname(os.fsdecode(path)))
+
+
+# Global instance
+_index_instance = None
+
+def get_file_index() -> FileIndex:
+    """
+    Get or create the global file index: loaded from disk and kept current by
+    the watcher, crawled in the background only when there is no index yet
+    """
+    global _index_instance
+    if _index_instance is None:
+        _index_instance = FileIndex()
+        if _index_instance.load():
+            print(f"   [Index] Loaded {len(_index_instance)} entries from {_index_instance.path}")
+            _index_instance.start_watching()
+        else:
+            _index_instance.start_crawl(watch=True)
+    return _index_instance
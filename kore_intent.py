@@ -0,0 +1,283 @@
+"""
+Kore Local Intent Matcher
+Resolves unambiguous commands locally so they skip the Command Router round trip
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from kore_tables import APP_MAP, get_folder_map
+
+# Plans below this confidence fall back to the remote Command Router
+DEFAULT_MIN_CONFIDENCE = 0.9
+
+FILLER_PREFIXES = (
+    "hey kore", "hi kore", "kore", "please", "can you", "could you", "would you",
+    "will you", "i want to", "i need to", "i wanna", "go ahead and"
+)
+FILLER_SUFFIXES = ("please", "for me", "now", "right now", "kore")
+
+OPEN_VERBS = ("open", "launch", "start", "run", "show", "show me", "go to", "bring up", "pull up")
+
+# SYSTEM_INFO: keyword vocabulary per parameter
+SYSTEM_INFO_TERMS = {
+    "cpu": {"cpu", "processor", "processors", "cores"},
+    "memory": {"ram", "memory"},
+    "disk": {"disk", "disks", "storage", "drive", "drives", "space", "hard", "ssd"},
+    "network": {"ip", "network", "internet", "address", "connection"},
+    "all": {"system", "specs", "specifications", "computer", "pc"}
+}
+SYSTEM_INFO_FILLER = {
+    "what", "whats", "what's", "is", "are", "my", "the", "how", "much", "many", "do", "i", "have",
+    "show", "check", "get", "tell", "me", "current", "usage", "use", "used", "load", "left",
+    "free", "available", "info", "information", "status", "level", "of", "a", "about", "on", "percent"
+}
+
+SCREENSHOT_PHRASES = {
+    "screenshot", "take a screenshot", "take screenshot", "take a screen shot", "screen shot",
+    "capture my screen", "capture the screen", "capture screen", "grab a screenshot",
+    "snap a screenshot", "take a picture of my screen"
+}
+RECYCLE_BIN_PHRASES = {
+    "empty recycle bin", "empty the recycle bin", "empty my recycle bin", "clear recycle bin",
+    "clear the recycle bin", "empty trash", "empty the trash", "empty my trash", "clear the trash"
+}
+WALLPAPER_PHRASES = {
+    "change wallpaper", "change my wallpaper", "change the wallpaper", "new wallpaper",
+    "change my background", "change the background", "change desktop background",
+    "change my desktop background", "set a new wallpaper", "set new background"
+}
+UNDO_PHRASES = {
+    "undo", "undo that", "undo it", "undo the last change", "undo last change", "undo the last operation",
+    "undo the organize", "undo organize", "undo the move", "undo that move", "put it back", "put them back"
+}
+GREETINGS = {"hi", "hello", "hey", "hey there", "hello there", "hi there", "yo", "good morning",
+             "good afternoon", "good evening"}
+
+FILE_EXTENSION = re.compile(r"\.[a-z0-9]{1,5}$")
+
+
+def load_router_tools(prompt: Optional[str] = None) -> Dict[str, str]:
+    """
+    Parse Agent 1's FULFILLMENT_PROMPT into {tool: agent_name}
+    This is the tool enum the router itself is allowed to answer with
+    """
+    if prompt is None:
+        from agent1 import FULFILLMENT_PROMPT as prompt
+
+    agent_names = re.findall(r"^- ([A-Z_]+)\s*$", prompt.split("AGENT NAMES", 1)[-1].split("ROUTING EXAMPLES", 1)[0], re.M)
+    tools = {}
+    agent = None
+    in_tool_list = False
+
+    for line in prompt.splitlines():
+        header = re.match(r"^## \d+\. (.+)$", line)
+        if header:
+            agent = _agent_for_header(header.group(1), agent_names)
+            in_tool_list = False
+        elif line.startswith("Tools this agent handles:") or line.startswith("Tool this handles:"):
+            in_tool_list = True
+        elif in_tool_list and line.startswith("- "):
+            for tool in re.findall(r"\b[A-Z][A-Z_]{2,}\b", re.sub(r"\(.*?\)", "", line)):
+                tools[tool] = agent
+        elif in_tool_list and not line.strip():
+            in_tool_list = False
+
+    return tools
+
+
+def _agent_for_header(header: str, agent_names: List[str]) -> str:
+    """Map a prompt section header such as 'APPLICATION LAUNCHER' onto its AGENT NAMES entry"""
+    candidates = re.findall(r"\(([A-Z_ ]+)\)", header)
+    base = re.sub(r"\(.*?\)", "", header).replace(" AGENT", "").strip()
+    candidates.append(base)
+
+    for candidate in candidates:
+        words = candidate.replace("_", " ").split()
+        for name in agent_names:
+            parts = name.split("_")
+            if len(parts) == len(words) and all(w.startswith(p) for p, w in zip(parts, words)):
+                return name
+    return base.replace(" ", "_")
+
+
+class LocalIntentMatcher:
+    """Rule + index based matcher built from Kore's lookup tables and the router's tool enum"""
+
+    def __init__(self, app_map: Optional[Dict] = None, folder_map: Optional[Dict] = None,
+                 router_tools: Optional[Dict[str, str]] = None,
+                 min_confidence: float = DEFAULT_MIN_CONFIDENCE):
+        self.app_map = APP_MAP if app_map is None else app_map
+        self.folder_map = get_folder_map() if folder_map is None else folder_map
+        self.router_tools = load_router_tools() if router_tools is None else router_tools
+        self.min_confidence = min_confidence
+
+        # Index: normalized name -> (tool, canonical parameter)
+        self.open_index = {}
+        for name in self.app_map:
+            self.open_index[name] = ("OPEN_APP", name)
+        for name in self.folder_map:
+            # Folders win on collisions ("network" is a folder, "network settings" an app)
+            self.open_index[name] = ("OPEN_FOLDER", name)
+            self.open_index[f"{name} folder"] = ("OPEN_FOLDER", name)
+            self.open_index[f"my {name}"] = ("OPEN_FOLDER", name)
+            self.open_index[f"my {name} folder"] = ("OPEN_FOLDER", name)
+            self.open_index[f"the {name} folder"] = ("OPEN_FOLDER", name)
+
+        self.system_info_index = {}
+        for info_type, terms in SYSTEM_INFO_TERMS.items():
+            for term in terms:
+                self.system_info_index[term] = info_type
+
+        self.stats = {"hits": 0, "fallbacks": 0}
+
+    @staticmethod
+    def normalize(command: str) -> str:
+        """Lowercase, drop trailing punctuation and polite filler"""
+        text = re.sub(r"\s+", " ", command.lower()).strip()
+        text = text.rstrip("?!.,;: ").lstrip("!.,;: ")
+
+        changed = True
+        while changed and text:
+            changed = False
+            for prefix in FILLER_PREFIXES:
+                if text.startswith(prefix + " ") or text.startswith(prefix + ", "):
+                    text = text[len(prefix):].lstrip(" ,")
+                    changed = True
+            for suffix in FILLER_SUFFIXES:
+                if text.endswith(" " + suffix) or text.endswith(", " + suffix):
+                    text = text[:-len(suffix)].rstrip(" ,")
+                    changed = True
+        return text
+
+    def match(self, command: str) -> Optional[Dict]:
+        """
+        Return a router-shaped plan {"thought", "agent", "tool", "parameter", "confidence"}
+        for confident matches, or None to fall back to the remote router
+        """
+        candidate = self.classify(command)
+        if candidate is None or candidate["confidence"] < self.min_confidence:
+            self.stats["fallbacks"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return candidate
+
+    def classify(self, command: str) -> Optional[Dict]:
+        """Best local guess with its confidence, regardless of threshold"""
+        if not command or not command.strip():
+            return None
+
+        text = self.normalize(command)
+        result = (self._match_phrases(text) or self._match_open(text)
+                  or self._match_system_info(text) or self._match_search(text))
+        if result is None:
+            return None
+
+        tool, parameter, thought, confidence = result
+        # Never invent tools the router itself could not return
+        if tool not in self.router_tools:
+            return None
+
+        return {
+            "thought": thought,
+            "agent": self.router_tools[tool],
+            "tool": tool,
+            "parameter": parameter,
+            "confidence": confidence,
+            "source": "local"
+        }
+
+    def _match_phrases(self, text: str) -> Optional[Tuple]:
+        if text in SCREENSHOT_PHRASES:
+            return ("SCREENSHOT", None, "Capturing your screen", 0.98)
+        if text in RECYCLE_BIN_PHRASES:
+            return ("EMPTY_RECYCLE_BIN", None, "Clearing recycle bin", 0.97)
+        if text in WALLPAPER_PHRASES:
+            return ("CHANGE_WALLPAPER", None, "Picking a fresh wallpaper", 0.95)
+        if text in UNDO_PHRASES:
+            return ("UNDO_FILE_OPERATION", None, "Putting things back", 0.95)
+        if text in GREETINGS:
+            return ("CHAT", None, "Hey! What can I do for you?", 0.95)
+        return None
+
+    def _match_open(self, text: str) -> Optional[Tuple]:
+        for verb in OPEN_VERBS:
+            if text.startswith(verb + " "):
+                target = text[len(verb) + 1:].strip()
+                hit = self.open_index.get(target)
+                if hit is None and target.startswith("the "):
+                    hit = self.open_index.get(target[4:])
+                if hit is None:
+                    continue
+
+                tool, name = hit
+                if tool == "OPEN_APP":
+                    # "show"/"go to" are folder verbs; an app after them is less certain
+                    confidence = 0.97 if verb in ("open", "launch", "start", "run") else 0.85
+                    return ("OPEN_APP", name.title(), f"Launching {name.title()}", confidence)
+                return ("OPEN_FOLDER", name, f"Opening your {name} folder", 0.97)
+
+        # Bare app name ("notepad") is most likely a launch request
+        hit = self.open_index.get(text)
+        if hit and hit[0] == "OPEN_APP" and " " not in text:
+            return ("OPEN_APP", hit[1].title(), f"Launching {hit[1].title()}", 0.9)
+        return None
+
+    def _match_system_info(self, text: str) -> Optional[Tuple]:
+        words = re.findall(r"[a-z']+", text)
+        info_types = set()
+        for word in words:
+            if word in self.system_info_index:
+                info_types.add(self.system_info_index[word])
+            elif word not in SYSTEM_INFO_FILLER:
+                # Unknown word - could be "why is my cpu so high", leave it to the router
+                return None
+
+        if len(info_types) > 1:
+            info_types.discard("all")
+        if len(info_types) != 1:
+            return None
+
+        info_type = info_types.pop()
+        thoughts = {
+            "cpu": "Checking CPU usage",
+            "memory": "Checking system memory info",
+            "disk": "Checking disk space",
+            "network": "Checking network configuration",
+            "all": "Gathering system info"
+        }
+        return ("SYSTEM_INFO", info_type, thoughts[info_type], 0.95)
+
+    def _match_search(self, text: str) -> Optional[Tuple]:
+        match = re.match(r"^(?:google|search (?:google|the web|online) for) (.+)$", text)
+        if match:
+            return ("GOOGLE", match.group(1), f"Searching the web for {match.group(1)}", 0.95)
+
+        match = re.match(r"^(?:find|locate|where is|where's) (?:my |the )?(.+)$", text)
+        if match:
+            target = match.group(1)
+            # A file name with an extension is unambiguous; anything else is a guess
+            confidence = 0.93 if FILE_EXTENSION.search(target) else 0.6
+            return ("FIND_FILE", target, f"Searching for {target}", confidence)
+
+        match = re.match(r"^search (?:for )?(.+)$", text)
+        if match:
+            return ("GOOGLE", match.group(1), f"Searching the web for {match.group(1)}", 0.6)
+        return None
+
+
+# Global instance
+_matcher_instance = None
+
+def get_intent_matcher() -> LocalIntentMatcher:
+    """Get or create global intent matcher"""
+    global _matcher_instance
+    if _matcher_instance is None:
+        _matcher_instance = LocalIntentMatcher()
+    return _matcher_instance
+
+
+def match_intent(command: str) -> Optional[Dict]:
+    """Confident local plan for the command, or None to ask the Command Router"""
+    return get_intent_matcher().match(command)
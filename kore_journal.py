@@ -0,0 +1,321 @@
+"""
+Kore File Operation Journal
+Append-only JSON-lines log of planned and completed file operations, so bulk
+moves/copies (organize_files, move_file, copy_file) can be previewed, undone
+and resumed or reverted after a crash without re-scanning the folders involved
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from kore_copy import PARTIAL_SUFFIX, CopyCancelled, copy_path
+
+DEFAULT_JOURNAL_PATH = "kore_file_journal.jsonl"
+
+# Finished transactions kept for undo when the log is compacted
+KEEP_TRANSACTIONS = 50
+COMPACT_BYTES = 32 * 1024 * 1024
+
+# A step is [action, source, destination]:
+#   "mkdir": source None, destination folder created
+#   "move":  source moved to destination
+#   "copy":  source copied to destination, which must not exist when the transaction
+#            begins (undo deletes the whole destination, and so does a copy that fails)
+
+
+class Transaction:
+    """One journalled operation: its steps and which of them have completed"""
+
+    def __init__(self, txn_id: str, kind: str, steps: List[List], label: str = "", created: float = 0.0):
+        self.id = txn_id
+        self.kind = kind
+        self.steps = steps
+        self.label = label
+        self.created = created or time.time()
+        self.done = set()
+        self.state = "open"     # open -> committed | aborted -> undone
+
+    def pending(self) -> List[int]:
+        return [i for i in range(len(self.steps)) if i not in self.done]
+
+    def summary(self) -> Dict:
+        return {"id": self.id, "kind": self.kind, "label": self.label, "steps": len(self.steps),
+                "done": len(self.done), "state": self.state, "created": self.created}
+
+
+class FileJournal:
+    """
+    Write-ahead journal: begin() logs the full plan before anything touches the disk,
+    completed() logs finished step indices in batches, commit() closes the transaction.
+    Open transactions found on load are what crashed mid-way.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_JOURNAL_PATH):
+        self.path = path
+        self.transactions = {}      # id -> Transaction, oldest first
+        self._file = None
+        self._lock = threading.Lock()
+        self.load()
+
+    # ---------- log ----------
+
+    def _append(self, record: Dict, sync: bool = False):
+        if not self.path:
+            return
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def load(self):
+        """Replay the log into memory"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        transactions = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue    # Torn last line from a crash mid-write
+                txn = transactions.get(record.get("txn"))
+                op = record.get("op")
+                if op == "begin":
+                    transactions[record["txn"]] = Transaction(record["txn"], record["kind"], record["steps"],
+                                                              record.get("label", ""), record.get("time", 0.0))
+                elif txn is None:
+                    continue
+                elif op == "done":
+                    txn.done.update(record["steps"])
+                elif op in ("committed", "aborted", "undone"):
+                    txn.state = op
+        self.transactions = transactions
+        if os.path.getsize(self.path) > COMPACT_BYTES:
+            self.compact()
+
+    def compact(self, keep: int = KEEP_TRANSACTIONS):
+        """Rewrite the log with open transactions plus the last `keep` finished ones"""
+        with self._lock:
+            finished = [txn for txn in self.transactions.values() if txn.state != "open"]
+            drop = {txn.id for txn in finished[:-keep]} if keep else {txn.id for txn in finished}
+            self.transactions = {tid: txn for tid, txn in self.transactions.items() if tid not in drop}
+            if not self.path:
+                return
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for txn in self.transactions.values():
+                    f.write(json.dumps({"op": "begin", "txn": txn.id, "kind": txn.kind, "label": txn.label,
+                                        "time": txn.created, "steps": txn.steps}, separators=(",", ":")) + "\n")
+                    if txn.done:
+                        f.write(json.dumps({"op": "done", "txn": txn.id, "steps": sorted(txn.done)}) + "\n")
+                    if txn.state != "open":
+                        f.write(json.dumps({"op": txn.state, "txn": txn.id}) + "\n")
+            os.replace(tmp_path, self.path)
+
+    # ---------- transactions ----------
+
+    def begin(self, kind: str, steps: List, label: str = "") -> Transaction:
+        """Log the whole plan durably before any step runs"""
+        txn = Transaction(uuid.uuid4().hex[:12], kind, [list(step) for step in steps], label)
+        with self._lock:
+            self.transactions[txn.id] = txn
+            self._append({"op": "begin", "txn": txn.id, "kind": kind, "label": label,
+                          "time": txn.created, "steps": txn.steps}, sync=True)
+        return txn
+
+    def completed(self, txn: Transaction, indices):
+        """Record finished steps (call once per batch, not per file)"""
+        indices = list(indices)
+        if not indices:
+            return
+        with self._lock:
+            txn.done.update(indices)
+            self._append({"op": "done", "txn": txn.id, "steps": indices})
+
+    def _finish(self, txn: Transaction, state: str):
+        with self._lock:
+            txn.state = state
+            self._append({"op": state, "txn": txn.id}, sync=True)
+
+    def commit(self, txn: Transaction):
+        self._finish(txn, "committed")
+
+    def abort(self, txn: Transaction):
+        self._finish(txn, "aborted")
+
+    def incomplete(self) -> List[Transaction]:
+        """Transactions that were interrupted (crash or kill) before commit"""
+        return [txn for txn in self.transactions.values() if txn.state == "open"]
+
+    def history(self, limit: int = 10) -> List[Dict]:
+        """Most recent transactions first"""
+        return [txn.summary() for txn in list(self.transactions.values())[::-1][:limit]]
+
+    # ---------- running steps ----------
+
+    @staticmethod
+    def run_step(step: List, progress: Optional[Callable[[int, int], None]] = None,
+                 cancel: Optional[threading.Event] = None) -> None:
+        action, source, destination = step
+        if action == "mkdir":
+            os.makedirs(destination, exist_ok=True)
+        elif action == "move":
+            try:
+                os.rename(source, destination)
+            except OSError:
+                shutil.move(source, destination)    # Across volumes
+        elif action == "copy":
+            # Files or whole folders; an interrupted large-file copy resumes from its checkpoint
+            result = copy_path(source, destination, progress=progress, cancel=cancel)
+            if result["errors"]:
+                path, error = result["errors"][0]
+                raise OSError(f"{len(result['errors'])} of {result['files']} files not copied "
+                              f"(first: {path}: {error})")
+        else:
+            raise ValueError(f"Unknown journal action: {action}")
+
+    @staticmethod
+    def undo_step(step: List) -> None:
+        action, source, destination = step
+        if action == "mkdir":
+            # Only folders the operation created and left empty
+            if os.path.isdir(destination) and not os.listdir(destination):
+                os.rmdir(destination)
+        elif action == "move":
+            if os.path.exists(source):
+                raise FileExistsError(f"{source} exists again; not overwriting it")
+            try:
+                os.rename(destination, source)
+            except OSError:
+                shutil.move(destination, source)
+        elif action == "copy":
+            if os.path.isdir(destination):
+                shutil.rmtree(destination)
+            elif os.path.isfile(destination):
+                os.remove(destination)
+
+    @staticmethod
+    def discard_step(step: List) -> None:
+        """Remove what a copy that failed or never finished left behind, partial files included"""
+        action, source, destination = step
+        if action != "copy":
+            return
+        FileJournal.undo_step(step)
+        partial = destination + PARTIAL_SUFFIX
+        for leftover in (partial, partial + ".json"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    def _discard(self, step: List):
+        try:
+            self.discard_step(step)
+        except OSError as e:
+            print(f"   [Journal Warning] Could not remove the partial copy {step[2]}: {e}")
+
+    @staticmethod
+    def step_applied(step: List) -> bool:
+        """Whether a step not logged as done actually ran before a crash"""
+        action, source, destination = step
+        if action == "mkdir":
+            return os.path.isdir(destination)
+        if action == "move":
+            return not os.path.lexists(source) and os.path.lexists(destination)
+        # A copy interrupted mid-write may be partial; treat it as not applied and redo it
+        return False
+
+    def run(self, txn: Transaction, indices: Optional[List[int]] = None,
+            progress: Optional[Callable[[int, int], None]] = None,
+            cancel: Optional[threading.Event] = None) -> List[Tuple[List, str]]:
+        """Run pending steps in order, logging progress; setting `cancel` stops a copy. Returns [(step, error)]"""
+        errors, done = [], []
+        for i in (txn.pending() if indices is None else indices):
+            try:
+                self.run_step(txn.steps[i], progress, cancel)
+                done.append(i)
+            except CopyCancelled:
+                # Stop here; what finished is logged, the partial copy is not kept
+                errors.append((txn.steps[i], "cancelled"))
+                self._discard(txn.steps[i])
+                break
+            except OSError as e:
+                errors.append((txn.steps[i], str(e)))
+                # Never logged as done, so undo would not find a half-copied destination
+                self._discard(txn.steps[i])
+            if len(done) >= 256:
+                self.completed(txn, done)
+                done = []
+        self.completed(txn, done)
+        return errors
+
+    def revert(self, txn: Transaction) -> List[Tuple[List, str]]:
+        """Undo a transaction's completed steps, newest first; returns [(step, error)]"""
+        errors = []
+        for i in sorted(txn.done, reverse=True):
+            try:
+                self.undo_step(txn.steps[i])
+            except OSError as e:
+                errors.append((txn.steps[i], str(e)))
+        self._finish(txn, "undone")
+        return errors
+
+    def undo(self, count: int = 1) -> List[Transaction]:
+        """Bulk undo of the last `count` committed transactions, newest first"""
+        undone = []
+        for txn in list(self.transactions.values())[::-1]:
+            if len(undone) >= count:
+                break
+            if txn.state == "committed":
+                errors = self.revert(txn)
+                for step, error in errors[:5]:
+                    print(f"   [Journal Warning] Could not undo {step[0]} of {step[2]}: {error}")
+                undone.append(txn)
+        return undone
+
+    def recover(self, mode: str = "resume") -> List[Transaction]:
+        """
+        Finish ("resume") or roll back ("revert") transactions left open by a crash.
+        Only the steps of those transactions are checked against the disk.
+        """
+        recovered = []
+        for txn in self.incomplete():
+            # Steps that ran but whose "done" record never made it to the log
+            self.completed(txn, [i for i in txn.pending() if self.step_applied(txn.steps[i])])
+            if mode == "revert":
+                # An interrupted copy is never logged as done, so revert() alone would skip it
+                for i in txn.pending():
+                    self._discard(txn.steps[i])
+                self.revert(txn)
+            else:
+                errors = self.run(txn)
+                if errors:
+                    print(f"   [Journal Warning] {len(errors)} steps of {txn.kind} '{txn.label}' could not be resumed")
+                self.commit(txn)
+            recovered.append(txn)
+        return recovered
+
+
+def plan_paths(txn_or_steps) -> List[str]:
+    """Every path a transaction touches (for refreshing the file index)"""
+    steps = txn_or_steps.steps if isinstance(txn_or_steps, Transaction) else txn_or_steps
+    return [path for _, source, destination in steps for path in (source, destination) if path]
+
+
+# Global instance
+_journal_instance = None
+
+def get_file_journal() -> FileJournal:
+    """Get or create the global file operation journal"""
+    global _journal_instance
+    if _journal_instance is None:
+        _journal_instance = FileJournal()
+    return _journal_instance
@@ -1,4 +1,5 @@
 import sys
+import asyncio
 import threading
 import time
 import json
@@ -6,11 +7,22 @@ import os
 import subprocess
 from PyQt6.QtWidgets import QApplication, QInputDialog
 from PyQt6.QtCore import QTimer
-from datetime import datetime
 
 from kore_overlay import KoreOverlay
 from kore_voice import KoreVoice
-from kore_ondemand import ask_ondemand, get_ondemand
+from kore_app_catalog import get_app_catalog
+from kore_file_index import get_file_index
+from kore_sysmon import get_system_sampler
+from kore_intent import get_intent_matcher, match_intent
+from kore_planner import AGENT_KEYS, PLAN_TOOL, PlanError, PlanExecutor, PlanGraph
+from kore_tools import ToolResult, get_tool_registry
+from kore_scheduler import TYPED, VOICE, get_scheduler
+from kore_speculate import get_speculator
+from kore_tables import get_folder_map
+from kore_ondemand import (
+    ask_ondemand, ask_ondemand_async, get_ondemand,
+    start_async_loop, stop_async_loop, submit_async
+)
 
 try:
     from kore_control import (
@@ -19,7 +31,7 @@ try:
         edit_file, read_file, copy_file, move_file, list_files,
         get_system_info, kill_process, take_screenshot, open_url,
         open_application, open_folder, empty_recycle_bin, organize_files,
-        change_wallpaper
+        change_wallpaper, undo_file_operations, recover_file_operations
     )
 except ImportError as e:
     print(f"   [Error] Could not import from kore_control: {e}")
@@ -30,26 +42,14 @@ print(f"   [System] Using OnDemand AI Platform")
 # Global instances
 overlay_instance = None
 voice_instance = None
-command_lock = threading.Lock()
+# Only one voice command can hold the microphone; everything else goes through the scheduler
+microphone_lock = threading.Lock()
+scheduler = get_scheduler()
+# Read-only lookups for the likely action, started while the router is thinking
+speculator = get_speculator()
 
-# Simple rate limiting
-last_request_time = None
-MIN_REQUEST_INTERVAL = 0.5
-
-def can_make_request():
-    """Simple cooldown check"""
-    global last_request_time
-    
-    if last_request_time:
-        elapsed = (datetime.now() - last_request_time).total_seconds()
-        if elapsed < MIN_REQUEST_INTERVAL:
-            time.sleep(MIN_REQUEST_INTERVAL - elapsed)
-    
-    return True
-
-def update_request_tracker():
-    global last_request_time
-    last_request_time = datetime.now()
+# Local guesses are good enough when the router is unreachable (the fast path wants 0.9)
+FALLBACK_MIN_CONFIDENCE = 0.6
 
 def show_thought(message, duration=180, persistent=False):
     """Helper to show thought bubble"""
@@ -74,290 +74,388 @@ def format_system_info(info, info_type):
     if info_type == "memory":
         return f"RAM: {info.get('memory_total_gb', 'N/A')}GB total, {info.get('memory_available_gb', 'N/A')}GB available ({info.get('memory_percent', 'N/A')}% used)"
     elif info_type == "cpu":
-        return f"CPU: {info.get('cpu_percent', 'N/A')}% usage, {info.get('cpu_count_logical', 'N/A')} cores @ {info.get('cpu_frequency_mhz', 'N/A')}MHz"
+        return f"CPU: {info.get('cpu_percent', 'N/A')}% usage ({info.get('cpu_percent_avg_5m', 'N/A')}% avg 5 min), {info.get('cpu_count_logical', 'N/A')} cores @ {info.get('cpu_frequency_mhz', 'N/A')}MHz"
     elif info_type == "disk":
         return f"Disk: {info.get('disk_total_gb', 'N/A')}GB total, {info.get('disk_free_gb', 'N/A')}GB free ({info.get('disk_percent', 'N/A')}% used)"
     elif info_type == "network":
-        return f"Network: IP {info.get('local_ip', 'N/A')}, Sent: {info.get('bytes_sent_mb', 'N/A')}MB, Received: {info.get('bytes_recv_mb', 'N/A')}MB"
+        connected = sum(1 for adapter in info.get('network_adapters', []) if adapter['is_up'])
+        return f"Network: IP {info.get('local_ip', 'N/A')}, {connected} adapter(s) up, Up: {info.get('upload_kb_s', 'N/A')}KB/s, Down: {info.get('download_kb_s', 'N/A')}KB/s"
     else:
         return f"System: {info.get('computer_name', 'N/A')} | RAM: {info.get('memory_total_gb', 'N/A')}GB | CPU: {info.get('cpu_percent', 'N/A')}% | Disk: {info.get('disk_free_gb', 'N/A')}GB free"
 
+# ---------- Tool handlers ----------
+# Each handler does the work and returns a ToolResult; execute_action owns the
+# bubble, voice and emotion around it
+
+tools = get_tool_registry()
+
+@tools.register("CHAT", cacheable=False, expected_ms=0)
+def chat_tool(param, progress):
+    # Pure conversational response - no action needed
+    return ToolResult(True)
+
+@tools.register("OPEN_APP", start="Opening {param}...", expected_ms=1500)
+def open_app_tool(param, progress):
+    success = open_application(param, target=speculator.take("OPEN_APP", param, lambda: None))
+    message = f"Opened {param}" if success else f"Couldn't find {param}"
+    return ToolResult(success, message, f"Opening {param}" if success else message)
+
+@tools.register("OPEN_FOLDER", start="Opening {param}...")
+def open_folder_tool(param, progress):
+    success = open_folder(param, found_path=speculator.take("OPEN_FOLDER", param, lambda: None))
+    return ToolResult(success, f"Opened {param}" if success else "Folder not found", f"Opening {param}")
+
+@tools.register("FIND_FILE", start="Searching for {param}...", expected_ms=2000)
+def find_file_tool(param, progress):
+    path = speculator.take("FIND_FILE", param, lambda: find_file_in_system(param))
+    if not path:
+        return ToolResult(False, f"Couldn't find {param}")
+    subprocess.Popen(f'explorer /select,"{path}"')
+    return ToolResult(True, f"Found: {os.path.basename(path)}", f"Found {param}", duration=180, output=path)
+
+@tools.register("CREATE_FILE", start="Creating file...", expected_ms=100, serialize_paths=True,
+                schema={"type": "object", "required": ["path"]})
+def create_file_tool(param, progress):
+    success = create_file(param.get("path"), param.get("content", "")) is not None
+    return ToolResult(success, "File created!" if success else "Failed to create file", "File created")
+
+@tools.register("CREATE_FOLDER", start="Creating folder...", expected_ms=100, serialize_paths=True)
+def create_folder_tool(param, progress):
+    success = create_folder(param) is not None
+    return ToolResult(success, "Folder created!" if success else "Failed to create", "Folder created")
+
+@tools.register("DELETE_FILE", start="Deleting...", destructive=True, cacheable=False, serialize_paths=True)
+def delete_file_tool(param, progress):
+    success = delete_file(param)
+    return ToolResult(success, "Deleted!" if success else "Delete failed", "Deleted")
+
+@tools.register("EDIT_FILE", start="Editing file...", destructive=True, idempotent=False, cacheable=False,
+                expected_ms=100, serialize_paths=True, schema={"type": "object", "required": ["path"]})
+def edit_file_tool(param, progress):
+    success = edit_file(param.get("path"), param.get("content"), param.get("mode", "append"))
+    return ToolResult(success, "File updated!" if success else "Edit failed", "File updated")
+
+@tools.register("READ_FILE", start="Reading file...", expected_ms=100, serialize_paths=True)
+def read_file_tool(param, progress):
+    if isinstance(param, dict):
+        content = read_file(param.get("path"), start_line=param.get("start_line"),
+                            line_count=param.get("line_count", 50), tail=param.get("tail", False))
+    else:
+        content = read_file(param)
+    if not content:
+        return ToolResult(False, "Failed to read file")
+    print(f"   [Content] {content[:200]}...")
+    return ToolResult(True, f"Read {len(content)} characters", "Reading file", duration=180, output=content)
+
+@tools.register("COPY_FILE", start="Copying file...", expected_ms=2000, serialize_paths=True,
+                schema={"type": "object", "required": ["source", "destination"]})
+def copy_file_tool(param, progress):
+    # A superseded command stops its copy too
+    job = scheduler.current_job()
+    success = copy_file(
+        param.get("source"), param.get("destination"),
+        progress=lambda done, total: progress(
+            f"Copying... {done * 100 // max(total, 1)}% of {total / (1024**2):.0f} MB"),
+        cancel=job.cancel_event if job is not None else None)
+    return ToolResult(success, "File copied!" if success else "Copy failed", "File copied")
+
+@tools.register("MOVE_FILE", start="Moving file...", destructive=True, idempotent=False, cacheable=False,
+                serialize_paths=True, schema={"type": "object", "required": ["source", "destination"]})
+def move_file_tool(param, progress):
+    success = move_file(param.get("source"), param.get("destination"))
+    return ToolResult(success, "File moved!" if success else "Move failed", "File moved")
+
+@tools.register("UNDO_FILE_OPERATION", start="Undoing...", destructive=True, idempotent=False, cacheable=False,
+                concurrency=1)
+def undo_file_operation_tool(param, progress):
+    count = int(param) if str(param).isdigit() else 1
+    success = undo_file_operations(count)
+    message = "Undone" if success else "Nothing to undo"
+    return ToolResult(success, "Undone!" if success else message, message)
+
+@tools.register("LIST_FILES", start="Listing files...", expected_ms=200)
+def list_files_tool(param, progress):
+    files = list_files(param)
+    if not files:
+        return ToolResult(False, "No files found")
+    print(f"   [Files] {', '.join(files[:10])}")
+    return ToolResult(True, f"Found {len(files)} items", f"Found {len(files)} items", duration=180,
+                      output="\n".join(files))
+
+@tools.register("GOOGLE", start="Searching: {param}...", expected_ms=1000)
+def google_tool(param, progress):
+    open_google_search(param)
+    return ToolResult(True, "Search opened", f"Searching for {param}")
+
+@tools.register("OPEN_URL", start="Opening URL...", expected_ms=1000)
+def open_url_tool(param, progress):
+    open_url(param)
+    return ToolResult(True, "URL opened", "Opening URL")
+
+@tools.register("RUN_CMD", start="Executing command...", destructive=True, idempotent=False, cacheable=False,
+                expected_ms=3000, concurrency=2)
+def run_cmd_tool(param, progress):
+    output = run_terminal_command(param)
+    print(f"   [CMD] {output[:300]}...")
+    return ToolResult(True, "Command executed", "Command executed", output=output)
+
+@tools.register("SYSTEM_INFO", start="Gathering system info...", expected_ms=50)
+def system_info_tool(param, progress):
+    info_type = param if param and param != "null" else "all"
+    info = speculator.take("SYSTEM_INFO", info_type, lambda: get_system_info(info_type))
+    if not info:
+        return ToolResult(False, "Failed to get system info")
+    
+    print(f"   [Info] {json.dumps(info, indent=2)}")
+    if info_type == "memory" and "memory_total_gb" in info:
+        speech = f"You have {info['memory_total_gb']} gigabytes of RAM, with {info['memory_available_gb']} gigabytes available"
+    elif info_type == "cpu" and "cpu_percent" in info:
+        speech = f"CPU usage is at {info['cpu_percent']} percent"
+    elif info_type == "disk" and "disk_free_gb" in info:
+        speech = f"You have {info['disk_free_gb']} gigabytes of free disk space"
+    else:
+        speech = "System info retrieved"
+    return ToolResult(True, format_system_info(info, info_type), speech, duration=300, output=json.dumps(info))
+
+@tools.register("KILL_PROCESS", start="Terminating {param}...", destructive=True, cacheable=False)
+def kill_process_tool(param, progress):
+    success = kill_process(param)
+    return ToolResult(success, f"Terminated {param}" if success else "Process not found", f"Terminated {param}")
+
+@tools.register("SCREENSHOT", start="Taking screenshot...", idempotent=False, concurrency=1)
+def screenshot_tool(param, progress):
+    path = take_screenshot(param if param and param != "null" else None)
+    if not path:
+        return ToolResult(False, "Screenshot failed")
+    return ToolResult(True, "Screenshot saved", "Screenshot captured", output=path)
+
+@tools.register("EMPTY_RECYCLE_BIN", start="Emptying recycle bin...", destructive=True, cacheable=False,
+                expected_ms=2000, concurrency=1)
+def empty_recycle_bin_tool(param, progress):
+    success = empty_recycle_bin()
+    return ToolResult(success, "Recycle bin emptied!" if success else "Failed to empty", "Recycle bin emptied")
+
+@tools.register("ORGANIZE_FILES", start="Organizing files...", destructive=True, cacheable=False, expected_ms=3000,
+                serialize_paths=True)
+def organize_files_tool(param, progress):
+    success = organize_files(param, progress=lambda done, total: progress(f"Organizing files... {done}/{total}"))
+    return ToolResult(success, "Files organized!" if success else "Organization failed", "Files organized")
+
+@tools.register("CHANGE_WALLPAPER", start="Changing wallpaper...", expected_ms=1000, concurrency=1)
+def change_wallpaper_tool(param, progress):
+    success = change_wallpaper(param if param and param != "null" else None)
+    return ToolResult(success, "Wallpaper changed!" if success else "Failed to change", "Wallpaper changed")
+
+@tools.register("SCAN_DLL_ERROR", start="Scanning for DLL errors...")
+def scan_dll_error_tool(param, progress):
+    # DLL scanning functionality would go here
+    return ToolResult(True, "DLL scan complete", "DLL scan complete")
+
+@tools.register("FIX_DLL_ERROR", start="Fixing DLL errors...", destructive=True, cacheable=False, concurrency=1)
+def fix_dll_error_tool(param, progress):
+    # DLL fixing functionality would go here
+    return ToolResult(True, "DLL fix attempted", "DLL fix attempted")
+
+@tools.register("ASK_AGENT", start="Asking a specialist...", expected_ms=4000,
+                schema={"type": "object", "required": ["agent", "query"]})
+def ask_agent_tool(param, progress):
+    # A step of a compound plan handed to one OnDemand specialist
+    agent_key = AGENT_KEYS.get(str(param["agent"]).upper(), param["agent"])
+    question = param["query"]
+    if param.get("inputs"):
+        question += "\n\nResults so far:\n" + "\n".join(f"[{k}] {v}" for k, v in param["inputs"].items())
+    answer = get_ondemand().ask_agent(agent_key, question)
+    if not answer:
+        return ToolResult(False, "The specialist didn't answer")
+    first_sentence = answer.strip().split("\n")[0].split(". ")[0][:160]
+    return ToolResult(True, first_sentence, first_sentence, duration=300, output=answer)
+
+# ---------- Speculative preparation ----------
+# Side-effect-free halves of the tools above, run from the command text while the
+# router is thinking; the handlers take the result when the plan matches
+
+@speculator.preparer("FIND_FILE", ready=lambda: get_file_index().ready)
+def prepare_find_file(param):
+    return find_file_in_system(param)
+
+@speculator.preparer("OPEN_APP", ready=lambda: get_app_catalog().ready)
+def prepare_open_app(param):
+    return get_app_catalog().find(param)
+
+@speculator.preparer("OPEN_FOLDER", ready=lambda: get_file_index().ready)
+def prepare_open_folder(param):
+    # Known folders and direct paths need no search
+    if param.lower() in get_folder_map() or os.path.exists(param):
+        return None
+    return find_file_in_system(param, kind="dir")
+
+@speculator.preparer("SYSTEM_INFO")
+def prepare_system_info(param):
+    return get_system_info(param)
+
+def run_tool(tool, param):
+    """Dispatch one tool under its per-tool limits, with progress in the bubble"""
+    entry = tools.get(tool)
+    # Per-tool limits: file operations on the same path queue up, queries run side by side
+    with scheduler.gate.hold(tool, entry.concurrency if entry else None, entry.paths(param) if entry else ()):
+        return tools.dispatch(tool, param, progress=lambda message: show_thought(message, persistent=True))
+
 def execute_action(tool, param, speak=False):
     """Execute the chosen action based on OnDemand agent decision"""
     global overlay_instance, voice_instance
     
-    success = False
+    entry = tools.get(tool)
     
     # Show persistent thought bubble for operations
     if tool != "CHAT" and overlay_instance:
         overlay_instance.set_emotion('thinking')
+    if entry and entry.start_message(param):
+        show_thought(entry.start_message(param), persistent=True)
     
-    try:
-        if tool == "CHAT":
-            # Pure conversational response - no action needed
-            success = True
-            return
-        
-        elif tool == "OPEN_APP":
-            if overlay_instance:
-                overlay_instance.show_thought(f"Opening {param}...", persistent=True)
-            success = open_application(param)
-            if overlay_instance:
-                overlay_instance.show_thought(f"Opened {param}" if success else f"Couldn't find {param}", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak(f"Opening {param}" if success else f"Couldn't find {param}")
-        
-        elif tool == "OPEN_FOLDER":
-            show_thought(f"Opening {param}...", persistent=True)
-            success = open_folder(param)
-            show_thought(f"Opened {param}" if success else f"Folder not found", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak(f"Opening {param}")
-        
-        elif tool == "FIND_FILE":
-            show_thought(f"Searching for {param}...", persistent=True)
-            path = find_file_in_system(param)
-            if path:
-                subprocess.Popen(f'explorer /select,"{path}"')
-                show_thought(f"Found: {os.path.basename(path)}", persistent=False, duration=180)
-                if speak and voice_instance:
-                    voice_instance.speak(f"Found {param}")
-                success = True
-            else:
-                show_thought(f"Couldn't find {param}", persistent=False, duration=120)
-        
-        elif tool == "CREATE_FILE":
-            if isinstance(param, dict):
-                show_thought("Creating file...", persistent=True)
-                result = create_file(param.get("path"), param.get("content", ""))
-                success = result is not None
-                show_thought("File created!" if success else "Failed to create file", persistent=False, duration=120)
-                if speak and voice_instance:
-                    voice_instance.speak("File created")
-        
-        elif tool == "CREATE_FOLDER":
-            show_thought("Creating folder...", persistent=True)
-            success = create_folder(param) is not None
-            show_thought("Folder created!" if success else "Failed to create", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak("Folder created")
-        
-        elif tool == "DELETE_FILE":
-            show_thought("Deleting...", persistent=True)
-            success = delete_file(param)
-            show_thought("Deleted!" if success else "Delete failed", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak("Deleted")
-        
-        elif tool == "EDIT_FILE":
-            if isinstance(param, dict):
-                show_thought("Editing file...", persistent=True)
-                success = edit_file(param.get("path"), param.get("content"), param.get("mode", "append"))
-                show_thought("File updated!" if success else "Edit failed", persistent=False, duration=120)
-                if speak and voice_instance:
-                    voice_instance.speak("File updated")
-        
-        elif tool == "READ_FILE":
-            show_thought("Reading file...", persistent=True)
-            content = read_file(param)
-            if content:
-                print(f"   [Content] {content[:200]}...")
-                show_thought(f"Read {len(content)} characters", persistent=False, duration=180)
-                if speak and voice_instance:
-                    voice_instance.speak("Reading file")
-                success = True
-            else:
-                show_thought("Failed to read file", persistent=False, duration=120)
-        
-        elif tool == "COPY_FILE":
-            if isinstance(param, dict):
-                show_thought("Copying file...", persistent=True)
-                success = copy_file(param.get("source"), param.get("destination"))
-                show_thought("File copied!" if success else "Copy failed", persistent=False, duration=120)
-                if speak and voice_instance:
-                    voice_instance.speak("File copied")
-        
-        elif tool == "MOVE_FILE":
-            if isinstance(param, dict):
-                show_thought("Moving file...", persistent=True)
-                success = move_file(param.get("source"), param.get("destination"))
-                show_thought("File moved!" if success else "Move failed", persistent=False, duration=120)
-                if speak and voice_instance:
-                    voice_instance.speak("File moved")
-        
-        elif tool == "LIST_FILES":
-            show_thought("Listing files...", persistent=True)
-            files = list_files(param)
-            if files:
-                print(f"   [Files] {', '.join(files[:10])}")
-                show_thought(f"Found {len(files)} items", persistent=False, duration=180)
-                if speak and voice_instance:
-                    voice_instance.speak(f"Found {len(files)} items")
-                success = True
-            else:
-                show_thought("No files found", persistent=False, duration=120)
-        
-        elif tool == "GOOGLE":
-            show_thought(f"Searching: {param}...", persistent=True)
-            open_google_search(param)
-            show_thought(f"Search opened", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak(f"Searching for {param}")
-            success = True
-        
-        elif tool == "OPEN_URL":
-            show_thought("Opening URL...", persistent=True)
-            open_url(param)
-            show_thought("URL opened", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak("Opening URL")
-            success = True
-        
-        elif tool == "RUN_CMD":
-            show_thought("Executing command...", persistent=True)
-            output = run_terminal_command(param)
-            print(f"   [CMD] {output[:300]}...")
-            show_thought("Command executed", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak("Command executed")
-            success = True
-        
-        elif tool == "SYSTEM_INFO":
-            show_thought("Gathering system info...", persistent=True)
-            
-            info_type = param if param and param != "null" else "all"
-            info = get_system_info(info_type)
-            
-            if info:
-                print(f"   [Info] {json.dumps(info, indent=2)}")
-                
-                formatted_info = format_system_info(info, info_type)
-                show_thought(formatted_info, persistent=False, duration=300)
-                
-                if speak and voice_instance:
-                    if info_type == "memory" and "memory_total_gb" in info:
-                        voice_instance.speak(f"You have {info['memory_total_gb']} gigabytes of RAM, with {info['memory_available_gb']} gigabytes available")
-                    elif info_type == "cpu" and "cpu_percent" in info:
-                        voice_instance.speak(f"CPU usage is at {info['cpu_percent']} percent")
-                    elif info_type == "disk" and "disk_free_gb" in info:
-                        voice_instance.speak(f"You have {info['disk_free_gb']} gigabytes of free disk space")
-                    else:
-                        voice_instance.speak("System info retrieved")
-                success = True
-            else:
-                show_thought("Failed to get system info", persistent=False, duration=120)
-        
-        elif tool == "KILL_PROCESS":
-            show_thought(f"Terminating {param}...", persistent=True)
-            success = kill_process(param)
-            show_thought(f"Terminated {param}" if success else "Process not found", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak(f"Terminated {param}")
-        
-        elif tool == "SCREENSHOT":
-            show_thought("Taking screenshot...", persistent=True)
-            path = take_screenshot(param if param and param != "null" else None)
-            if path:
-                show_thought(f"Screenshot saved", persistent=False, duration=120)
-                if speak and voice_instance:
-                    voice_instance.speak("Screenshot captured")
-                success = True
-            else:
-                show_thought("Screenshot failed", persistent=False, duration=120)
-        
-        elif tool == "EMPTY_RECYCLE_BIN":
-            show_thought("Emptying recycle bin...", persistent=True)
-            success = empty_recycle_bin()
-            show_thought("Recycle bin emptied!" if success else "Failed to empty", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak("Recycle bin emptied")
-        
-        elif tool == "ORGANIZE_FILES":
-            show_thought("Organizing files...", persistent=True)
-            success = organize_files(param)
-            show_thought("Files organized!" if success else "Organization failed", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak("Files organized")
-        
-        elif tool == "CHANGE_WALLPAPER":
-            show_thought("Changing wallpaper...", persistent=True)
-            success = change_wallpaper(param if param and param != "null" else None)
-            show_thought("Wallpaper changed!" if success else "Failed to change", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak("Wallpaper changed")
-        
-        elif tool == "SCAN_DLL_ERROR":
-            show_thought("Scanning for DLL errors...", persistent=True)
-            # DLL scanning functionality would go here
-            show_thought("DLL scan complete", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak("DLL scan complete")
-            success = True
-        
-        elif tool == "FIX_DLL_ERROR":
-            show_thought("Fixing DLL errors...", persistent=True)
-            # DLL fixing functionality would go here
-            show_thought("DLL fix attempted", persistent=False, duration=120)
-            if speak and voice_instance:
-                voice_instance.speak("DLL fix attempted")
-            success = True
+    result = run_tool(tool, param)
     
-    except Exception as e:
-        print(f"   [Execution Error] {e}")
-        success = False
-        show_thought(f"Error: {str(e)[:50]}", persistent=False, duration=180)
+    if result.thought:
+        show_thought(result.thought, persistent=False, duration=result.duration)
+    if speak and voice_instance and result.speech:
+        voice_instance.speak(result.speech)
     
-    # Update emotion
+    # Update emotion: hold 'thinking' a beat, then happy/sad, then idle, all on the
+    # overlay's animation timer so this worker is free as soon as the action is done
     if overlay_instance and tool != "CHAT":
-        time.sleep(1)
-        overlay_instance.set_emotion('happy' if success else 'sad')
-        time.sleep(1.5)
-        overlay_instance.set_emotion('idle')
+        overlay_instance.play_emotions(('thinking', 60), ('happy' if result.success else 'sad', 90), ('idle', 0))
+
+def execute_plan(graph, speak=False):
+    """Run a compound plan: independent steps side by side, then one merged summary"""
+    global overlay_instance, voice_instance
+    
+    if overlay_instance:
+        overlay_instance.set_emotion('thinking')
+    show_thought(f"Working on {len(graph.steps)} steps...", persistent=True)
+    
+    def on_step(step_result, done, total):
+        if done < total:
+            show_thought(f"{done}/{total} done - {step_result.result.thought or step_result.step.tool}", persistent=True)
+    
+    executor = PlanExecutor(lambda step, param: run_tool(step.tool, param), scheduler,
+                            priority=VOICE if speak else TYPED)
+    outcome = executor.execute(graph, on_step=on_step)
+    print(f"   [Planner] {outcome.stats()}")
+    
+    show_thought(outcome.summary, persistent=False, duration=300)
+    if speak and voice_instance and outcome.speech:
+        voice_instance.speak(outcome.speech)
+    if overlay_instance:
+        overlay_instance.play_emotions(('thinking', 60), ('happy' if outcome.success else 'sad', 90), ('idle', 0))
 
 def handle_voice_command():
-    """Handle voice input"""
+    """Handle voice input (runs on a scheduler worker at voice priority)"""
     global voice_instance, overlay_instance
     
-    if not command_lock.acquire(blocking=False):
-        print("   [Voice] Already processing...")
+    if not voice_instance:
+        return
+    
+    # A second double-click while the microphone is open has nothing to record
+    if not microphone_lock.acquire(blocking=False):
+        print("   [Voice] Already listening...")
         return
     
+    partials = PartialTranscript()
+    
     try:
-        if not voice_instance:
-            return
-        
         if overlay_instance:
             overlay_instance.set_listening(True)
         
         voice_instance.speak("Yes? I'm listening")
-        command = voice_instance.listen_once(timeout=8)
-        
+        command = voice_instance.listen_once(timeout=8, on_partial=partials.on_partial)
+    finally:
+        microphone_lock.release()
         if overlay_instance:
             overlay_instance.set_listening(False)
-        
+    
+    try:
         if command:
             print(f"\n   [Voice] {command}")
             process_command(command, speak=True)
         else:
             if overlay_instance:
-                overlay_instance.set_emotion('sad')
+                overlay_instance.play_emotions(('sad', 90), ('idle', 0))
             voice_instance.speak("I didn't catch that")
-            time.sleep(1.5)
-            if overlay_instance:
-                overlay_instance.set_emotion('idle')
-        
     finally:
-        command_lock.release()
+        speculator.discard(partials.key)
+
+class PartialTranscript:
+    """Partial voice transcripts: shown as they come and fed to the intent layer early"""
+    
+    _count = 0
+    
+    def __init__(self):
+        PartialTranscript._count += 1
+        self.key = f"voice:{PartialTranscript._count}"
+    
+    def on_partial(self, text):
+        if overlay_instance:
+            overlay_instance.show_thought(text, persistent=True)
+        # Lookups for the likely action start before the utterance ends; the final
+        # command's plan takes them if it matches
+        speculator.speculate(self.key, text=text)
+
+def submit_voice_command():
+    """Double-click / Shift+Enter: queue a voice command ahead of typed ones"""
+    scheduler.submit(handle_voice_command, priority=VOICE)
+
+def command_key(command):
+    """Scheduler key: a repeat of a still-queued command supersedes it"""
+    return "command:" + " ".join(command.lower().split())
+
+def show_backlog(depth):
+    """Backpressure feedback from the scheduler"""
+    print(f"   [Scheduler] {depth} command(s) waiting")
+    show_thought(f"Busy - {depth} command(s) queued", duration=120)
+
+def show_rate_wait(delay, depth):
+    """Rate limiter feedback: say so instead of silently stalling"""
+    print(f"   [RateLimit] Waiting {delay:.1f}s for a request slot ({depth} waiting)")
+    if delay >= 1:
+        show_thought(f"OnDemand is busy - retrying in {delay:.0f}s...", duration=int(delay * 60) + 60)
 
 def handle_text_command(command):
     """Handle text input"""
     if command and command.strip():
         print(f"\n   [Text] {command}")
-        threading.Thread(target=process_command, args=(command, False), daemon=True).start()
+        submit_async(process_command_async(command, speak=False))
+
+def local_plan(command):
+    """Plan from the local intent matcher, or None when the router has to decide"""
+    try:
+        plan = match_intent(command)
+    except Exception as e:
+        print(f"   [Intent Error] {e}")
+        return None
+    
+    if plan:
+        print(f"   [Intent] Local match ({plan['confidence']:.2f}): {plan['tool']}")
+    return plan
+
+def router_fallback(command):
+    """Plan without the Command Router: its last plan for this command (even stale), or a looser local guess"""
+    ondemand = get_ondemand()
+    plan = ondemand.plan_cache.get(command, allow_stale=True) if ondemand.plan_cache else None
+    
+    if not plan:
+        guess = get_intent_matcher().classify(command)
+        entry = tools.get(guess["tool"]) if guess else None
+        # Never act on a guess that deletes, kills or overwrites something
+        if guess and guess["confidence"] >= FALLBACK_MIN_CONFIDENCE and entry and not entry.destructive:
+            plan = guess
+    
+    if plan:
+        plan["source"] = "fallback"
+        print(f"   [Fallback] Router unavailable, using local plan: {plan['tool']}")
+    return plan
 
 def process_command(command, speak=False):
-    """Process a command using OnDemand agents"""
-    global overlay_instance, voice_instance
+    """Process a command using OnDemand agents (blocking, for worker threads)"""
+    global overlay_instance
     
     if not command or not command.strip():
         return
@@ -365,17 +463,111 @@ def process_command(command, speak=False):
     if overlay_instance:
         overlay_instance.set_emotion('thinking')
     
-    # Ask OnDemand Agent 1 (Command Router)
-    can_make_request()
-    plan = ask_ondemand(command)
-    update_request_tracker()
+    # Unambiguous commands skip the Command Router round trip
+    plan = local_plan(command)
+    if plan:
+        handle_plan(plan, speak=speak)
+        return
+    
+    # Ask OnDemand Agent 1 (Command Router), preparing the likely action meanwhile
+    speculator.speculate(command)
+    try:
+        early = EarlyDispatch(speak=speak)
+        plan = ask_ondemand(command, on_action=early.on_action, on_thought=early.on_thought)
+        if not plan and not early.dispatched:
+            plan = router_fallback(command)
+        
+        handle_plan(plan, speak=speak, early=early)
+    finally:
+        speculator.discard(command)
+
+async def run_scheduled(fn, *args, priority=TYPED, key=None):
+    """Run a blocking step on the command scheduler and await it from the event loop"""
+    job = scheduler.submit(fn, *args, priority=priority, key=key)
+    if job is None:
+        show_thought("Too many commands queued - try again in a moment", duration=180)
+        return
+    try:
+        await asyncio.wrap_future(job.future)
+    except asyncio.CancelledError:
+        print("   [Scheduler] Command superseded")
+
+async def process_command_async(command, speak=False):
+    """Process a command on the shared event loop; only the action itself leaves the loop"""
+    global overlay_instance
+    
+    if not command or not command.strip():
+        return
+    
+    if overlay_instance:
+        overlay_instance.set_emotion('thinking')
+    
+    try:
+        # Unambiguous commands skip the Command Router round trip
+        plan = local_plan(command)
+        if plan:
+            await run_scheduled(handle_plan, plan, speak, key=command_key(command))
+            return
+        
+        # Ask OnDemand Agent 1 (Command Router), preparing the likely action meanwhile
+        speculator.speculate(command)
+        early = EarlyDispatch(speak=speak)
+        plan = await ask_ondemand_async(command, on_action=early.on_action, on_thought=early.on_thought)
+        if not plan and not early.dispatched:
+            plan = router_fallback(command)
+        
+        # Actions block (subprocess, file IO), so run them on the command scheduler
+        await run_scheduled(handle_plan, plan, speak, early, key=command_key(command))
+    except Exception as e:
+        print(f"   [Error] {e}")
+    finally:
+        speculator.discard(command)
+
+class EarlyDispatch:
+    """Starts the action as soon as tool + parameter stream in, before the rest of the answer"""
+    
+    def __init__(self, speak=False):
+        self.speak = speak
+        self.tool = None
+        self.job = None
+        
+        # Fresh bubble for the streamed thought
+        if overlay_instance:
+            overlay_instance.show_thought("", persistent=True)
+    
+    @property
+    def dispatched(self):
+        return self.job is not None
+    
+    def on_action(self, fields):
+        # A compound plan only becomes runnable once all its steps have arrived
+        if fields.get("tool") == PLAN_TOOL:
+            return
+        self.tool = fields.get("tool", "CHAT")
+        print(f"   [OnDemand] Early dispatch: {self.tool}")
+        self.job = scheduler.submit(execute_action, self.tool, fields.get("parameter"), self.speak,
+                                    priority=VOICE if self.speak else TYPED)
+    
+    def on_thought(self, delta):
+        # Once a real action runs, its own progress messages own the bubble
+        if overlay_instance and (not self.dispatched or self.tool == "CHAT"):
+            overlay_instance.append_thought(delta)
+
+def handle_plan(plan, speak=False, early=None):
+    """Show, speak and execute the plan returned by the Command Router"""
+    global overlay_instance, voice_instance
+    
+    dispatched = early is not None and early.dispatched
+    
+    if not plan and dispatched:
+        # Action already ran from the stream; only the trailing text was unusable
+        scheduler.wait(early.job)
+        return
     
     if not plan:
         if overlay_instance:
-            overlay_instance.set_emotion('sad')
+            overlay_instance.play_emotions(('sad', 90), ('idle', 0))
             overlay_instance.show_thought("Sorry, I had trouble with that", persistent=False, duration=120)
-            time.sleep(1.5)
-            overlay_instance.set_emotion('idle')
         if speak and voice_instance:
             voice_instance.speak("Sorry, I had trouble with that")
         return
@@ -389,8 +581,24 @@ def process_command(command, speak=False):
     print(f"KORE: {thought}")
     print(f"   [OnDemand] Agent: {agent}, Tool: {tool}")
     
+    graph = None
+    if PlanGraph.is_compound(plan):
+        try:
+            graph = PlanGraph.from_plan(plan)
+            print(f"   [Planner] {len(graph.steps)} steps: {graph.steps}")
+        except PlanError as e:
+            print(f"   [Planner] Unusable plan: {e}")
+            handle_plan(None, speak=speak)
+            return
+    
+    # A newer copy of this command arrived while the router was thinking
+    job = scheduler.current_job()
+    if job is not None and job.cancelled:
+        print("   [Scheduler] Command superseded")
+        return
+    
     # Show thought bubble
-    if overlay_instance:
+    if overlay_instance and (not dispatched or tool == "CHAT"):
         overlay_instance.show_thought(thought, duration=180, persistent=False)
     
     # Speak the thought
@@ -401,8 +609,13 @@ def process_command(command, speak=False):
         if overlay_instance:
             overlay_instance.set_speaking(False)
     
-    # Execute the action
-    execute_action(tool, param, speak=speak)
+    # Execute the action (or wait for the one already started from the stream)
+    if dispatched:
+        scheduler.wait(early.job)
+    elif graph is not None:
+        execute_plan(graph, speak=speak)
+    else:
+        execute_action(tool, param, speak=speak)
 
 def logic_thread():
     """Console input loop"""
@@ -419,13 +632,16 @@ def logic_thread():
             command = input("YOU: ")
             if command.lower() in ['exit', 'quit', 'q']:
                 print("\n   [System] Shutting down...")
+                print(f"   [Speculate] {speculator.snapshot()}")
+                stop_async_loop()
+                scheduler.stop()
+                get_file_index().stop_watching()
                 ondemand = get_ondemand()
-                ondemand.close_session()
+                ondemand.close()
                 sys.exit()
             
             if command.strip():
-                time.sleep(0.3)
-                threading.Thread(target=process_command, args=(command, False), daemon=True).start()
+                submit_async(process_command_async(command, speak=False))
             
         except (EOFError, KeyboardInterrupt):
             break
@@ -435,12 +651,52 @@ def logic_thread():
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     
+    # One asyncio loop for all OnDemand traffic; share the Qt loop when qasync is available
+    try:
+        import qasync
+        qt_loop = qasync.QEventLoop(app)
+        asyncio.set_event_loop(qt_loop)
+        start_async_loop(qt_loop)
+        print("   [System] Async OnDemand client running on the Qt event loop")
+    except ImportError:
+        qt_loop = None
+        start_async_loop()
+        print("   [System] Async OnDemand client running on a background event loop")
+    app.aboutToQuit.connect(stop_async_loop)
+    
+    # Bounded command workers; tell the user when commands have to wait for one
+    scheduler.on_backlog = show_backlog
+    app.aboutToQuit.connect(scheduler.stop)
+    
     # Initialize OnDemand connection
     print("   [System] Initializing OnDemand...")
     ondemand = get_ondemand()
+    ondemand.limiter.on_wait = show_rate_wait
+    ondemand.warm_up()
+    
+    # Plans for tools registered as not cacheable are never replayed from the plan cache
+    if ondemand.plan_cache:
+        ondemand.plan_cache.never_cache.update(tools.uncacheable())
+    
+    # Background CPU/memory/IO sampler so SYSTEM_INFO never blocks on psutil
+    app.aboutToQuit.connect(get_system_sampler().stop)
+    
+    # Load the file-name index (crawled in the background the first time, then kept current)
+    file_index = get_file_index()
+    app.aboutToQuit.connect(file_index.stop_watching)
+    
+    # Finish file operations a crash interrupted, from the journal (no folder re-scan)
+    recover_file_operations("resume")
+    
+    # Installed-app catalog for open_application (built/refreshed in the background)
+    get_app_catalog()
     
-    # Create initial session
-    if not ondemand.create_session():
+    # Pre-create one session per configured agent and renew them before they expire;
+    # the router's session is the one the first command needs, so wait for that one
+    if ondemand.config.get("sessions", {}).get("prewarm", True):
+        ondemand.sessions.start()
+        app.aboutToQuit.connect(ondemand.sessions.stop)
+    if not ondemand.sessions.get():
         print("   [Warning] Failed to create OnDemand session - check your config!")
         print("   [Warning] Edit kore_ondemand_config.json with your API key and agent IDs")
     
@@ -460,8 +716,8 @@ if __name__ == "__main__":
     overlay = KoreOverlay()
     overlay.setGeometry(0, 0, screen_size.width(), screen_size.height())
     
-    overlay.double_click.connect(lambda: threading.Thread(target=handle_voice_command, daemon=True).start())
-    overlay.voice_hotkey.connect(lambda: threading.Thread(target=handle_voice_command, daemon=True).start())
+    overlay.double_click.connect(submit_voice_command)
+    overlay.voice_hotkey.connect(submit_voice_command)
     overlay.text_command.connect(handle_text_command)
     
     overlay.show()
@@ -473,4 +729,8 @@ if __name__ == "__main__":
     thread = threading.Thread(target=logic_thread, daemon=True)
     thread.start()
     
+    if qt_loop is not None:
+        with qt_loop:
+            qt_loop.run_forever()
+        sys.exit(0)
     sys.exit(app.exec())
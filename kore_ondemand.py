@@ -3,13 +3,29 @@ Kore OnDemand Integration Module
 Handles all communication with OnDemand API and agent routing
 """
 
+import asyncio
+import concurrent.futures
 import json
 import os
+import threading
 import requests
 import uuid
-from typing import Dict, Optional, List
+from requests.adapters import HTTPAdapter
+from typing import AsyncIterator, Callable, Dict, Optional, List
 from datetime import datetime
 
+from kore_cache import PlanCache
+from kore_client import parse_sse_line
+from kore_ratelimit import THROTTLE_STATUSES, TokenBucket
+from kore_resilience import CircuitOpenError, ResiliencePolicy
+from kore_sessions import ROUTER_AGENT, SessionPool, is_configured
+from kore_plan_stream import StreamingPlanParser
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 class KoreOnDemand:
     """Main OnDemand integration class for Kore"""
     
@@ -18,17 +34,35 @@ class KoreOnDemand:
         self.config_path = config_path
         self.config = self.load_config()
         
-        # OnDemand API endpoints
-        self.base_url = "https://api.on-demand.io/chat/v1"
-        self.media_base_url = "https://api.on-demand.io/media/v1"
+        # OnDemand API endpoints (overridable for local testing)
+        self.base_url = self.config.get("base_url", "https://api.on-demand.io/chat/v1")
+        self.media_base_url = self.config.get("media_base_url", "https://api.on-demand.io/media/v1")
+        
+        # Pooled keep-alive transport shared by every call
+        transport = self.config.get("transport", {})
+        self.pool_size = transport.get("pool_size", 10)
+        self.keep_alive = transport.get("keep_alive", True)
+        self.http = self._build_transport()
+        
+        # Router plans for repeated commands
+        self.plan_cache = self._build_plan_cache()
         
-        # Session management
+        # One token bucket for every OnDemand call made through this client, sync or async
+        rate_limit = self.config.get("rate_limit", {})
+        self.limiter = TokenBucket(
+            rate=rate_limit.get("rate", 2.0),
+            burst=rate_limit.get("burst", 4),
+            max_backoff=rate_limit.get("max_backoff", 30)
+        )
+        self.throttle_retries = rate_limit.get("throttle_retries", 2)
+        
+        # Timeouts, retries for idempotent calls and a circuit breaker
+        self.resilience = ResiliencePolicy.from_config(self.config.get("resilience", {}))
+        
+        # Session management: one warm session per configured agent, renewed before expiry
         self.current_session_id = None
         self.external_user_id = self.config.get("external_user_id") or str(uuid.uuid4())
-        
-        # Rate limiting
-        self.last_request_time = None
-        self.min_request_interval = 0.5
+        self.sessions = SessionPool.from_config(self.create_session, self.config)
         
         print(f"   [OnDemand] Initialized with User ID: {self.external_user_id[:8]}...")
     
@@ -67,7 +101,39 @@ class KoreOnDemand:
                 "tool3_system_query": "TOOL_3_ID"
             },
             "response_mode": "stream",
-            "temperature": 0.7
+            "temperature": 0.7,
+            "transport": {
+                "pool_size": 10,
+                "keep_alive": True,
+                "warmup": True
+            },
+            "plan_cache": {
+                "enabled": True,
+                "path": "kore_plan_cache.json",
+                "max_entries": 256,
+                "ttl_seconds": 86400
+            },
+            "rate_limit": {
+                "rate": 2.0,
+                "burst": 4,
+                "max_backoff": 30,
+                "throttle_retries": 2
+            },
+            "resilience": {
+                "timeouts": {
+                    "session": [3.05, 10],
+                    "query": [3.05, 30],
+                    "upload": [3.05, 60]
+                },
+                "retries": {"attempts": 3, "base_delay": 0.25, "max_delay": 4},
+                "breaker": {"failure_threshold": 5, "reset_timeout": 30}
+            },
+            "sessions": {
+                "prewarm": True,
+                "per_agent": 1,
+                "ttl_seconds": 1800,
+                "refresh_margin": 120
+            }
         }
     
     def save_config(self):
@@ -79,19 +145,93 @@ class KoreOnDemand:
         except Exception as e:
             print(f"   [OnDemand Error] Failed to save config: {e}")
     
-    def create_session(self) -> Optional[str]:
-        """Create a new OnDemand chat session"""
-        url = f"{self.base_url}/sessions"
-        
-        # Get Agent 1 (Command Router) ID - this is the main entry point
-        agent1_id = self.config["agents"].get("agent1_command_router")
-        
-        if not agent1_id or agent1_id == "AGENT_1_ID":
-            print("   [OnDemand Error] Agent 1 ID not configured!")
+    def _build_transport(self) -> requests.Session:
+        """
+        Build the long-lived HTTP transport.
+        requests speaks HTTP/1.1 only; swapping in an HTTP/2 client only needs this method changed.
+        """
+        http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=2,  # chat + media hosts
+            pool_maxsize=self.pool_size,
+            pool_block=False
+        )
+        http.mount("https://", adapter)
+        http.mount("http://", adapter)
+        http.headers.update({
+            "apikey": self.config.get("api_key", ""),
+            "Connection": "keep-alive" if self.keep_alive else "close"
+        })
+        return http
+    
+    def _build_plan_cache(self) -> Optional[PlanCache]:
+        """Plan cache from the "plan_cache" config section (None when disabled)"""
+        settings = self.config.get("plan_cache", {})
+        if not settings.get("enabled", True):
             return None
+        return PlanCache(
+            path=settings.get("path", "kore_plan_cache.json"),
+            max_entries=settings.get("max_entries", 256),
+            ttl=settings.get("ttl_seconds", 86400)
+        )
+    
+    def warm_up(self) -> bool:
+        """Open pooled connections ahead of the first command (TCP + TLS handshake)"""
+        if not self.config.get("transport", {}).get("warmup", True):
+            return False
+        
+        warmed = False
+        origins = {"/".join(url.split("/", 3)[:3]) for url in (self.base_url, self.media_base_url)}
+        for origin in origins:
+            try:
+                self.http.head(origin, timeout=self.resilience.timeout("warmup"))
+                warmed = True
+            except Exception as e:
+                print(f"   [OnDemand Warning] Warm-up failed for {origin}: {e}")
         
-        body = {
-            "agentIds": [agent1_id],  # Start with Command Router
+        if warmed:
+            print(f"   [OnDemand] Connection pool warmed ({self.pool_size} slots)")
+        return warmed
+    
+    def _post(self, url: str, kind: str, **kwargs) -> requests.Response:
+        """
+        POST with the timeouts, retries and circuit breaker for this call kind
+        ("session", "query", "upload"); raises CircuitOpenError while OnDemand is down.
+        A streamed response is only counted once its body has been read.
+        """
+        return self.resilience.call(kind, lambda timeout: self._send(url, timeout, **kwargs),
+                                    streamed=kwargs.get("stream", False))
+    
+    def _send(self, url: str, timeout, **kwargs) -> requests.Response:
+        """
+        One POST through the shared rate limiter. A 429/503 pauses the limiter for the
+        server's Retry-After and the request is sent again (the server did not run it).
+        """
+        for attempt in range(self.throttle_retries + 1):
+            self.limiter.acquire()
+            response = self.http.post(url, timeout=timeout, **kwargs)
+            if response.status_code not in THROTTLE_STATUSES:
+                self.limiter.succeeded()
+                return response
+            self.limiter.throttled(response.headers.get("Retry-After"))
+            if attempt < self.throttle_retries:
+                response.close()
+                # Rewind uploads so the retry sends the whole file again
+                for _, file_tuple in (kwargs.get("files") or {}).items():
+                    file_tuple[1].seek(0)
+        return response
+    
+    def _headers(self) -> Dict:
+        """JSON request headers"""
+        return {
+            "apikey": self.config.get("api_key"),
+            "Content-Type": "application/json"
+        }
+    
+    def _session_body(self, agent_id: str) -> Dict:
+        """Request body for creating a chat session"""
+        return {
+            "agentIds": [agent_id],  # Start with Command Router
             "externalUserId": self.external_user_id,
             "contextMetadata": [
                 {"key": "userId", "value": "kore_user"},
@@ -99,20 +239,54 @@ class KoreOnDemand:
                 {"key": "timestamp", "value": str(datetime.now())}
             ]
         }
+    
+    def _query_body(self, user_query: str, agent_key: str = ROUTER_AGENT) -> Dict:
+        """Request body for querying Agent 1 (Command Router), or another configured agent"""
+        agent_id = self.config["agents"].get(agent_key)
         
-        headers = {
-            "apikey": self.config.get("api_key"),
-            "Content-Type": "application/json"
+        return {
+            "endpointId": "predefined-xai-grok4.1-fast",  # Agent 1 uses Grok
+            "query": user_query,
+            "agentIds": [agent_id],
+            "responseMode": self.config.get("response_mode", "stream"),
+            "reasoningMode": "grok-4-fast",
+            "modelConfigs": {
+                "temperature": self.config.get("temperature", 0.7),
+                "topP": 1,
+                "maxTokens": 500,
+                "presencePenalty": 0,
+                "frequencyPenalty": 0
+            }
         }
+    
+    # One SSE parser for Kore and the agent scripts
+    _parse_sse_line = staticmethod(parse_sse_line)
+    
+    def create_session(self, agent_key: str = ROUTER_AGENT) -> Optional[str]:
+        """
+        Create a new OnDemand chat session for one agent (Agent 1, the Command Router,
+        by default). Callers normally take a pooled one from self.sessions instead.
+        """
+        url = f"{self.base_url}/sessions"
+        
+        agent_id = self.config["agents"].get(agent_key)
+        
+        if not is_configured(agent_id):
+            print(f"   [OnDemand Error] {agent_key} ID not configured!")
+            return None
+        
+        body = self._session_body(agent_id)
+        headers = self._headers()
         
         try:
-            response = requests.post(url, json=body, headers=headers)
+            response = self._post(url, "session", json=body, headers=headers)
             
             if response.status_code == 201:
                 session_data = response.json()
                 session_id = session_data["data"]["id"]
-                self.current_session_id = session_id
-                print(f"   [OnDemand] Session created: {session_id[:8]}...")
+                if agent_key == ROUTER_AGENT:
+                    self.current_session_id = session_id
+                print(f"   [OnDemand] Session created for {agent_key}: {session_id[:8]}...")
                 return session_id
             else:
                 print(f"   [OnDemand Error] Session creation failed: {response.status_code}")
@@ -123,97 +297,168 @@ class KoreOnDemand:
             print(f"   [OnDemand Error] {e}")
             return None
     
-    def query_agent(self, user_query: str, session_id: Optional[str] = None) -> Optional[Dict]:
+    def query_agent(self, user_query: str, session_id: Optional[str] = None,
+                    on_action: Optional[Callable[[Dict], None]] = None,
+                    on_thought: Optional[Callable[[str], None]] = None) -> Optional[Dict]:
         """
         Send query to OnDemand Agent 1 (Command Router)
         Returns parsed JSON response with thought, agent, tool, parameter
+        on_action fires as soon as tool + parameter have streamed in, on_thought per thought token
         """
+        if self.plan_cache:
+            cached = self.plan_cache.get(user_query)
+            if cached:
+                return cached
+        
         if not session_id:
-            session_id = self.current_session_id or self.create_session()
+            session_id = self.sessions.get(ROUTER_AGENT)
         
         if not session_id:
             return None
         
         url = f"{self.base_url}/sessions/{session_id}/query"
-        
-        # Get Agent 1 ID (Command Router)
-        agent1_id = self.config["agents"].get("agent1_command_router")
-        
-        body = {
-            "endpointId": "predefined-xai-grok4.1-fast",  # Agent 1 uses Grok
-            "query": user_query,
-            "agentIds": [agent1_id],
-            "responseMode": self.config.get("response_mode", "stream"),
-            "reasoningMode": "grok-4-fast",
-            "modelConfigs": {
-                "temperature": self.config.get("temperature", 0.7),
-                "topP": 1,
-                "maxTokens": 500,
-                "presencePenalty": 0,
-                "frequencyPenalty": 0
-            }
-        }
-        
-        headers = {
-            "apikey": self.config.get("api_key"),
-            "Content-Type": "application/json"
-        }
+        body = self._query_body(user_query)
+        headers = self._headers()
         
         try:
-            response = requests.post(
+            response = self._post(
                 url, 
+                "query",
                 json=body, 
                 headers=headers, 
                 stream=(self.config.get("response_mode") == "stream")
             )
             
+            if response.status_code == 404:
+                # Session expired on the server; the next query gets a fresh one
+                response.close()
+                self.sessions.invalidate(session_id)
+                print(f"   [OnDemand] Session {session_id[:8]}... expired")
+                return None
+            if response.status_code != 200:
+                self._release(response)
+                print(f"   [OnDemand Error] Query failed: {response.status_code}")
+                return None
+            
+            parser = self._plan_parser(on_action, on_thought)
             if self.config.get("response_mode") == "stream":
-                return self._handle_stream_response(response)
+                plan = self._handle_stream_response(response, parser)
             else:
-                return self._handle_sync_response(response)
-                
+                plan = self._handle_sync_response(response, parser)
+            
+            if self.plan_cache:
+                self.plan_cache.put(user_query, plan)
+            return plan
+        
+        except CircuitOpenError as e:
+            print(f"   [OnDemand] {e}")
+            return None
         except Exception as e:
             print(f"   [OnDemand Error] Query failed: {e}")
             return None
     
-    def _handle_stream_response(self, response) -> Optional[Dict]:
+    @staticmethod
+    def _plan_parser(on_action, on_thought) -> Optional[StreamingPlanParser]:
+        """Incremental parser for early dispatch, only when someone listens"""
+        if on_action is None and on_thought is None:
+            return None
+        return StreamingPlanParser(on_action=on_action, on_thought=on_thought)
+    
+    def ask_agent(self, agent_key: str, question: str) -> Optional[str]:
+        """
+        Ask one OnDemand specialist ("agent3_system_monitor", ...) on a pooled session
+        Returns the answer text as is (specialists answer in prose, not router JSON)
+        """
+        if not is_configured(self.config["agents"].get(agent_key)):
+            print(f"   [OnDemand Error] {agent_key} ID not configured!")
+            return None
+        
+        session_id = self.sessions.get(agent_key)
+        if not session_id:
+            return None
+        
+        url = f"{self.base_url}/sessions/{session_id}/query"
+        streamed = self.config.get("response_mode") == "stream"
+        
+        try:
+            response = self._post(url, "query", json=self._query_body(question, agent_key),
+                                  headers=self._headers(), stream=streamed)
+            
+            if response.status_code == 404:
+                response.close()
+                self.sessions.invalidate(session_id)
+                print(f"   [OnDemand] Session {session_id[:8]}... expired")
+                return None
+            if response.status_code != 200:
+                self._release(response)
+                print(f"   [OnDemand Error] {agent_key} query failed: {response.status_code}")
+                return None
+            
+            if streamed:
+                return self._read_stream_answer(response)
+            return response.json().get("data", {}).get("answer", "")
+        
+        except CircuitOpenError as e:
+            print(f"   [OnDemand] {e}")
+            return None
+        except Exception as e:
+            print(f"   [OnDemand Error] {agent_key} query failed: {e}")
+            return None
+    
+    def _handle_stream_response(self, response, parser: Optional[StreamingPlanParser] = None) -> Optional[Dict]:
         """Handle streaming response from OnDemand"""
+        full_answer = self._read_stream_answer(response, parser)
+        if full_answer is None:
+            return None
+        
+        # Parse the final answer as JSON
+        return self._parse_agent_response(full_answer)
+    
+    def _read_stream_answer(self, response, parser: Optional[StreamingPlanParser] = None) -> Optional[str]:
+        """Concatenated fulfillment answer of an SSE response (None if the stream broke)"""
         full_answer = ""
+        done = False
         
         try:
             for line in response.iter_lines():
-                if line:
-                    line_str = line.decode('utf-8').strip()
+                # Read to the end of the body (not just [DONE]) so the connection can be reused
+                if line and not done:
+                    event = self._parse_sse_line(line.decode('utf-8').strip())
                     
-                    if line_str.startswith("data:"):
-                        data_str = line_str[len("data:"):].strip()
-                        
-                        if data_str == "[DONE]":
-                            break
-                        
-                        try:
-                            event = json.loads(data_str)
-                            
-                            if event.get("eventType") == "fulfillment":
-                                if "answer" in event:
-                                    full_answer += event["answer"]
-                                    
-                        except json.JSONDecodeError:
-                            continue
-            
-            # Parse the final answer as JSON
-            return self._parse_agent_response(full_answer)
+                    if event == "[DONE]":
+                        done = True
+                    elif event and event.get("eventType") == "fulfillment":
+                        if "answer" in event:
+                            full_answer += event["answer"]
+                            if parser:
+                                parser.feed(event["answer"])
+            self.resilience.stream_done(True)
+            return full_answer
             
         except Exception as e:
+            # A stalled or cut stream is a transport failure, even after a 200
+            self.resilience.stream_done(False)
             print(f"   [OnDemand Error] Stream handling failed: {e}")
             return None
+        finally:
+            self._release(response)
     
-    def _handle_sync_response(self, response) -> Optional[Dict]:
+    def _release(self, response):
+        """Make sure a streamed response gives its connection back to the pool"""
+        try:
+            response.raw.drain_conn()
+            response.raw.release_conn()
+        except Exception:
+            response.close()
+    
+    def _handle_sync_response(self, response, parser: Optional[StreamingPlanParser] = None) -> Optional[Dict]:
         """Handle synchronous response from OnDemand"""
         try:
             if response.status_code == 200:
                 data = response.json()
                 answer = data.get("data", {}).get("answer", "")
+                if parser:
+                    parser.feed(answer)
                 return self._parse_agent_response(answer)
             else:
                 print(f"   [OnDemand Error] Sync response failed: {response.status_code}")
@@ -298,7 +543,7 @@ class KoreOnDemand:
                     'agents': [agent6_id]
                 }
                 
-                response = requests.post(url, headers=headers, files=files, data=data)
+                response = self._post(url, "upload", headers=headers, files=files, data=data)
                 
                 if response.status_code in [200, 201]:
                     media_data = response.json()
@@ -313,10 +558,255 @@ class KoreOnDemand:
             return None
     
     def close_session(self):
-        """Close current session"""
+        """Close current session and forget pooled ones"""
+        self.sessions.clear()
         if self.current_session_id:
             print(f"   [OnDemand] Session closed: {self.current_session_id[:8]}...")
             self.current_session_id = None
+    
+    def close(self):
+        """Close sessions, stop renewing them and release pooled connections"""
+        self.sessions.stop()
+        self.close_session()
+        self.http.close()
+
+
+class AsyncKoreOnDemand:
+    """
+    asyncio OnDemand client sharing config and session with a KoreOnDemand
+    All coroutines must run on the shared Kore event loop (see get_async_loop)
+    """
+    
+    def __init__(self, ondemand: Optional[KoreOnDemand] = None):
+        self.ondemand = ondemand or get_ondemand()
+        self.http = None  # aiohttp.ClientSession, created on the loop
+        self._creating: Dict[str, asyncio.Future] = {}  # agent key -> session being created
+    
+    @property
+    def current_session_id(self) -> Optional[str]:
+        return self.ondemand.current_session_id
+    
+    @current_session_id.setter
+    def current_session_id(self, session_id: Optional[str]):
+        self.ondemand.current_session_id = session_id
+    
+    def _get_http(self):
+        """Create the pooled aiohttp session lazily (must happen on the loop)"""
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is not installed (pip install aiohttp)")
+        
+        if self.http is None or self.http.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.ondemand.pool_size,
+                force_close=not self.ondemand.keep_alive
+            )
+            self.http = aiohttp.ClientSession(connector=connector)
+        return self.http
+    
+    async def _post(self, url: str, kind: str, form: Optional[Callable] = None,
+                    streamed: bool = False, **kwargs):
+        """
+        POST with the shared timeouts, retries and circuit breaker for this call kind.
+        `form` builds a fresh FormData per attempt, since aiohttp can only send one once.
+        A streamed call reports its outcome via resilience.stream_done(). Use as
+        `async with await ...`.
+        """
+        return await self.ondemand.resilience.call_async(
+            kind, lambda timeout: self._send(url, timeout, form, **kwargs), streamed=streamed)
+    
+    async def _send(self, url: str, timeout, form: Optional[Callable] = None, **kwargs):
+        """One POST through the shared rate limiter; 429/503 are retried after Retry-After"""
+        http = self._get_http()
+        retries = self.ondemand.throttle_retries
+        # sock_read bounds the gap between chunks, so a stalled stream times out too
+        client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout[0], sock_read=timeout[1])
+        for attempt in range(retries + 1):
+            await self.ondemand.limiter.acquire_async()
+            if form is not None:
+                kwargs["data"] = form()
+            response = await http.post(url, timeout=client_timeout, **kwargs)
+            if response.status not in THROTTLE_STATUSES:
+                self.ondemand.limiter.succeeded()
+                return response
+            self.ondemand.limiter.throttled(response.headers.get("Retry-After"))
+            if attempt < retries:
+                response.release()
+        return response
+    
+    async def create_session(self, agent_key: str = ROUTER_AGENT) -> Optional[str]:
+        """Create a new OnDemand chat session for one agent and add it to the shared pool"""
+        url = f"{self.ondemand.base_url}/sessions"
+        
+        agent_id = self.ondemand.config["agents"].get(agent_key)
+        if not is_configured(agent_id):
+            print(f"   [OnDemand Error] {agent_key} ID not configured!")
+            return None
+        
+        try:
+            async with await self._post(url, "session", json=self.ondemand._session_body(agent_id),
+                                        headers=self.ondemand._headers()) as response:
+                if response.status == 201:
+                    session_data = await response.json()
+                    session_id = session_data["data"]["id"]
+                    if agent_key == ROUTER_AGENT:
+                        self.current_session_id = session_id
+                    self.ondemand.sessions.add(agent_key, session_id)
+                    print(f"   [OnDemand] Session created for {agent_key}: {session_id[:8]}...")
+                    return session_id
+                else:
+                    print(f"   [OnDemand Error] Session creation failed: {response.status}")
+                    print(f"   Response: {await response.text()}")
+                    return None
+                    
+        except Exception as e:
+            print(f"   [OnDemand Error] {e}")
+            return None
+    
+    async def pooled_session(self, agent_key: str = ROUTER_AGENT) -> Optional[str]:
+        """A pooled session, or one created once for every coroutine that found the pool cold"""
+        session_id = self.ondemand.sessions.peek(agent_key)
+        if session_id:
+            return session_id
+        creating = self._creating.get(agent_key)
+        if creating is None:
+            creating = asyncio.ensure_future(self.create_session(agent_key))
+            self._creating[agent_key] = creating
+            creating.add_done_callback(lambda _: self._creating.pop(agent_key, None))
+        # One caller being cancelled must not cancel the creation the others wait on
+        return await asyncio.shield(creating)
+    
+    async def query_agent(self, user_query: str, session_id: Optional[str] = None,
+                          on_action: Optional[Callable[[Dict], None]] = None,
+                          on_thought: Optional[Callable[[str], None]] = None) -> Optional[Dict]:
+        """
+        Send query to OnDemand Agent 1 (Command Router)
+        Returns parsed JSON response with thought, agent, tool, parameter
+        on_action fires as soon as tool + parameter have streamed in, on_thought per thought token
+        """
+        plan_cache = self.ondemand.plan_cache
+        if plan_cache:
+            cached = plan_cache.get(user_query)
+            if cached:
+                return cached
+        
+        if not session_id:
+            # Pooled sessions are created off the loop; only a cold pool costs a round trip here
+            session_id = await self.pooled_session()
+        
+        if not session_id:
+            return None
+        
+        url = f"{self.ondemand.base_url}/sessions/{session_id}/query"
+        
+        try:
+            streamed = self.ondemand.config.get("response_mode") == "stream"
+            async with await self._post(url, "query", streamed=streamed,
+                                        json=self.ondemand._query_body(user_query),
+                                        headers=self.ondemand._headers()) as response:
+                if response.status == 404:
+                    # Session expired on the server; the next query gets a fresh one
+                    self.ondemand.sessions.invalidate(session_id)
+                    print(f"   [OnDemand] Session {session_id[:8]}... expired")
+                    return None
+                if response.status != 200:
+                    print(f"   [OnDemand Error] Query failed: {response.status}")
+                    return None
+                
+                parser = self.ondemand._plan_parser(on_action, on_thought)
+                
+                if streamed:
+                    full_answer = ""
+                    try:
+                        async for event in self.stream_events(response):
+                            if event.get("eventType") == "fulfillment" and "answer" in event:
+                                full_answer += event["answer"]
+                                if parser:
+                                    parser.feed(event["answer"])
+                    except Exception:
+                        # A stalled or cut stream is a transport failure, even after a 200
+                        self.ondemand.resilience.stream_done(False)
+                        raise
+                    self.ondemand.resilience.stream_done(True)
+                    plan = self.ondemand._parse_agent_response(full_answer)
+                else:
+                    data = await response.json()
+                    answer = data.get("data", {}).get("answer", "")
+                    if parser:
+                        parser.feed(answer)
+                    plan = self.ondemand._parse_agent_response(answer)
+            
+            if plan_cache:
+                plan_cache.put(user_query, plan)
+            return plan
+        
+        except CircuitOpenError as e:
+            print(f"   [OnDemand] {e}")
+            return None
+        except Exception as e:
+            print(f"   [OnDemand Error] Query failed: {e}")
+            return None
+    
+    async def stream_events(self, response) -> AsyncIterator[Dict]:
+        """Async iteration over the SSE `data:` events of a streamed response, up to [DONE]"""
+        done = False
+        # Read to the end of the body (not just [DONE]) so the connection can be reused
+        async for line in response.content:
+            line_str = line.decode('utf-8').strip()
+            if not line_str or done:
+                continue
+            
+            event = self.ondemand._parse_sse_line(line_str)
+            if event == "[DONE]":
+                done = True
+            elif event:
+                yield event
+    
+    async def upload_screenshot(self, screenshot_path: str, session_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Upload screenshot to OnDemand for Visual AI agent analysis
+        """
+        if not session_id:
+            session_id = self.current_session_id
+        
+        if not session_id or not os.path.exists(screenshot_path):
+            print(f"   [OnDemand Error] Invalid session or screenshot path")
+            return None
+        
+        url = f"{self.ondemand.media_base_url}/public/file/raw"
+        agent6_id = self.ondemand.config["agents"].get("agent6_visual_ai")
+        headers = {"apikey": self.ondemand.config.get("api_key")}
+        
+        try:
+            with open(screenshot_path, 'rb') as f:
+                def build_form():
+                    f.seek(0)
+                    form = aiohttp.FormData()
+                    form.add_field('file', f, filename=os.path.basename(screenshot_path))
+                    form.add_field('createdBy', 'kore')
+                    form.add_field('updatedBy', 'kore')
+                    form.add_field('name', os.path.basename(screenshot_path))
+                    form.add_field('responseMode', 'stream')
+                    form.add_field('sessionId', session_id)
+                    form.add_field('agents', agent6_id)
+                    return form
+                
+                async with await self._post(url, "upload", form=build_form, headers=headers) as response:
+                    if response.status in [200, 201]:
+                        media_data = await response.json()
+                        print(f"   [OnDemand] Screenshot uploaded: {media_data['data']['id'][:8]}...")
+                        return media_data['data']
+                    else:
+                        print(f"   [OnDemand Error] Upload failed: {response.status}")
+                        return None
+                        
+        except Exception as e:
+            print(f"   [OnDemand Error] Screenshot upload failed: {e}")
+            return None
+    
+    async def close(self):
+        """Release pooled connections"""
+        if self.http is not None and not self.http.closed:
+            await self.http.close()
 
 
 # Global instance
@@ -330,13 +820,92 @@ def get_ondemand() -> KoreOnDemand:
     return _ondemand_instance
 
 
-def ask_ondemand(user_input: str) -> Optional[Dict]:
+# Shared event loop for all async OnDemand calls
+_async_loop = None
+_async_loop_thread = None
+_async_ondemand_instance = None
+
+def start_async_loop(loop: Optional[asyncio.AbstractEventLoop] = None) -> asyncio.AbstractEventLoop:
+    """
+    Start the single event loop used by AsyncKoreOnDemand
+    Pass a Qt-integrated loop (e.g. qasync.QEventLoop) to share the GUI thread;
+    otherwise one background thread runs a plain asyncio loop.
     """
-    Main function to ask OnDemand agents
+    global _async_loop, _async_loop_thread
+    if _async_loop is not None:
+        return _async_loop
+    
+    if loop is not None:
+        _async_loop = loop
+        return _async_loop
+    
+    _async_loop = asyncio.new_event_loop()
+    _async_loop_thread = threading.Thread(target=_async_loop.run_forever, name="kore-async", daemon=True)
+    _async_loop_thread.start()
+    return _async_loop
+
+def get_async_loop() -> asyncio.AbstractEventLoop:
+    """Get (starting if needed) the shared event loop"""
+    return _async_loop or start_async_loop()
+
+def submit_async(coro) -> concurrent.futures.Future:
+    """Schedule a coroutine on the shared loop from any thread"""
+    return asyncio.run_coroutine_threadsafe(coro, get_async_loop())
+
+def stop_async_loop():
+    """Close async connections and stop the background loop"""
+    global _async_loop, _async_loop_thread
+    if _async_loop is None:
+        return
+    
+    if _async_ondemand_instance is not None and _async_loop.is_running():
+        if _on_loop_thread(_async_loop):
+            # Called from the loop itself (e.g. Qt aboutToQuit under qasync)
+            _async_loop.create_task(_async_ondemand_instance.close())
+        else:
+            try:
+                submit_async(_async_ondemand_instance.close()).result(timeout=5)
+            except Exception as e:
+                print(f"   [OnDemand Warning] Async close failed: {e}")
+    
+    if _async_loop_thread is not None:
+        _async_loop.call_soon_threadsafe(_async_loop.stop)
+        _async_loop_thread.join(timeout=5)
+        _async_loop.close()
+    
+    _async_loop = None
+    _async_loop_thread = None
+
+def get_async_ondemand() -> AsyncKoreOnDemand:
+    """Get or create global async OnDemand instance"""
+    global _async_ondemand_instance
+    if _async_ondemand_instance is None:
+        _async_ondemand_instance = AsyncKoreOnDemand(get_ondemand())
+    return _async_ondemand_instance
+
+
+def ask_ondemand(user_input: str, on_action=None, on_thought=None) -> Optional[Dict]:
+    """
+    Main function to ask OnDemand agents (blocking facade over the async client)
     Returns: {"thought": str, "agent": str, "tool": str, "parameter": any}
     """
-    ondemand = get_ondemand()
-    return ondemand.query_agent(user_input)
+    if aiohttp is None:
+        return get_ondemand().query_agent(user_input, on_action=on_action, on_thought=on_thought)
+    
+    loop = get_async_loop()
+    if loop.is_running() and _on_loop_thread(loop):
+        raise RuntimeError("ask_ondemand() would block the event loop - await ask_ondemand_async() instead")
+    return submit_async(ask_ondemand_async(user_input, on_action, on_thought)).result()
+
+async def ask_ondemand_async(user_input: str, on_action=None, on_thought=None) -> Optional[Dict]:
+    """Async version of ask_ondemand for callers already on the shared loop"""
+    return await get_async_ondemand().query_agent(user_input, on_action=on_action, on_thought=on_thought)
+
+def _on_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
 
 
 # Test function
@@ -0,0 +1,153 @@
+"""
+Kore Folder Organizer
+Planner/executor for organize_files: one scandir pass builds a move plan with
+collision-free destination names, then a thread pool carries out the moves
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+# File type categories with extensions
+FILE_CATEGORIES = {
+    "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".ico", ".webp", ".tiff", ".raw"],
+    "Videos": [".mp4", ".avi", ".mkv", ".mov", ".wmv", ".flv", ".webm", ".m4v", ".mpeg", ".mpg"],
+    "Audio": [".mp3", ".wav", ".flac", ".aac", ".ogg", ".wma", ".m4a", ".opus"],
+    "Documents": [".pdf", ".doc", ".docx", ".txt", ".rtf", ".odt", ".tex"],
+    "Spreadsheets": [".xls", ".xlsx", ".csv", ".ods"],
+    "Presentations": [".ppt", ".pptx", ".odp"],
+    "Archives": [".zip", ".rar", ".7z", ".tar", ".gz", ".bz2", ".xz"],
+    "Code": [".py", ".js", ".html", ".css", ".java", ".cpp", ".c", ".h", ".php", ".rb", ".go", ".rs"],
+    "Executables": [".exe", ".msi", ".bat", ".sh", ".app", ".dmg"],
+    "Others": []  # Catch-all for unrecognized types
+}
+
+# Extension -> category, built once instead of scanning every list per file
+EXTENSION_CATEGORY = {ext: category for category, extensions in FILE_CATEGORIES.items() for ext in extensions}
+
+DEFAULT_WORKERS = 8
+BATCH_SIZE = 256         # moves per pool task; keeps scheduling overhead per file small
+PROGRESS_INTERVAL = 0.25 # seconds between progress callbacks
+
+
+class OrganizePlan:
+    """Everything organize needs to do, computed before touching the disk"""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.moves = []         # (source, destination)
+        self.folders = []       # category folders that must exist
+        self.counts = {}        # category -> files planned
+        self.scanned = 0
+        self.plan_ms = 0.0
+
+    def __len__(self):
+        return len(self.moves)
+
+
+def plan_organize(folder: str) -> OrganizePlan:
+    """
+    One os.scandir pass over `folder`: pick a category per file by extension and
+    a destination name that collides neither with files already in the category
+    folder nor with other planned moves (report.pdf -> report_1.pdf, ...)
+    """
+    start = time.perf_counter()
+    plan = OrganizePlan(folder)
+
+    by_category = {}
+    existing_dirs = set()
+    with os.scandir(folder) as iterator:
+        for entry in iterator:
+            plan.scanned += 1
+            try:
+                if entry.is_dir():
+                    existing_dirs.add(entry.name.lower())
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            ext = os.path.splitext(entry.name)[1].lower()
+            if not ext:
+                continue    # Files without an extension stay where they are
+            by_category.setdefault(EXTENSION_CATEGORY.get(ext, "Others"), []).append(entry.name)
+
+    for category, names in by_category.items():
+        target_dir = os.path.join(folder, category)
+        # Windows file names are case-insensitive, so compare lowercased
+        taken = set()
+        if category.lower() in existing_dirs:
+            try:
+                taken = {name.lower() for name in os.listdir(target_dir)}
+            except OSError:
+                pass
+        else:
+            plan.folders.append(target_dir)
+
+        next_suffix = {}
+        for name in names:
+            destination_name = name
+            if name.lower() in taken:
+                base, ext = os.path.splitext(name)
+                key = (base.lower(), ext.lower())
+                counter = next_suffix.get(key, 1)
+                while f"{base}_{counter}{ext}".lower() in taken:
+                    counter += 1
+                destination_name = f"{base}_{counter}{ext}"
+                next_suffix[key] = counter + 1
+            taken.add(destination_name.lower())
+            plan.moves.append((os.path.join(folder, name), os.path.join(target_dir, destination_name)))
+        plan.counts[category] = len(names)
+
+    plan.plan_ms = (time.perf_counter() - start) * 1000
+    return plan
+
+
+def _move_batch(moves: List[Tuple[int, str, str]]) -> Tuple[List[int], List[Tuple[str, str]]]:
+    moved, errors = [], []
+    for index, source, destination in moves:
+        try:
+            # Source and destination share a volume, so a rename is the whole move
+            os.rename(source, destination)
+            moved.append(index)
+        except OSError as e:
+            errors.append((source, str(e)))
+    return moved, errors
+
+
+def execute_plan(plan: OrganizePlan, workers: int = DEFAULT_WORKERS,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 on_moved: Optional[Callable[[List[int]], None]] = None) -> Dict:
+    """
+    Create the category folders once, then run the moves in batches on a thread pool.
+    progress(done, total) is called from the calling thread, at most every
+    PROGRESS_INTERVAL seconds and once at the end; on_moved(indices) gets the
+    plan.moves indices of every finished batch (for the file journal).
+    Returns {"moved", "errors", "seconds"}
+    """
+    start = time.perf_counter()
+    for folder in plan.folders:
+        os.makedirs(folder, exist_ok=True)
+
+    total = len(plan.moves)
+    indexed = [(i, source, destination) for i, (source, destination) in enumerate(plan.moves)]
+    batches = [indexed[i:i + BATCH_SIZE] for i in range(0, total, BATCH_SIZE)]
+    moved, errors, done = 0, [], 0
+    last_report = time.perf_counter()
+    if batches:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches))),
+                                thread_name_prefix="kore-organize") as pool:
+            futures = {pool.submit(_move_batch, batch): len(batch) for batch in batches}
+            for future in as_completed(futures):
+                batch_moved, batch_errors = future.result()
+                moved += len(batch_moved)
+                if on_moved:
+                    on_moved(batch_moved)
+                errors.extend(batch_errors)
+                done += futures[future]
+                if progress and (done == total or time.perf_counter() - last_report >= PROGRESS_INTERVAL):
+                    last_report = time.perf_counter()
+                    progress(done, total)
+
+    return {"moved": moved, "errors": errors, "seconds": time.perf_counter() - start}
@@ -33,6 +33,9 @@ class KoreOverlay(QWidget):
         self.target_pos = QPointF(100, 900)
         
         self.emotion = 'idle'
+        # Timed emotion sequence: (emotion, frames) steps still to play after the current one
+        self.emotion_queue = []
+        self.emotion_timer = 0
         self.blink_timer = 0
         self.look_x = 0
         self.look_y = 0
@@ -141,6 +144,12 @@ class KoreOverlay(QWidget):
         if self.is_listening:
             self.pulse_counter += 1
         
+        # Emotion sequence timer
+        if self.emotion_timer > 0:
+            self.emotion_timer -= 1
+            if self.emotion_timer == 0:
+                self._next_emotion()
+        
         # Thought bubble timer
         if self.thought_display_timer > 0:
             self.thought_display_timer -= 1
@@ -172,8 +181,22 @@ class KoreOverlay(QWidget):
         self.target_pos = QPointF(float(x), float(y))
     
     def set_emotion(self, emotion_state):
+        self.emotion_queue = []
+        self.emotion_timer = 0
         self.emotion = emotion_state
     
+    def play_emotions(self, *steps):
+        """Play (emotion, frames) steps in order on the animation timer, so callers never sleep"""
+        self.emotion_timer = 0
+        self.emotion_queue = list(steps)
+        self._next_emotion()
+    
+    def _next_emotion(self):
+        while self.emotion_queue:
+            self.emotion, self.emotion_timer = self.emotion_queue.pop(0)
+            if self.emotion_timer > 0:
+                return
+    
     def set_listening(self, is_listening):
         """Set listening state"""
         self.is_listening = is_listening
@@ -184,10 +207,17 @@ class KoreOverlay(QWidget):
         """Set speaking state"""
         self.is_speaking = is_speaking
     
-    def show_thought(self, text, duration=180):
+    def show_thought(self, text, duration=180, persistent=False):
         """Display a thought bubble above the sprite"""
         self.current_thought = text
-        self.thought_display_timer = duration  # frames (about 3 seconds at 60fps)
+        # frames (about 3 seconds at 60fps); -1 keeps the bubble until replaced
+        self.thought_display_timer = -1 if persistent else duration
+    
+    def append_thought(self, text, duration=180):
+        """Grow the thought bubble as thought tokens stream in"""
+        self.current_thought += text
+        if self.thought_display_timer >= 0:
+            self.thought_display_timer = duration
     
     def show_text_input(self):
         """Show the text input box"""
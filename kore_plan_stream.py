@@ -0,0 +1,170 @@
+"""
+Kore Streaming Plan Parser
+Incrementally parses the Command Router's JSON answer as fulfillment chunks arrive
+"""
+
+import json
+from typing import Callable, Dict, Optional
+
+ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class StreamingPlanParser:
+    """
+    Feed it answer chunks; it fires callbacks as soon as fields are complete
+
+    on_action(fields) - once, as soon as both "tool" and "parameter" are parsed
+    on_thought(delta) - decoded "thought" text, token by token as it streams
+    """
+
+    def __init__(self, on_action: Optional[Callable[[Dict], None]] = None,
+                 on_thought: Optional[Callable[[str], None]] = None):
+        self.on_action = on_action
+        self.on_thought = on_thought
+
+        self.text = ""          # Everything fed so far
+        self.fields = {}        # Completed top-level fields
+        self.action_fired = False
+
+        self._pos = 0           # Next char of self.text to scan
+        self._started = False   # Seen the opening '{'
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = "key"     # key | colon | value | after_value
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+        self._value_is_string = False
+        self._pending_escape = ""
+        self._pending_surrogate = ""
+
+    def feed(self, chunk: str):
+        """Scan a new chunk of the answer"""
+        self.text += chunk
+        thought_delta = []
+
+        while self._pos < len(self.text):
+            ch = self.text[self._pos]
+
+            if not self._started:
+                # Skip anything before the object, e.g. a ```json fence
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                self._scan_string_char(ch, thought_delta)
+                self._pos += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state == "key":
+                    self._key_start = self._pos
+                elif self._depth == 1 and self._state == "value":
+                    self._value_start = self._pos
+                    self._value_is_string = True
+            elif ch in "{[":
+                if self._depth == 1 and self._state == "value":
+                    self._value_start = self._pos
+                    self._value_is_string = False
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._state == "value" and self._value_start is not None:
+                    self._complete_value(self._pos + 1)
+                elif self._depth == 0:
+                    self._complete_primitive(self._pos)
+            elif ch == ":" and self._depth == 1 and self._state == "colon":
+                self._state = "value"
+                self._value_start = None
+            elif ch == "," and self._depth == 1:
+                self._complete_primitive(self._pos)
+                self._state = "key"
+            elif self._depth == 1 and self._state == "value" and self._value_start is None and not ch.isspace():
+                # Start of a literal: null, true, false or a number
+                self._value_start = self._pos
+                self._value_is_string = False
+
+            self._pos += 1
+
+        if thought_delta and self.on_thought:
+            self.on_thought("".join(thought_delta))
+
+    def _scan_string_char(self, ch: str, thought_delta: list):
+        streaming_thought = (self._depth == 1 and self._state == "value" and self._key == "thought")
+
+        if self._escape:
+            self._escape = False
+            if streaming_thought:
+                self._pending_escape += ch
+                if ch != "u":
+                    self._flush_escape(thought_delta)
+            return
+
+        if self._pending_escape.startswith("\\u"):
+            self._pending_escape += ch
+            if len(self._pending_escape) == 6:
+                self._flush_escape(thought_delta)
+            return
+
+        if ch == "\\":
+            self._escape = True
+            if streaming_thought:
+                self._pending_escape = "\\"
+            return
+
+        if ch == '"':
+            self._in_string = False
+            if self._depth == 1 and self._state == "key":
+                self._key = json.loads(self.text[self._key_start:self._pos + 1])
+                self._state = "colon"
+            elif self._depth == 1 and self._state == "value":
+                self._complete_value(self._pos + 1)
+            return
+
+        if streaming_thought:
+            thought_delta.append(ch)
+
+    def _flush_escape(self, thought_delta: list):
+        raw = self._pending_surrogate + self._pending_escape
+        self._pending_escape = ""
+
+        # Hold a high surrogate until its low half arrives
+        if len(raw) == 6 and 0xD800 <= int(raw[2:], 16) <= 0xDBFF:
+            self._pending_surrogate = raw
+            return
+        self._pending_surrogate = ""
+
+        try:
+            thought_delta.append(json.loads(f'"{raw}"'))
+        except json.JSONDecodeError:
+            thought_delta.append(ESCAPES.get(raw[-1:], raw[-1:]))
+
+    def _complete_primitive(self, end: int):
+        if self._state == "value" and self._value_start is not None and not self._value_is_string:
+            if self.text[self._value_start] not in "{[":
+                self._complete_value(end)
+
+    def _complete_value(self, end: int):
+        raw = self.text[self._value_start:end].strip()
+        self._value_start = None
+        self._state = "after_value"
+
+        try:
+            self.fields[self._key] = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+
+        if not self.action_fired and "tool" in self.fields and "parameter" in self.fields:
+            self.action_fired = True
+            if self.on_action:
+                self.on_action(dict(self.fields))
+
+    @property
+    def complete(self) -> bool:
+        """True once the closing brace of the object was seen"""
+        return self._started and self._depth == 0
@@ -0,0 +1,289 @@
+"""
+Kore Plan Executor
+Runs compound router plans: a DAG of steps, each a local tool or a question for an
+OnDemand specialist (ASK_AGENT). Independent steps run side by side on the command
+scheduler, dependent steps get their predecessors' outputs, and the results are
+merged into one summary for the thought bubble
+"""
+
+import concurrent.futures
+import json
+import re
+import time
+from concurrent.futures import CancelledError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kore_scheduler import TYPED, CommandScheduler, Job
+from kore_tools import ToolResult
+
+PLAN_TOOL = "PLAN"          # router "tool" of a compound plan; the work is in "steps"
+ASK_AGENT_TOOL = "ASK_AGENT"
+MAX_STEPS = 8
+
+# Router agent names -> config["agents"] keys of the OnDemand specialists
+AGENT_KEYS = {
+    "FILE_NAVIGATOR": "agent2_file_navigator",
+    "SYSTEM_MONITOR": "agent3_system_monitor",
+    "WEB_RESEARCH": "agent4_web_research",
+    "CODE_ASSISTANT": "agent5_code_assistant",
+    "VISUAL_AI": "agent6_visual_ai",
+    "CHAT": "agent7_conversational",
+}
+
+# "{step_id}" in a parameter is replaced with that step's output
+PLACEHOLDER = re.compile(r"\{([A-Za-z0-9_\-]+)\}")
+
+
+class PlanError(ValueError):
+    """The router's steps do not form a runnable plan"""
+
+
+class PlanStep:
+    """One node of the plan"""
+
+    def __init__(self, step_id: str, tool: str, parameter: Any = None, agent: str = "UNKNOWN",
+                 after: Optional[List[str]] = None, thought: Optional[str] = None):
+        self.id = step_id
+        self.tool = tool
+        self.parameter = parameter
+        self.agent = agent
+        self.after = list(after or [])
+        self.thought = thought
+
+    def __repr__(self):
+        return f"PlanStep({self.id!r}, {self.tool}, after={self.after})"
+
+
+class PlanGraph:
+    """Validated steps in dependency order"""
+
+    def __init__(self, steps: List[PlanStep], thought: Optional[str] = None):
+        self.steps = steps
+        self.thought = thought
+        self.by_id = {step.id: step for step in steps}
+
+    @staticmethod
+    def is_compound(plan: Optional[Dict]) -> bool:
+        return bool(plan) and isinstance(plan.get("steps"), list) and bool(plan["steps"])
+
+    @classmethod
+    def from_plan(cls, plan: Dict) -> "PlanGraph":
+        """
+        From the router's answer:
+            {"tool": "PLAN", "steps": [{"id": "disk", "tool": "SYSTEM_INFO", "parameter": "disk"},
+                                       {"id": "tips", "tool": "ASK_AGENT", "after": ["disk"],
+                                        "parameter": {"agent": "SYSTEM_MONITOR", "query": "... {disk}"}}]}
+        """
+        raw = plan.get("steps")
+        if not isinstance(raw, list) or not raw:
+            raise PlanError("plan has no steps")
+        if len(raw) > MAX_STEPS:
+            raise PlanError(f"plan has {len(raw)} steps (at most {MAX_STEPS})")
+
+        steps = []
+        for i, fields in enumerate(raw, 1):
+            if not isinstance(fields, dict) or not fields.get("tool"):
+                raise PlanError(f"step {i} has no tool")
+            after = fields.get("after") or []
+            if isinstance(after, str):
+                after = [after]
+            steps.append(PlanStep(str(fields.get("id") or f"s{i}"), fields["tool"], fields.get("parameter"),
+                                  fields.get("agent", "UNKNOWN"), [str(d) for d in after], fields.get("thought")))
+
+        ids = [step.id for step in steps]
+        if len(set(ids)) != len(ids):
+            raise PlanError("duplicate step ids")
+        for step in steps:
+            unknown = [d for d in step.after if d not in ids]
+            if unknown:
+                raise PlanError(f"step {step.id} waits for unknown step(s) {', '.join(unknown)}")
+
+        return cls(cls._ordered(steps), plan.get("thought"))
+
+    @staticmethod
+    def _ordered(steps: List[PlanStep]) -> List[PlanStep]:
+        """Kahn's algorithm, keeping the router's order among ready steps; rejects cycles"""
+        remaining = {step.id: set(step.after) for step in steps}
+        ordered = []
+        while remaining:
+            ready = [step for step in steps if step.id in remaining and not remaining[step.id]]
+            if not ready:
+                raise PlanError(f"steps {', '.join(remaining)} depend on each other")
+            for step in ready:
+                del remaining[step.id]
+                ordered.append(step)
+            for deps in remaining.values():
+                deps.difference_update(step.id for step in ready)
+        return ordered
+
+
+class StepResult:
+    """What one step produced"""
+
+    def __init__(self, step: PlanStep, result: ToolResult, elapsed_ms: float = 0.0, skipped: bool = False):
+        self.step = step
+        self.result = result
+        self.elapsed_ms = elapsed_ms
+        self.skipped = skipped
+
+    @property
+    def success(self) -> bool:
+        return self.result.success and not self.skipped
+
+    @property
+    def output(self) -> Any:
+        return self.result.output
+
+
+class PlanOutcome:
+    """All step results plus the merged bubble text and spoken reply"""
+
+    def __init__(self, results: List[StepResult], elapsed_ms: float):
+        self.results = results
+        self.elapsed_ms = elapsed_ms
+        self.success = all(r.success for r in results)
+        self.summary, self.speech = merge_summary(results)
+
+    def stats(self) -> Dict:
+        return {
+            "steps": len(self.results),
+            "failed": sum(not r.success and not r.skipped for r in self.results),
+            "skipped": sum(r.skipped for r in self.results),
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "step_ms": round(sum(r.elapsed_ms for r in self.results), 1)
+        }
+
+
+def _as_text(output: Any) -> str:
+    if output is None:
+        return ""
+    return output if isinstance(output, str) else json.dumps(output)
+
+
+def resolve_parameter(step: PlanStep, results: Dict[str, StepResult]) -> Any:
+    """
+    The step's parameter with "{step_id}" replaced by that predecessor's output. A dict
+    parameter that names none of its predecessors gets their outputs as "inputs" instead.
+    """
+    outputs = {step_id: _as_text(results[step_id].output) for step_id in step.after if step_id in results}
+    used = set()
+
+    def fill(value):
+        if isinstance(value, str):
+            def substitute(match):
+                if match.group(1) not in outputs:
+                    return match.group(0)
+                used.add(match.group(1))
+                return outputs[match.group(1)]
+            return PLACEHOLDER.sub(substitute, value)
+        if isinstance(value, dict):
+            return {key: fill(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [fill(item) for item in value]
+        return value
+
+    param = fill(step.parameter)
+    if isinstance(param, dict) and outputs and not used and "inputs" not in param:
+        param["inputs"] = outputs
+    return param
+
+
+def merge_summary(results: List[StepResult]) -> Tuple[str, Optional[str]]:
+    """One bubble line and one spoken sentence for the whole plan"""
+    thoughts, speeches = [], []
+    for r in results:
+        if r.skipped:
+            thoughts.append(f"Skipped {r.step.tool.lower().replace('_', ' ')}")
+            continue
+        if r.result.thought:
+            thoughts.append(r.result.thought)
+        if r.result.speech:
+            speeches.append(r.result.speech.rstrip("."))
+    summary = " | ".join(thoughts) or ("Done" if all(r.success for r in results) else "Something went wrong")
+    speech = ". ".join(speeches) + "." if speeches else None
+    return summary, speech
+
+
+class PlanExecutor:
+    """
+    Runs a PlanGraph:
+        outcome = PlanExecutor(run_step, scheduler).execute(graph)
+    `run_step(step, param)` does one step (normally a tools.dispatch) and returns a ToolResult.
+    Ready steps are submitted to the scheduler together; while they wait for a worker the
+    calling thread runs them itself, so a plan running on a worker can never starve. A
+    failed step skips everything that depends on it. Without a scheduler the steps run
+    one after the other.
+    """
+
+    def __init__(self, run_step: Callable[[PlanStep, Any], ToolResult],
+                 scheduler: Optional[CommandScheduler] = None, priority: int = TYPED):
+        self.run_step = run_step
+        self.scheduler = scheduler
+        self.priority = priority
+
+    def _run(self, step: PlanStep, param: Any) -> StepResult:
+        start = time.perf_counter()
+        try:
+            result = self.run_step(step, param)
+        except Exception as e:
+            print(f"   [Planner] Step {step.id} failed: {e}")
+            result = ToolResult(False, f"Error: {str(e)[:50]}")
+        return StepResult(step, result, (time.perf_counter() - start) * 1000)
+
+    @staticmethod
+    def _collect(job: Job, step: PlanStep) -> StepResult:
+        try:
+            return job.result()
+        except CancelledError:
+            return StepResult(step, ToolResult(False, f"{step.tool} was cancelled"), skipped=True)
+
+    def execute(self, graph: PlanGraph,
+                on_step: Optional[Callable[[StepResult, int, int], None]] = None) -> PlanOutcome:
+        """Run every step; on_step(result, done, total) fires as each one finishes"""
+        start = time.perf_counter()
+        total = len(graph.steps)
+        results: Dict[str, StepResult] = {}
+        jobs: Dict[str, Job] = {}
+        parent = self.scheduler.current_job() if self.scheduler else None
+
+        def finish(step_result: StepResult):
+            results[step_result.step.id] = step_result
+            print(f"   [Planner] {step_result.step.id} ({step_result.step.tool}) "
+                  f"{'skipped' if step_result.skipped else 'ok' if step_result.success else 'failed'}"
+                  f" in {step_result.elapsed_ms:.0f} ms")
+            if on_step:
+                on_step(step_result, len(results), total)
+
+        while len(results) < total:
+            # Start every step whose predecessors are done (graph order is dependency order)
+            for step in graph.steps:
+                if step.id in results or step.id in jobs or any(d not in results for d in step.after):
+                    continue
+                if any(not results[d].success for d in step.after) or (parent is not None and parent.cancelled):
+                    finish(StepResult(step, ToolResult(False), skipped=True))
+                    continue
+                param = resolve_parameter(step, results)
+                job = self.scheduler.submit(self._run, step, param, priority=self.priority) if self.scheduler else None
+                if job is None:
+                    finish(self._run(step, param))
+                else:
+                    jobs[step.id] = job
+
+            if not jobs:
+                continue
+
+            # Help out: a step still waiting for a free worker runs here instead
+            for job in list(jobs.values()):
+                if self.scheduler.run_inline(job):
+                    break
+
+            done = [step_id for step_id, job in jobs.items() if job.future.done()]
+            if not done:
+                concurrent.futures.wait([job.future for job in jobs.values()],
+                                        return_when=concurrent.futures.FIRST_COMPLETED)
+                done = [step_id for step_id, job in jobs.items() if job.future.done()]
+            for step_id in done:
+                finish(self._collect(jobs.pop(step_id), graph.by_id[step_id]))
+
+        ordered = [results[step.id] for step in graph.steps]
+        return PlanOutcome(ordered, (time.perf_counter() - start) * 1000)
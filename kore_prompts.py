@@ -0,0 +1,105 @@
+"""
+Kore Prompt Registry
+Versions each agent's fulfillment prompt by content hash and remembers which version
+each chat session already has, so a prompt is sent in full once per session and
+later queries only carry its reference
+"""
+
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+DIGEST_LENGTH = 16      # hex chars of the SHA-256 kept as the prompt reference
+
+
+class PromptVersion:
+    """One version of a named prompt"""
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+        self.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:DIGEST_LENGTH]
+        self.size = len(text.encode("utf-8"))
+
+    def __repr__(self):
+        return f"PromptVersion({self.name!r}, {self.digest}, {self.size} bytes)"
+
+
+class PromptRegistry:
+    """
+    Named prompts by content hash, plus the version bound to each session
+        version = registry.register("System Monitor", PROMPT)   # same text -> same version
+        if registry.bound(session_id) == version.digest: send the reference only
+        else: send the text, then registry.bind(session_id, version)
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, List[PromptVersion]] = {}
+        self._by_digest: Dict[str, PromptVersion] = {}
+        self._sessions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {"binds": 0, "rebinds": 0, "references": 0, "bytes_saved": 0}
+
+    def register(self, name: str, text: str) -> PromptVersion:
+        """The version for this text; a changed prompt becomes the name's new current version"""
+        version = PromptVersion(name, text)
+        with self._lock:
+            known = self._by_digest.get(version.digest)
+            if known is not None:
+                return known
+            self._by_digest[version.digest] = version
+            self._versions.setdefault(name, []).append(version)
+        return version
+
+    def current(self, name: str) -> Optional[PromptVersion]:
+        with self._lock:
+            versions = self._versions.get(name)
+            return versions[-1] if versions else None
+
+    def versions(self, name: str) -> List[PromptVersion]:
+        with self._lock:
+            return list(self._versions.get(name, []))
+
+    def resolve(self, digest: str) -> Optional[PromptVersion]:
+        return self._by_digest.get(digest)
+
+    # ---------- sessions ----------
+
+    def bound(self, session_id: str) -> Optional[str]:
+        """Digest of the prompt the session already has, or None"""
+        return self._sessions.get(session_id)
+
+    def bind(self, session_id: str, version: PromptVersion):
+        """The session has received this prompt in full"""
+        with self._lock:
+            if self._sessions.get(session_id) != version.digest:
+                self._sessions[session_id] = version.digest
+                self.stats["binds"] += 1
+
+    def unbind(self, session_id: str):
+        """Forget the session's prompt (expired session, or the server lost the reference)"""
+        with self._lock:
+            if self._sessions.pop(session_id, None) is not None:
+                self.stats["rebinds"] += 1
+
+    def referenced(self, version: PromptVersion):
+        """A query went out with the reference instead of the text"""
+        with self._lock:
+            self.stats["references"] += 1
+            self.stats["bytes_saved"] += version.size
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return dict(self.stats, prompts=len(self._versions), sessions=len(self._sessions))
+
+
+# Global instance
+_prompt_registry_instance = None
+
+def get_prompt_registry() -> PromptRegistry:
+    """Get or create global prompt registry"""
+    global _prompt_registry_instance
+    if _prompt_registry_instance is None:
+        _prompt_registry_instance = PromptRegistry()
+    return _prompt_registry_instance
@@ -0,0 +1,186 @@
+"""
+Kore Rate Limiter
+One token bucket shared by every OnDemand call (queries, sessions, uploads), usable
+from worker threads and from the asyncio loop, that backs off on 429/503 using the
+server's Retry-After and keeps queue-depth and wait-time metrics
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+
+DEFAULT_RATE = 2.0          # tokens (requests) added per second
+DEFAULT_BURST = 4           # requests that may go out back to back
+DEFAULT_BACKOFF = 1.0       # first pause after a 429/503 without Retry-After
+MAX_BACKOFF = 30.0
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date), None if absent/invalid"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket with reservations: a caller takes its token immediately (the balance
+    may go negative) and is told how long to wait for it, so waiters are served in
+    arrival order and the lock is never held while sleeping
+        delay = bucket.acquire()              # worker threads
+        delay = await bucket.acquire_async()  # event loop
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 max_backoff: float = MAX_BACKOFF,
+                 on_wait: Optional[Callable[[float, int], None]] = None):
+        self.rate = rate
+        self.burst = burst
+        self.max_backoff = max_backoff
+        self.on_wait = on_wait      # called with (seconds, queue depth) before a caller waits
+
+        self._tokens = float(burst)
+        # Refill runs from here; throttled() moves it into the future to pause everyone
+        self._updated = time.monotonic()
+        # Total seconds throttles have pushed refill back; a waiter that sees it grow
+        # while asleep sleeps that much longer, so reservations already handed out pause too
+        self._paused = 0.0
+        self._backoff = DEFAULT_BACKOFF
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.waiting = 0
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.throttles = 0
+        self.last_retry_after = None
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _reserve(self, tokens: float) -> Tuple[float, float]:
+        """
+        Take `tokens` now; returns the seconds until they are actually available and
+        the pause total to hand back to _extra_pause() after sleeping
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            # The balance is back at zero deficit/rate seconds after refill (re)starts
+            deficit = max(-self._tokens, 0.0)
+            delay = max(self._updated + deficit / self.rate - now, 0.0)
+
+            self.acquired += 1
+            if delay > 0:
+                self.delayed += 1
+                self.waiting += 1
+                self.total_wait += delay
+                self.max_wait = max(self.max_wait, delay)
+            depth = self.waiting
+            paused = self._paused
+        if delay > 0 and self.on_wait:
+            self.on_wait(delay, depth)
+        return delay, paused
+
+    def _extra_pause(self, paused: float) -> float:
+        """Seconds a throttle added since `paused` was read"""
+        with self._lock:
+            return self._paused - paused
+
+    def _done_waiting(self):
+        with self._lock:
+            self.waiting -= 1
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Block the calling thread until a token is available; returns the seconds waited"""
+        delay, paused = self._reserve(tokens)
+        if delay > 0:
+            try:
+                waited = delay
+                while delay > 0:
+                    time.sleep(delay)
+                    delay = self._extra_pause(paused)
+                    paused += delay
+                    waited += delay
+            finally:
+                self._done_waiting()
+            return waited
+        return delay
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """Await a token without blocking the event loop; returns the seconds waited"""
+        delay, paused = self._reserve(tokens)
+        if delay > 0:
+            try:
+                waited = delay
+                while delay > 0:
+                    await asyncio.sleep(delay)
+                    delay = self._extra_pause(paused)
+                    paused += delay
+                    waited += delay
+            finally:
+                self._done_waiting()
+            return waited
+        return delay
+
+    def throttled(self, retry_after: Optional[str] = None) -> float:
+        """
+        Record a 429/503: pause every caller, including those already waiting on a
+        reservation, for Retry-After seconds, or for an exponential backoff when the
+        server gave none. Returns the pause in seconds.
+        """
+        pause = parse_retry_after(retry_after)
+        with self._lock:
+            if pause is None:
+                pause = self._backoff
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+            pause = min(pause, self.max_backoff)
+            # Credit the refill up to now first, or the deficit it already paid off
+            # would be owed again after the pause
+            now = time.monotonic()
+            self._refill(now)
+            # No refill until the pause is over, and no saved-up burst after it either
+            resume = max(self._updated, now + pause)
+            self._paused += resume - self._updated
+            self._updated = resume
+            self._tokens = min(self._tokens, 0.0)
+            self.throttles += 1
+            self.last_retry_after = pause
+        print(f"   [RateLimit] Server throttled, pausing {pause:.1f}s")
+        return pause
+
+    def succeeded(self):
+        """A request got through; the next throttle starts from the base backoff again"""
+        self._backoff = DEFAULT_BACKOFF
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(min(self.burst, self._tokens + max(time.monotonic() - self._updated, 0.0) * self.rate), 2),
+                "waiting": self.waiting,
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "avg_wait_ms": round(self.total_wait / self.delayed * 1000, 1) if self.delayed else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 1),
+                "throttles": self.throttles,
+                "paused_for": round(max(self._updated - time.monotonic(), 0.0), 2)
+            }
+
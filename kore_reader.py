@@ -0,0 +1,226 @@
+"""
+Kore Streaming File Reader
+Bounded-memory reads for READ_FILE: head, tail, byte ranges and line ranges over
+memory-mapped files, with binary detection and encoding sniffing, so previewing
+a multi-GB log costs the preview, not the file
+"""
+
+import codecs
+import mmap
+import os
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+# Files at least this big are memory-mapped; smaller ones are simply read
+MMAP_THRESHOLD = 1024 * 1024
+SNIFF_BYTES = 8192
+PREVIEW_CHARS = 4000
+
+# The line index keeps one cumulative newline count per chunk, so it costs
+# 8 bytes per MB of file however many lines there are
+INDEX_CHUNK = 1024 * 1024
+
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# Bytes that do not occur in text files (everything below 0x20 except \t \n \f \r and ESC)
+_TEXT_CONTROL = bytes(range(32)).translate(None, b"\t\n\x0c\r\x1b")
+
+
+def sniff_encoding(sample: bytes) -> Tuple[Optional[str], int]:
+    """(encoding, BOM length) for a sample from the start of a file; None means binary"""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+
+    # BOM-less UTF-16 (PowerShell redirects, some logs): every other byte is NUL
+    if len(sample) >= 4:
+        odd_nuls = sample[1::2].count(0) / (len(sample) // 2)
+        even_nuls = sample[0::2].count(0) / ((len(sample) + 1) // 2)
+        if odd_nuls > 0.4 and even_nuls < 0.05:
+            return "utf-16-le", 0
+        if even_nuls > 0.4 and odd_nuls < 0.05:
+            return "utf-16-be", 0
+
+    if b"\x00" in sample:
+        return None, 0
+    control = len(sample) - len(sample.translate(None, _TEXT_CONTROL))
+    if sample and control / len(sample) > 0.1:
+        return None, 0
+
+    try:
+        # A multi-byte character may be cut at the end of the sample
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8", 0
+    except UnicodeDecodeError:
+        return "cp1252", 0
+
+
+class FileReader:
+    """
+    Random access to one file without loading it:
+        with FileReader(path) as reader:
+            reader.head(), reader.tail_lines(50), reader.lines(1000, 20)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self._file = open(path, 'rb')
+        self._map = None
+        if self.size >= MMAP_THRESHOLD:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data = self._map
+        else:
+            self._data = self._file.read()
+
+        self.encoding, self.bom = sniff_encoding(self._read(0, SNIFF_BYTES))
+        self.binary = self.encoding is None
+        # utf-8-sig would prefix the separator with its BOM; the BOM-tagged UTF-16/32 names do not
+        newline_encoding = "utf-8" if self.encoding == "utf-8-sig" else self.encoding or "latin-1"
+        self._newline = "\n".encode(newline_encoding)
+        self._line_counts = None     # array of newline counts before each INDEX_CHUNK
+
+    def close(self):
+        self._data = b""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- bytes ----------
+
+    def _read(self, start: int, end: int) -> bytes:
+        return self._data[max(start, 0):min(end, self.size)]
+
+    def _find(self, needle: bytes, start: int, end: int) -> int:
+        return self._data.find(needle, start, end)
+
+    def _rfind(self, needle: bytes, start: int, end: int) -> int:
+        return self._data.rfind(needle, start, end)
+
+    def _count(self, needle: bytes, start: int, end: int) -> int:
+        """Occurrences in [start, end); mmap has no count(), so count a bounded slice"""
+        return self._read(start, end).count(needle)
+
+    def decode(self, data: bytes) -> str:
+        """Decode a slice, dropping a character cut at either edge"""
+        if self.binary:
+            return data.hex(" ")
+        width = len(self._newline)
+        if width > 1:
+            data = data[:len(data) - len(data) % width]
+        return data.decode(self.encoding, errors="replace").strip("\ufffd\ufeff")
+
+    def read_range(self, start: int, end: int) -> str:
+        """Text of bytes [start, end)"""
+        return self.decode(self._read(start, end))
+
+    # ---------- head / tail ----------
+
+    def head(self, max_bytes: int = PREVIEW_CHARS) -> str:
+        if self.binary:
+            max_bytes //= 3     # Shown as "xx " hex
+        return self.read_range(self.bom, self.bom + max_bytes)
+
+    def tail(self, max_bytes: int = PREVIEW_CHARS) -> str:
+        start = max(self.size - max_bytes, self.bom)
+        width = len(self._newline)
+        return self.read_range(start - (start - self.bom) % width, self.size)
+
+    def tail_lines(self, count: int = 20, max_bytes: int = 1024 * 1024) -> List[str]:
+        """Last `count` lines, scanning backwards at most max_bytes"""
+        end = self.size
+        # Ignore the final newline so "last line" means the last non-empty one
+        if end > self.bom and self._read(end - len(self._newline), end) == self._newline:
+            end -= len(self._newline)
+        floor = max(self.bom, self.size - max_bytes)
+        start, position = floor, end
+        for _ in range(count):
+            position = self._rfind(self._newline, floor, position)
+            if position < 0:
+                start = floor
+                break
+            start = position + len(self._newline)
+        return self.decode(self._read(start, end)).splitlines()[-count:]
+
+    # ---------- lines ----------
+
+    def _build_line_index(self):
+        counts = array('q', [0])
+        for chunk_start in range(self.bom, self.size, INDEX_CHUNK):
+            counts.append(counts[-1] + self._count(self._newline, chunk_start,
+                                                   min(chunk_start + INDEX_CHUNK, self.size)))
+        self._line_counts = counts
+
+    def line_offset(self, line: int) -> Optional[int]:
+        """Byte offset where 0-based `line` starts, or None past the end"""
+        if line <= 0:
+            return self.bom
+        if self._line_counts is None:
+            self._build_line_index()
+        chunk = bisect_right(self._line_counts, line - 1) - 1
+        if chunk >= len(self._line_counts) - 1 and self._line_counts[-1] < line:
+            return None
+        # The wanted newline is inside this chunk; split() finds the n-th one in C
+        chunk_start = self.bom + chunk * INDEX_CHUNK
+        data = self._read(chunk_start, chunk_start + INDEX_CHUNK)
+        remaining = line - self._line_counts[chunk]
+        parts = data.split(self._newline, remaining)
+        if len(parts) <= remaining:
+            return None
+        return chunk_start + len(data) - len(parts[-1])
+
+    def lines(self, start: int, count: int = 50) -> List[str]:
+        """`count` lines starting at 0-based line `start`"""
+        offset = self.line_offset(start)
+        if offset is None:
+            return []
+        end, found = offset, 0
+        while found < count and end < self.size:
+            position = self._find(self._newline, end, self.size)
+            end = self.size if position < 0 else position + len(self._newline)
+            found += 1
+        return self.decode(self._read(offset, end)).splitlines()
+
+    def line_count(self) -> int:
+        if self._line_counts is None:
+            self._build_line_index()
+        total = self._line_counts[-1]
+        # A last line without a trailing newline still counts
+        if self.size > self.bom and self._read(self.size - len(self._newline), self.size) != self._newline:
+            total += 1
+        return total
+
+
+def preview_file(path: str, max_chars: int = PREVIEW_CHARS, start_line: Optional[int] = None,
+                 line_count: int = 50, tail: bool = False) -> Dict:
+    """
+    O(preview) read for READ_FILE: returns {"text", "size", "encoding", "binary", "truncated"}
+    """
+    with FileReader(path) as reader:
+        if start_line is not None:
+            text = "\n".join(reader.lines(max(start_line - 1, 0), line_count))
+        elif tail:
+            text = "\n".join(reader.tail_lines(line_count))
+        else:
+            text = reader.head(max_chars)
+        return {
+            "text": text[:max_chars] if not tail else text[-max_chars:],
+            "size": reader.size,
+            "encoding": reader.encoding,
+            "binary": reader.binary,
+            "truncated": reader.size - reader.bom > max_chars
+        }
@@ -0,0 +1,206 @@
+"""
+Kore Resilience Policy
+Timeouts per OnDemand call type, jittered exponential retries for idempotent calls
+and a circuit breaker that fails fast while the service is down, so a stalled or
+dead endpoint costs one timeout instead of a pile of blocked workers
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+# (connect, read) seconds; for streamed answers the read timeout is the longest
+# allowed gap between chunks, not a cap on the whole answer
+CALL_TIMEOUTS = {
+    "session": (3.05, 10.0),
+    "query": (3.05, 30.0),
+    "upload": (3.05, 60.0),
+    "warmup": (3.05, 5.0),
+}
+
+# Safe to send twice: creating a spare session or a HEAD costs nothing. Queries and
+# uploads are not retried (the agent may already be acting on the first one).
+IDEMPOTENT_CALLS = {"session", "warmup"}
+
+# Worth retrying; 429 and 503 are paced by the rate limiter instead
+RETRY_STATUSES = (500, 502, 504)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling while the breaker is open"""
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n waits uniform(0, min(cap, base * 2**n))"""
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.25, max_delay: float = 4.0):
+        self.attempts = max(attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Closed: calls go through, consecutive failures are counted.
+    Open: after failure_threshold failures every call fails fast for reset_timeout seconds.
+    Half-open: then a single trial call decides between closed and open again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+        self.rejected = 0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_running = False
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.rejected += 1
+            return False
+
+    def success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print("   [Resilience] OnDemand reachable again, circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.trips += 1
+                print(f"   [Resilience] Circuit open after {self.failures} failures, "
+                      f"failing fast for {self.reset_timeout:.0f}s")
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def stats(self) -> Dict:
+        return {"state": self.state, "failures": self.failures, "trips": self.trips, "rejected": self.rejected}
+
+
+class ResiliencePolicy:
+    """
+    Timeouts + retries + breaker for one remote service:
+        response = policy.call("session", lambda timeout: http.post(url, timeout=timeout))
+    `send` gets the (connect, read) timeout for the call type and returns a response
+    with a status code; exceptions and 5xx count as failures. For a streamed response
+    pass streamed=True and report stream_done(ok) once the body of a 200 has been read,
+    since a 200 whose stream then stalls is a failure too.
+    """
+
+    def __init__(self, timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+                 retry: Optional[RetryPolicy] = None, breaker: Optional[CircuitBreaker] = None):
+        self.timeouts = dict(CALL_TIMEOUTS)
+        self.timeouts.update({kind: tuple(value) for kind, value in (timeouts or {}).items()})
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.retries = 0
+
+    @classmethod
+    def from_config(cls, settings: Dict) -> "ResiliencePolicy":
+        """From the "resilience" config section: {"timeouts": {...}, "retries": {...}, "breaker": {...}}"""
+        return cls(
+            timeouts=settings.get("timeouts"),
+            retry=RetryPolicy(**settings.get("retries", {})),
+            breaker=CircuitBreaker(**settings.get("breaker", {}))
+        )
+
+    def timeout(self, kind: str) -> Tuple[float, float]:
+        return self.timeouts.get(kind, CALL_TIMEOUTS["query"])
+
+    def _attempts(self, kind: str) -> int:
+        return self.retry.attempts if kind in IDEMPOTENT_CALLS else 1
+
+    @staticmethod
+    def _status(response) -> int:
+        return getattr(response, "status_code", None) or getattr(response, "status", 0)
+
+    def _check_open(self, kind: str):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"OnDemand unavailable, skipped {kind} call")
+
+    def stream_done(self, ok: bool):
+        """Outcome of a streamed call once its body has been read (or has failed)"""
+        if ok:
+            self.breaker.success()
+        else:
+            self.breaker.failure()
+
+    def call(self, kind: str, send: Callable[[Tuple[float, float]], object], streamed: bool = False):
+        """Blocking call with timeout, retries (idempotent kinds only) and the breaker"""
+        attempts = self._attempts(kind)
+        for attempt in range(attempts):
+            self._check_open(kind)
+            try:
+                response = send(self.timeout(kind))
+            except Exception:
+                self.breaker.failure()
+                if attempt + 1 >= attempts:
+                    raise
+            else:
+                if self._status(response) < 500:
+                    # Only a 200 has a stream left to read; anything else is settled now
+                    if not streamed or self._status(response) != 200:
+                        self.breaker.success()
+                    return response
+                self.breaker.failure()
+                if attempt + 1 >= attempts or self._status(response) not in RETRY_STATUSES:
+                    return response
+                response.close()
+            self.retries += 1
+            time.sleep(self.retry.delay(attempt))
+
+    async def call_async(self, kind: str, send: Callable[[Tuple[float, float]], Awaitable],
+                         streamed: bool = False):
+        """Same as call() for coroutines; backoff sleeps don't block the loop"""
+        attempts = self._attempts(kind)
+        for attempt in range(attempts):
+            self._check_open(kind)
+            try:
+                response = await send(self.timeout(kind))
+            except Exception:
+                self.breaker.failure()
+                if attempt + 1 >= attempts:
+                    raise
+            else:
+                if self._status(response) < 500:
+                    # Only a 200 has a stream left to read; anything else is settled now
+                    if not streamed or self._status(response) != 200:
+                        self.breaker.success()
+                    return response
+                self.breaker.failure()
+                if attempt + 1 >= attempts or self._status(response) not in RETRY_STATUSES:
+                    return response
+                response.release()
+            self.retries += 1
+            await asyncio.sleep(self.retry.delay(attempt))
+
+    def stats(self) -> Dict:
+        return dict(self.breaker.stats(), retries=self.retries)
@@ -0,0 +1,313 @@
+"""
+Kore Command Scheduler
+A fixed pool of command workers fed from a priority queue (voice before typed before
+background), with superseding of stale queued commands, backpressure callbacks and a
+resource gate for per-tool concurrency limits and per-path serialization
+"""
+
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import CancelledError, Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional
+
+# Priorities: lower runs first
+VOICE = 0
+TYPED = 1
+BACKGROUND = 2
+
+DEFAULT_WORKERS = 4
+MAX_QUEUE = 32
+
+QUEUED, RUNNING, CANCELLED = "queued", "running", "cancelled"
+
+
+class Job:
+    """One scheduled call; `future` resolves with its result (cancelled if superseded)"""
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict, priority: int, key: Optional[str], seq: int):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.seq = seq
+        self.state = QUEUED
+        self.future = Future()
+        # Set when a running job is superseded; long work checks it between steps
+        self.cancel_event = threading.Event()
+
+    def __lt__(self, other: "Job") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def result(self, timeout: Optional[float] = None):
+        return self.future.result(timeout)
+
+    def _run(self):
+        try:
+            self.future.set_result(self.fn(*self.args, **self.kwargs))
+        except BaseException as e:
+            # Nobody may be waiting on the result, so failures are always logged
+            print(f"   [Scheduler] {getattr(self.fn, '__name__', self.fn)} failed: {e}")
+            self.future.set_exception(e)
+
+
+class ResourceGate:
+    """
+    Concurrency limits by name plus per-path locks:
+        with gate.hold("MOVE_FILE", limit=None, paths=[src, dst]): ...
+    Paths are normalized and locked in sorted order, so two operations on the same
+    file run one after the other while unrelated ones run side by side
+    """
+
+    def __init__(self):
+        self._limits = {}       # name -> Semaphore
+        self._paths = {}        # normalized path -> [Lock, holders]
+        self._lock = threading.Lock()
+
+    def _semaphore(self, name: str, limit: int) -> threading.Semaphore:
+        with self._lock:
+            if name not in self._limits:
+                self._limits[name] = threading.BoundedSemaphore(limit)
+            return self._limits[name]
+
+    def _path_lock(self, path: str) -> threading.Lock:
+        with self._lock:
+            entry = self._paths.setdefault(path, [threading.Lock(), 0])
+            entry[1] += 1
+            return entry[0]
+
+    def _release_path(self, path: str):
+        with self._lock:
+            entry = self._paths[path]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._paths[path]
+
+    @staticmethod
+    def normalize(path: str) -> str:
+        return os.path.normcase(os.path.abspath(os.path.expanduser(path)))
+
+    @contextmanager
+    def hold(self, name: str, limit: Optional[int] = None, paths: Iterable[str] = ()):
+        keys = sorted({self.normalize(p) for p in paths if p})
+        semaphore = self._semaphore(name, limit) if limit else None
+        locks = []
+        if semaphore:
+            semaphore.acquire()
+        try:
+            for key in keys:
+                lock = self._path_lock(key)
+                lock.acquire()
+                locks.append((key, lock))
+            yield
+        finally:
+            for key, lock in reversed(locks):
+                lock.release()
+                self._release_path(key)
+            if semaphore:
+                semaphore.release()
+
+
+class CommandScheduler:
+    """
+    Bounded worker pool over a priority queue:
+        job = scheduler.submit(handle_plan, plan, speak, priority=TYPED, key="open chrome")
+    A queued job with the same key as a newer one is cancelled (superseded). When the
+    queue is full the lowest-priority queued job is dropped if the new one outranks it,
+    otherwise the new job is rejected (submit returns None).
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_queue: int = MAX_QUEUE,
+                 on_backlog: Optional[Callable[[int], None]] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.on_backlog = on_backlog    # called with the queue depth when a job has to wait
+        self.gate = ResourceGate()
+
+        self._heap = []
+        self._keys = {}             # key -> newest queued/running Job
+        self._depth = 0             # queued jobs (the heap also holds cancelled/claimed ones)
+        self._busy = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._local = threading.local()
+        self._stopped = False
+
+        self.submitted = 0
+        self.superseded = 0
+        self.rejected = 0
+
+    # ---------- submitting ----------
+
+    def submit(self, fn: Callable, *args, priority: int = TYPED, key: Optional[str] = None, **kwargs) -> Optional[Job]:
+        with self._cond:
+            if self._stopped:
+                return None
+            self._start_workers()
+            job = Job(fn, args, kwargs, priority, key, next(self._seq))
+
+            if key is not None and key in self._keys:
+                self._cancel(self._keys[key])
+                self.superseded += 1
+
+            if self._depth >= self.max_queue and not self._evict_below(priority):
+                self.rejected += 1
+                print(f"   [Scheduler] Queue full ({self._depth}), rejected a command")
+                return None
+
+            heapq.heappush(self._heap, job)
+            self._depth += 1
+            if key is not None:
+                self._keys[key] = job
+            self.submitted += 1
+            depth = self._depth
+            waiting = self._busy + depth > self.workers
+            self._cond.notify()
+
+        if waiting and self.on_backlog:
+            self.on_backlog(depth)
+        return job
+
+    def _evict_below(self, priority: int) -> bool:
+        """Cancel the lowest-priority, newest queued job if it ranks below `priority`"""
+        queued = [job for job in self._heap if job.state == QUEUED]
+        if not queued:
+            return False
+        worst = max(queued)
+        if worst.priority <= priority:
+            return False
+        self._cancel(worst)
+        return True
+
+    def _cancel(self, job: Job):
+        """Cancel a queued job outright, or flag a running one (caller holds the lock)"""
+        job.cancel_event.set()
+        if job.state == QUEUED:
+            job.state = CANCELLED
+            job.future.cancel()
+            self._depth -= 1
+        if job.key is not None and self._keys.get(job.key) is job:
+            del self._keys[job.key]
+
+    def cancel(self, key: str) -> bool:
+        """Cancel the queued or running job with this key"""
+        with self._cond:
+            job = self._keys.get(key)
+            if job is None:
+                return False
+            self._cancel(job)
+            return True
+
+    # ---------- running ----------
+
+    def _claim(self, job: Job) -> bool:
+        """Move a queued job to running (caller holds the lock)"""
+        if job.state != QUEUED:
+            return False
+        job.state = RUNNING
+        job.future.set_running_or_notify_cancel()
+        self._depth -= 1
+        return True
+
+    def _execute(self, job: Job):
+        previous = getattr(self._local, "job", None)
+        self._local.job = job
+        try:
+            job._run()
+        finally:
+            self._local.job = previous
+            with self._cond:
+                if job.key is not None and self._keys.get(job.key) is job:
+                    del self._keys[job.key]
+
+    def wait(self, job: Job, timeout: Optional[float] = None):
+        """
+        Result of a job (None if it was cancelled); a worker waiting on a job nobody has
+        started yet runs it itself, so workers blocked on each other can never exhaust the pool
+        """
+        with self._cond:
+            inline = getattr(self._local, "job", None) is not None and self._claim(job)
+        if inline:
+            self._execute(job)
+        try:
+            return job.result(timeout)
+        except CancelledError:
+            return None
+
+    def run_inline(self, job: Job) -> bool:
+        """Run a job nobody has started yet on this thread; False if a worker already has it"""
+        with self._cond:
+            claimed = self._claim(job)
+        if claimed:
+            self._execute(job)
+        return claimed
+
+    def current_job(self) -> Optional[Job]:
+        """Job running on this thread, if any"""
+        return getattr(self._local, "job", None)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = None
+                while job is None:
+                    while not self._heap and not self._stopped:
+                        self._cond.wait()
+                    if self._stopped:
+                        return
+                    candidate = heapq.heappop(self._heap)
+                    if self._claim(candidate):
+                        job = candidate
+                self._busy += 1
+            try:
+                self._execute(job)
+            finally:
+                with self._cond:
+                    self._busy -= 1
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._worker, daemon=True,
+                                      name=f"kore-command-{len(self._threads)}")
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Cancel everything queued and let the workers exit once their current job is done"""
+        with self._cond:
+            self._stopped = True
+            for job in self._heap:
+                if job.state == QUEUED:
+                    self._cancel(job)
+            self._heap = []
+            self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "queued": self._depth,
+                "busy": self._busy,
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "superseded": self.superseded,
+                "rejected": self.rejected
+            }
+
+
+# Global instance
+_scheduler_instance = None
+
+def get_scheduler() -> CommandScheduler:
+    """Get or create the global command scheduler"""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = CommandScheduler()
+    return _scheduler_instance
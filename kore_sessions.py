@@ -0,0 +1,221 @@
+"""
+Kore Session Pool
+Pre-creates OnDemand chat sessions for every agent configured in config["agents"]
+(per_agent sessions each), renews them in the background before they expire and
+hands them out to concurrent callers, so no request waits for session creation
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+ROUTER_AGENT = "agent1_command_router"
+
+DEFAULT_TTL = 30 * 60           # seconds a session is used before it is replaced
+REFRESH_MARGIN = 2 * 60         # renew this long before the TTL runs out
+CHECK_INTERVAL = 15.0           # seconds between background refresh passes
+
+
+def is_configured(agent_id: Optional[str]) -> bool:
+    """False for missing IDs and the PASTE_AGENT_N_ID_HERE / AGENT_N_ID placeholders"""
+    return bool(agent_id) and not agent_id.startswith(("PASTE_", "AGENT_"))
+
+
+class PooledSession:
+    """One chat session and when it has to be replaced"""
+
+    def __init__(self, session_id: str, agent_key: str, ttl: float):
+        self.session_id = session_id
+        self.agent_key = agent_key
+        self.created_at = time.monotonic()
+        self.expires_at = self.created_at + ttl
+        self.uses = 0
+
+    def expired(self, margin: float = 0.0, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.monotonic()) >= self.expires_at - margin
+
+
+class SessionPool:
+    """
+    Sessions per agent key ("agent1_command_router", "agent4_web_research", ...)
+        session_id = pool.get("agent4_web_research")   # pooled, or created now if none
+        session_id = pool.peek(ROUTER_AGENT)           # pooled or None, never blocks
+    `create(agent_key)` opens one session on the server and returns its ID (or None).
+    Concurrent callers share an agent's sessions (least used first); only one of them
+    creates a session when the agent has none left.
+    """
+
+    def __init__(self, create: Callable[[str], Optional[str]], agents: Dict[str, str],
+                 per_agent: int = 1, ttl: float = DEFAULT_TTL, refresh_margin: float = REFRESH_MARGIN,
+                 check_interval: float = CHECK_INTERVAL):
+        self.create = create
+        self.agents = [key for key, agent_id in agents.items() if is_configured(agent_id)]
+        self.per_agent = max(per_agent, 1)
+        self.ttl = ttl
+        self.refresh_margin = min(refresh_margin, ttl / 2)
+        self.check_interval = check_interval
+
+        self._sessions: Dict[str, List[PooledSession]] = {key: [] for key in self.agents}
+        self._lock = threading.Lock()
+        self._creating: Dict[str, threading.Lock] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.stats = {"hits": 0, "misses": 0, "created": 0, "renewed": 0, "failed": 0, "invalidated": 0}
+
+    @classmethod
+    def from_config(cls, create: Callable[[str], Optional[str]], config: Dict) -> "SessionPool":
+        """From the "agents" and "sessions" config sections"""
+        settings = config.get("sessions", {})
+        return cls(
+            create, config.get("agents", {}),
+            per_agent=settings.get("per_agent", 1),
+            ttl=settings.get("ttl_seconds", DEFAULT_TTL),
+            refresh_margin=settings.get("refresh_margin", REFRESH_MARGIN),
+            check_interval=settings.get("check_interval", CHECK_INTERVAL)
+        )
+
+    # ---------- handing out ----------
+
+    def _take(self, agent_key: str) -> Optional[str]:
+        with self._lock:
+            now = time.monotonic()
+            live = [s for s in self._sessions.get(agent_key, []) if not s.expired(now=now)]
+            if not live:
+                return None
+            session = min(live, key=lambda s: s.uses)
+            session.uses += 1
+            return session.session_id
+
+    def peek(self, agent_key: str = ROUTER_AGENT) -> Optional[str]:
+        """A live pooled session for the agent, or None; never creates one"""
+        session_id = self._take(agent_key)
+        if session_id:
+            self.stats["hits"] += 1
+        return session_id
+
+    def get(self, agent_key: str = ROUTER_AGENT) -> Optional[str]:
+        """A live session for the agent, creating one (once, for all waiting callers) if needed"""
+        session_id = self._take(agent_key)
+        if session_id:
+            self.stats["hits"] += 1
+            return session_id
+
+        self.stats["misses"] += 1
+        with self._creation_lock(agent_key):
+            # Someone else may have created it while we waited
+            session_id = self._take(agent_key)
+            if session_id:
+                return session_id
+            session = self._open(agent_key)
+            if session is None:
+                return None
+            session.uses += 1
+            self._add(session)
+            return session.session_id
+
+    def add(self, agent_key: str, session_id: str):
+        """Pool a session created elsewhere (e.g. by the async client)"""
+        self._add(PooledSession(session_id, agent_key, self.ttl))
+
+    def invalidate(self, session_id: str):
+        """Drop a session the server no longer accepts"""
+        with self._lock:
+            for key, sessions in self._sessions.items():
+                kept = [s for s in sessions if s.session_id != session_id]
+                if len(kept) != len(sessions):
+                    self._sessions[key] = kept
+                    self.stats["invalidated"] += 1
+
+    def clear(self):
+        with self._lock:
+            for key in self._sessions:
+                self._sessions[key] = []
+
+    def _add(self, session: PooledSession):
+        with self._lock:
+            self._sessions.setdefault(session.agent_key, []).append(session)
+
+    def _creation_lock(self, agent_key: str) -> threading.Lock:
+        with self._lock:
+            return self._creating.setdefault(agent_key, threading.Lock())
+
+    def _open(self, agent_key: str) -> Optional[PooledSession]:
+        try:
+            session_id = self.create(agent_key)
+        except Exception as e:
+            print(f"   [Sessions Error] {agent_key}: {e}")
+            session_id = None
+        if not session_id:
+            self.stats["failed"] += 1
+            return None
+        self.stats["created"] += 1
+        return PooledSession(session_id, agent_key, self.ttl)
+
+    # ---------- keeping warm ----------
+
+    def refresh(self, agent_key: str) -> int:
+        """Drop expired sessions, renew the ones about to expire and top up to per_agent"""
+        with self._creation_lock(agent_key):
+            with self._lock:
+                now = time.monotonic()
+                sessions = [s for s in self._sessions.get(agent_key, []) if not s.expired(now=now)]
+                self._sessions[agent_key] = sessions
+                fresh = [s for s in sessions if not s.expired(self.refresh_margin, now)]
+                missing = self.per_agent - len(fresh)
+                stale = [s for s in sessions if s not in fresh]
+
+            created = 0
+            for _ in range(missing):
+                session = self._open(agent_key)
+                if session is None:
+                    break
+                with self._lock:
+                    # The new session takes over from the oldest one about to expire
+                    if stale:
+                        self._sessions[agent_key].remove(stale.pop(0))
+                        self.stats["renewed"] += 1
+                    self._sessions[agent_key].append(session)
+                created += 1
+            return created
+
+    def fill(self) -> int:
+        """Bring every agent up to per_agent live sessions, agents in parallel"""
+        if not self.agents:
+            return 0
+        with ThreadPoolExecutor(max_workers=len(self.agents), thread_name_prefix="kore-sessions") as pool:
+            return sum(pool.map(self.refresh, self.agents))
+
+    def start(self) -> threading.Thread:
+        """Pre-create sessions for every agent and keep them fresh in the background"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="kore-sessions", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def _run(self):
+        created = self.fill()
+        print(f"   [Sessions] {created} sessions ready for {len(self.agents)} agents")
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.fill()
+            except Exception as e:
+                print(f"   [Sessions Error] Refresh failed: {e}")
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            agents = {
+                key: [{"id": s.session_id[:8], "uses": s.uses, "expires_in": round(s.expires_at - now)}
+                      for s in sessions]
+                for key, sessions in self._sessions.items()
+            }
+        return dict(self.stats, agents=agents)
@@ -0,0 +1,228 @@
+"""
+Kore Speculative Prefetch
+While the Command Router is thinking, guesses the likely tool from the (partial)
+command text and starts cheap, side-effect-free preparation for it on the command
+scheduler at background priority: a file-index lookup for FIND_FILE, an app-catalog
+resolution for OPEN_APP, a system-info snapshot for SYSTEM_INFO. When the router's
+plan runs the same tool with the same parameter, the tool takes the prepared result
+instead of doing the work again; anything not taken is discarded with the command.
+"""
+
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kore_intent import OPEN_VERBS, SYSTEM_INFO_TERMS, get_intent_matcher
+from kore_scheduler import BACKGROUND, CommandScheduler, Job, get_scheduler
+
+MAX_GUESSES = 3         # preparations started per command
+FIND_PATTERN = re.compile(r"^(?:find|locate|where is|where's|search for|look for) (?:my |the )?(.+)$")
+
+
+def normalize_parameter(param: Any) -> str:
+    """Matching key for a parameter: "Report.PDF", "my report.pdf " and "report.pdf" agree"""
+    text = re.sub(r"\s+", " ", str(param or "").lower()).strip().rstrip("?!.,;:")
+    for prefix in ("my ", "the "):
+        if text.startswith(prefix):
+            text = text[len(prefix):]
+    return text
+
+
+class Prefetch:
+    """One speculative preparation and its timing"""
+
+    def __init__(self, tool: str, param: Any, command: str):
+        self.tool = tool
+        self.param = param
+        self.command = command
+        self.job: Optional[Job] = None
+        self.elapsed_ms = 0.0       # how long the preparation itself took
+        self.finished = False
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.tool, normalize_parameter(self.param))
+
+
+class Speculator:
+    """
+    Preparers by tool name, plus the preparations in flight:
+        @speculator.preparer("FIND_FILE", ready=lambda: index.ready)
+        def prepare_find_file(param): return find_file_in_system(param)
+
+        speculator.speculate(command)          # while the router is asked
+        path = speculator.take("FIND_FILE", param, lambda: find_file_in_system(param))
+        speculator.discard(command)            # when the command is done
+    Preparers must not change anything the user can see: they only look things up.
+    """
+
+    def __init__(self, scheduler: CommandScheduler, classify: Optional[Callable[[str], Optional[Dict]]] = None,
+                 max_guesses: int = MAX_GUESSES):
+        self.scheduler = scheduler
+        self.classify = classify        # the local intent matcher's best guess, if any
+        self.max_guesses = max_guesses
+
+        self.preparers: Dict[str, Tuple[Callable[[Any], Any], Optional[Callable[[], bool]]]] = {}
+        self._active: Dict[Tuple[str, str], Prefetch] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {"started": 0, "hits": 0, "misses": 0, "saved_ms": 0.0, "wasted_ms": 0.0}
+
+    def preparer(self, tool: str, ready: Optional[Callable[[], bool]] = None):
+        """Decorator: register the preparation for a tool; `ready()` False skips it for now"""
+        def decorator(fn):
+            self.preparers[tool] = (fn, ready)
+            return fn
+        return decorator
+
+    # ---------- guessing ----------
+
+    def guess(self, text: str) -> List[Tuple[str, Any]]:
+        """Likely (tool, parameter) pairs for a full or partial command, best first"""
+        text = re.sub(r"\s+", " ", text.lower()).strip().rstrip("?!.,;:")
+        guesses = []
+
+        if self.classify:
+            try:
+                candidate = self.classify(text)
+            except Exception:
+                candidate = None
+            if candidate and candidate.get("parameter") not in (None, "null"):
+                guesses.append((candidate["tool"], candidate["parameter"]))
+
+        match = FIND_PATTERN.match(text)
+        if match:
+            guesses.append(("FIND_FILE", match.group(1)))
+
+        # "why is my cpu so high" is too loose for the intent matcher, not for a snapshot
+        words = set(re.findall(r"[a-z']+", text))
+        for info_type, terms in SYSTEM_INFO_TERMS.items():
+            if words & terms and info_type != "all":
+                guesses.append(("SYSTEM_INFO", info_type))
+                break
+
+        for verb in OPEN_VERBS:
+            if text.startswith(verb + " "):
+                target = normalize_parameter(text[len(verb) + 1:])
+                if target:
+                    # "open X" is an app or a folder; both lookups are cheap
+                    guesses.append(("OPEN_APP", target))
+                    guesses.append(("OPEN_FOLDER", target))
+                break
+
+        unique, seen = [], set()
+        for tool, param in guesses:
+            key = (tool, normalize_parameter(param))
+            if tool in self.preparers and key not in seen:
+                seen.add(key)
+                unique.append((tool, param))
+        return unique[:self.max_guesses]
+
+    # ---------- preparing ----------
+
+    def speculate(self, command: str, text: Optional[str] = None) -> int:
+        """
+        Start preparations for the command (or for `text`, a partial transcript of it);
+        calling again with more text replaces a tool's earlier guess ("find my" ->
+        "find my tax summary"). Returns how many started.
+        """
+        started = []
+        for tool, param in self.guess(text if text is not None else command):
+            prepare, ready = self.preparers[tool]
+            if ready is not None and not ready():
+                continue
+            prefetch = Prefetch(tool, param, command)
+            with self._lock:
+                if prefetch.key in self._active:
+                    continue
+                stale = [p for p in self._active.values()
+                         if p.command == command and p.tool == tool and p not in started]
+                for old in stale:
+                    del self._active[old.key]
+                self._active[prefetch.key] = prefetch
+            for old in stale:
+                self._drop(old)
+            prefetch.job = self.scheduler.submit(self._prepare, prefetch, prepare, priority=BACKGROUND,
+                                                 key=f"speculate:{tool}:{prefetch.key[1]}")
+            if prefetch.job is None:
+                with self._lock:
+                    self._active.pop(prefetch.key, None)
+                continue
+            started.append(prefetch)
+        if started:
+            self.stats["started"] += len(started)
+            print(f"   [Speculate] Preparing {len(started)} likely action(s) for '{(text or command)[:40]}'")
+        return len(started)
+
+    @staticmethod
+    def _prepare(prefetch: Prefetch, prepare: Callable[[Any], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return prepare(prefetch.param)
+        finally:
+            prefetch.elapsed_ms = (time.perf_counter() - start) * 1000
+            prefetch.finished = True
+
+    def take(self, tool: str, param: Any, default: Callable[[], Any]) -> Any:
+        """
+        The prepared result for this tool and parameter (waiting for it if it is still
+        running), or default() when nothing matching was prepared
+        """
+        with self._lock:
+            prefetch = self._active.pop((tool, normalize_parameter(param)), None)
+        if prefetch is None:
+            return default()
+
+        waited = time.perf_counter()
+        try:
+            value = self.scheduler.wait(prefetch.job)
+        except Exception as e:
+            print(f"   [Speculate] Preparation for {tool} failed: {e}")
+            self.stats["misses"] += 1
+            return default()
+        waited_ms = (time.perf_counter() - waited) * 1000
+        if prefetch.job.future.cancelled() or not prefetch.finished:
+            self.stats["misses"] += 1
+            return default()
+
+        saved_ms = max(prefetch.elapsed_ms - waited_ms, 0.0)
+        self.stats["hits"] += 1
+        self.stats["saved_ms"] += saved_ms
+        print(f"   [Speculate] Hit: {tool} prepared ahead, saved {saved_ms:.0f} ms")
+        return value
+
+    def discard(self, command: str) -> int:
+        """Drop the command's preparations the plan did not use"""
+        with self._lock:
+            unused = [p for p in self._active.values() if p.command == command]
+            for prefetch in unused:
+                del self._active[prefetch.key]
+        for prefetch in unused:
+            self._drop(prefetch)
+        return len(unused)
+
+    def _drop(self, prefetch: Prefetch):
+        """Cancel a preparation nobody will take (flags it if it is already running)"""
+        self.scheduler.cancel(f"speculate:{prefetch.tool}:{prefetch.key[1]}")
+        self.stats["misses"] += 1
+        self.stats["wasted_ms"] += prefetch.elapsed_ms
+
+    def snapshot(self) -> Dict:
+        decided = self.stats["hits"] + self.stats["misses"]
+        return dict(self.stats,
+                    hit_rate=round(self.stats["hits"] / decided, 3) if decided else 0.0,
+                    saved_ms=round(self.stats["saved_ms"], 1),
+                    wasted_ms=round(self.stats["wasted_ms"], 1),
+                    active=len(self._active))
+
+
+# Global instance
+_speculator_instance = None
+
+def get_speculator() -> Speculator:
+    """Get or create the global speculator (on the global command scheduler)"""
+    global _speculator_instance
+    if _speculator_instance is None:
+        _speculator_instance = Speculator(get_scheduler(), classify=get_intent_matcher().classify)
+    return _speculator_instance
@@ -0,0 +1,305 @@
+"""
+Kore Streaming Speech Recognition
+Chunked audio capture (microphone or WAV file), energy-based voice activity detection
+for endpointing, and a recognizer backend that turns speech into partial transcripts
+while the user is still talking. The offline backend is Vosk (pip install vosk plus a
+model directory, see VOSK_MODEL_PATH); without it the utterance goes to Google in one
+piece as before, only endpointed by the VAD
+"""
+
+import json
+import os
+import time
+import wave
+from collections import deque
+from typing import Callable, Dict, Iterator, Optional
+
+import numpy as np
+
+try:
+    import vosk
+except ImportError:
+    vosk = None
+
+try:
+    import speech_recognition as sr
+except ImportError:
+    sr = None
+
+SAMPLE_RATE = 16000             # Hz, mono 16-bit PCM everywhere in the pipeline
+FRAME_MS = 30                   # capture / VAD frame
+START_MS = 90                   # voiced audio needed before an utterance starts
+END_SILENCE_MS = 600            # trailing silence that ends it
+MAX_PHRASE_MS = 10000           # hard cap, as phrase_time_limit=10 before
+PRE_ROLL_MS = 300               # audio kept from before the start, so the first word is not clipped
+
+VOSK_MODEL_PATH = os.environ.get("KORE_VOSK_MODEL", "vosk-model")
+
+PartialCallback = Callable[[str], None]
+
+
+def frame_samples(rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS) -> int:
+    return rate * frame_ms // 1000
+
+
+def to_pcm16_mono(data: bytes, rate: int, channels: int, sample_width: int,
+                  target_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Any WAV payload as int16 mono samples at target_rate"""
+    if sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) * 256
+    elif sample_width == 2:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32)
+    elif sample_width == 4:
+        samples = np.frombuffer(data, dtype="<i4").astype(np.float32) / 65536
+    else:
+        raise ValueError(f"unsupported sample width: {sample_width} bytes")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != target_rate and len(samples):
+        positions = np.arange(0, len(samples), rate / target_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return np.clip(samples, -32768, 32767).astype(np.int16)
+
+
+class WavSource:
+    """Frames of a WAV file, for tests and benchmarks without a microphone"""
+
+    def __init__(self, path: str, frame_ms: int = FRAME_MS, realtime: bool = False):
+        self.path = path
+        self.frame_ms = frame_ms
+        self.realtime = realtime    # sleep one frame per frame, like a live microphone
+
+    def samples(self) -> np.ndarray:
+        with wave.open(self.path, "rb") as wav:
+            data = wav.readframes(wav.getnframes())
+            return to_pcm16_mono(data, wav.getframerate(), wav.getnchannels(), wav.getsampwidth())
+
+    def frames(self) -> Iterator[bytes]:
+        samples = self.samples()
+        step = frame_samples(frame_ms=self.frame_ms)
+        for start in range(0, len(samples) - step + 1, step):
+            if self.realtime:
+                time.sleep(self.frame_ms / 1000)
+            yield samples[start:start + step].tobytes()
+
+
+class MicrophoneSource:
+    """Frames from the default (or given) microphone, opened for one utterance"""
+
+    def __init__(self, frame_ms: int = FRAME_MS, device_index: Optional[int] = None):
+        if sr is None:
+            raise RuntimeError("speech_recognition is not installed")
+        self.frame_ms = frame_ms
+        self.device_index = device_index
+
+    def frames(self) -> Iterator[bytes]:
+        microphone = sr.Microphone(device_index=self.device_index, sample_rate=SAMPLE_RATE,
+                                   chunk_size=frame_samples(frame_ms=self.frame_ms))
+        with microphone as source:
+            while True:
+                yield source.stream.read(source.CHUNK)
+
+
+class EnergyVAD:
+    """
+    Speech / no speech per frame: RMS energy against an adaptive noise floor
+    (ratio times the floor, never below min_rms - the same units as
+    speech_recognition's calibrated energy_threshold)
+    """
+
+    def __init__(self, ratio: float = 3.0, min_rms: float = 300.0, adapt: float = 0.05):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.adapt = adapt
+        self.floor = None
+
+    def rms(self, frame: bytes) -> float:
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        return float(np.sqrt(np.mean(samples * samples))) if len(samples) else 0.0
+
+    def threshold(self) -> float:
+        return max((self.floor or 0.0) * self.ratio, self.min_rms)
+
+    def is_speech(self, frame: bytes) -> bool:
+        rms = self.rms(frame)
+        if self.floor is None:
+            self.floor = rms
+        speech = rms > self.threshold()
+        if not speech:
+            # Only silence moves the floor, so a long sentence cannot raise it
+            self.floor += self.adapt * (rms - self.floor)
+        return speech
+
+
+class VoskBackend:
+    """Offline Kaldi recognizer with partial results"""
+
+    name = "vosk"
+    _models = {}
+
+    def __init__(self, model_path: str = VOSK_MODEL_PATH, rate: int = SAMPLE_RATE):
+        if not self.available(model_path):
+            raise RuntimeError(f"Vosk model not found at {model_path}")
+        if model_path not in self._models:
+            vosk.SetLogLevel(-1)
+            self._models[model_path] = vosk.Model(model_path)
+        self.model = self._models[model_path]
+        self.rate = rate
+        self.recognizer = None
+        self.segments = []
+
+    @staticmethod
+    def available(model_path: str = VOSK_MODEL_PATH) -> bool:
+        return vosk is not None and os.path.isdir(model_path)
+
+    def start(self):
+        self.recognizer = vosk.KaldiRecognizer(self.model, self.rate)
+        self.segments = []
+
+    def accept(self, pcm: bytes) -> Optional[str]:
+        """Feed audio; returns the transcript so far"""
+        if self.recognizer.AcceptWaveform(pcm):
+            self.segments.append(json.loads(self.recognizer.Result()).get("text", ""))
+            return self._join()
+        return self._join(json.loads(self.recognizer.PartialResult()).get("partial", ""))
+
+    def finish(self) -> str:
+        return self._join(json.loads(self.recognizer.FinalResult()).get("text", ""))
+
+    def _join(self, tail: str = "") -> str:
+        return " ".join(part for part in self.segments + [tail] if part).strip()
+
+
+class GoogleBackend:
+    """The whole utterance to Google Speech Recognition at the end, no partials"""
+
+    name = "google"
+
+    def __init__(self, recognizer=None, rate: int = SAMPLE_RATE):
+        if sr is None:
+            raise RuntimeError("speech_recognition is not installed")
+        self.recognizer = recognizer or sr.Recognizer()
+        self.rate = rate
+        self.audio = bytearray()
+
+    def start(self):
+        self.audio = bytearray()
+
+    def accept(self, pcm: bytes) -> Optional[str]:
+        self.audio += pcm
+        return None
+
+    def finish(self) -> str:
+        """Transcript, or "" if nothing intelligible (network errors propagate)"""
+        try:
+            return self.recognizer.recognize_google(sr.AudioData(bytes(self.audio), self.rate, 2))
+        except sr.UnknownValueError:
+            return ""
+
+
+def default_backend(recognizer=None):
+    """Vosk when it and its model are installed, otherwise Google"""
+    if VoskBackend.available():
+        return VoskBackend()
+    return GoogleBackend(recognizer)
+
+
+class StreamingRecognizer:
+    """
+    One utterance from a frame source:
+        text = StreamingRecognizer(backend).listen(source, timeout=8, on_partial=print)
+    Returns None if nobody spoke within `timeout` seconds, "" if the speech was not
+    understood. `timings` holds audio-clock milliseconds of the last utterance
+    (speech start, start of the audio handed to the backend, first partial, endpoint)
+    and the wall time the final result took after the endpoint.
+    """
+
+    def __init__(self, backend, vad: Optional[EnergyVAD] = None, frame_ms: int = FRAME_MS,
+                 start_ms: int = START_MS, end_ms: int = END_SILENCE_MS,
+                 max_phrase_ms: int = MAX_PHRASE_MS, pre_roll_ms: int = PRE_ROLL_MS):
+        self.backend = backend
+        self.vad = vad or EnergyVAD()
+        self.frame_ms = frame_ms
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.max_phrase_ms = max_phrase_ms
+        self.pre_roll_ms = pre_roll_ms
+        self.timings: Dict[str, Optional[float]] = {}
+
+    def listen(self, source, timeout: Optional[float] = None,
+               on_partial: Optional[PartialCallback] = None) -> Optional[str]:
+        self.timings = {"speech_start_ms": None, "fed_from_ms": None, "first_partial_ms": None,
+                        "endpoint_ms": None, "final_ms": None, "partials": 0}
+        pre_roll = deque(maxlen=max(self.pre_roll_ms // self.frame_ms, 1))
+        audio_ms = 0
+        voiced_ms = 0
+        silence_ms = 0
+        speech_start = None
+        last_partial = ""
+
+        frames = source.frames()
+        try:
+            for frame in frames:
+                audio_ms += self.frame_ms
+                speech = self.vad.is_speech(frame)
+
+                if speech_start is None:
+                    pre_roll.append(frame)
+                    voiced_ms = voiced_ms + self.frame_ms if speech else 0
+                    if voiced_ms >= self.start_ms:
+                        speech_start = audio_ms - voiced_ms
+                        self.timings["speech_start_ms"] = speech_start
+                        self.timings["fed_from_ms"] = audio_ms - len(pre_roll) * self.frame_ms
+                        self.backend.start()
+                        feed = list(pre_roll)
+                    elif timeout is not None and audio_ms >= timeout * 1000:
+                        return None
+                    else:
+                        continue
+                else:
+                    feed = [frame]
+
+                for chunk in feed:
+                    partial = self.backend.accept(chunk)
+                    if partial and partial != last_partial:
+                        last_partial = partial
+                        self.timings["partials"] += 1
+                        if self.timings["first_partial_ms"] is None:
+                            self.timings["first_partial_ms"] = audio_ms
+                        if on_partial:
+                            on_partial(partial)
+
+                silence_ms = 0 if speech else silence_ms + self.frame_ms
+                if silence_ms >= self.end_ms or audio_ms - speech_start >= self.max_phrase_ms:
+                    break
+        finally:
+            frames.close()
+
+        if speech_start is None:
+            return None
+
+        self.timings["endpoint_ms"] = audio_ms
+        finish_start = time.perf_counter()
+        text = self.backend.finish()
+        self.timings["final_ms"] = (time.perf_counter() - finish_start) * 1000
+        return text
+
+
+def transcribe_wav(path: str, backend=None, on_partial: Optional[PartialCallback] = None,
+                   realtime: bool = False) -> Optional[str]:
+    """Run a WAV file through the streaming pipeline"""
+    recognizer = StreamingRecognizer(backend or default_backend())
+    return recognizer.listen(WavSource(path, realtime=realtime), on_partial=on_partial)
+
+
+# Test function
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python kore_stream_asr.py utterance.wav [model_dir]")
+        sys.exit(1)
+    backend = VoskBackend(sys.argv[2]) if len(sys.argv) > 2 else default_backend()
+    text = transcribe_wav(sys.argv[1], backend, on_partial=lambda partial: print(f"   [Partial] {partial}"))
+    print(f"   [Final] {text!r}")
@@ -0,0 +1,312 @@
+"""
+Kore System Monitor Sampler
+Background thread that samples CPU, per-core, memory, disk-IO and net-IO at a fixed
+rate into a ring buffer, so get_system_info reads the latest snapshot instantly
+instead of blocking in psutil.cpu_percent(interval=1), and trend questions
+("has CPU been high the last 5 minutes") are answered from history.
+Also keeps a cached view of the network adapters, refreshed from the sampler thread
+when an adapter appears, disappears, goes up or down or changes address
+"""
+
+import socket
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import psutil
+
+DEFAULT_INTERVAL = 2.0           # seconds between samples
+DEFAULT_HISTORY = 15 * 60        # seconds of history kept in the ring buffer
+INTERFACE_TTL = 60.0             # seconds before adapter addresses/state are re-read anyway
+
+# Numeric sample fields that window() averages
+AVERAGED_FIELDS = ("cpu_percent", "memory_percent", "disk_read_bps", "disk_write_bps",
+                   "net_sent_bps", "net_recv_bps")
+
+
+class InterfaceCache:
+    """
+    Adapter addresses, up/down state and link speed from psutil.net_if_addrs() and
+    net_if_stats(); rebuilt when the adapter set, an adapter's up/down state or its
+    addresses change (DHCP renewal, Wi-Fi switch, cable pulled) or the entry gets
+    old, never by opening a socket
+    """
+
+    def __init__(self, ttl: float = INTERFACE_TTL):
+        self.ttl = ttl
+        self.built_at = 0.0
+        self.stats = {"builds": 0, "build_ms": 0.0}
+        self._interfaces = []
+        self._names = frozenset()
+        self._fingerprint = None
+        self.loopback = frozenset()
+        self._lock = threading.Lock()
+
+    def interfaces(self) -> List[Dict]:
+        """All adapters: name, is_up, speed_mbps, mtu, ipv4, ipv6, mac, loopback"""
+        with self._lock:
+            if self.built_at:
+                return self._interfaces
+        return self.rebuild()
+
+    @staticmethod
+    def _read() -> Tuple[Dict, Dict]:
+        addrs = psutil.net_if_addrs()
+        try:
+            nic_stats = psutil.net_if_stats()
+        except Exception:
+            nic_stats = {}
+        return addrs, nic_stats
+
+    @staticmethod
+    def fingerprint(addrs: Dict, nic_stats: Dict) -> Tuple[frozenset, frozenset]:
+        """Up/down state and addresses per adapter; cheap enough to compare on every sample"""
+        return (frozenset((name, stats.isup) for name, stats in nic_stats.items()),
+                frozenset((name, addr.family, addr.address) for name, items in addrs.items() for addr in items))
+
+    def check(self, names):
+        """Called with the adapter names seen by each sample; rebuilds on a change or after the TTL"""
+        addrs, nic_stats = self._read()
+        if (frozenset(names) != self._names or self.fingerprint(addrs, nic_stats) != self._fingerprint
+                or time.time() - self.built_at > self.ttl):
+            self.rebuild(addrs, nic_stats)
+
+    def invalidate(self):
+        with self._lock:
+            self.built_at = 0.0
+
+    def rebuild(self, addrs: Optional[Dict] = None, nic_stats: Optional[Dict] = None) -> List[Dict]:
+        start = time.perf_counter()
+        if addrs is None:
+            addrs, nic_stats = self._read()
+        try:
+            counters = psutil.net_io_counters(pernic=True)
+        except Exception:
+            counters = {}
+
+        interfaces = []
+        for name in sorted(set(addrs) | set(nic_stats)):
+            stats = nic_stats.get(name)
+            ipv4, ipv6, mac = [], [], None
+            for addr in addrs.get(name, []):
+                if addr.family == socket.AF_INET:
+                    ipv4.append(addr.address)
+                elif addr.family == socket.AF_INET6:
+                    ipv6.append(addr.address.split("%")[0])
+                elif addr.family == psutil.AF_LINK:
+                    mac = addr.address
+            flags = getattr(stats, "flags", "") or ""
+            interfaces.append({
+                "name": name,
+                "is_up": bool(stats and stats.isup),
+                "speed_mbps": stats.speed if stats else 0,
+                "mtu": stats.mtu if stats else 0,
+                "ipv4": ipv4,
+                "ipv6": ipv6,
+                "mac": mac,
+                "loopback": "loopback" in flags or "loopback" in name.lower()
+                            or (bool(ipv4) and all(ip.startswith("127.") for ip in ipv4)),
+                "bytes_recv": counters[name].bytes_recv if name in counters else 0
+            })
+
+        with self._lock:
+            self._interfaces = interfaces
+            self._names = frozenset(counters) if counters else frozenset(addrs)
+            self._fingerprint = self.fingerprint(addrs, nic_stats)
+            self.loopback = frozenset(interface["name"] for interface in interfaces if interface["loopback"])
+            self.built_at = time.time()
+        self.stats["builds"] += 1
+        self.stats["build_ms"] = (time.perf_counter() - start) * 1000
+        return interfaces
+
+    def primary_ip(self) -> Optional[str]:
+        """IPv4 address of the busiest connected, non-loopback adapter"""
+        candidates = [
+            (interface["bytes_recv"], ip)
+            for interface in self.interfaces()
+            if interface["is_up"] and not interface["loopback"]
+            for ip in interface["ipv4"]
+            if not ip.startswith("169.254.")    # APIPA: no DHCP answer, not really connected
+        ]
+        return max(candidates)[1] if candidates else None
+
+
+class SystemSampler:
+    """
+    Fixed-rate sampler with a bounded history; every sample is a dict:
+    time, cpu_percent, per_cpu, memory_percent, memory_available,
+    disk_read_bps, disk_write_bps, net_sent_bps, net_recv_bps,
+    nic_bps ({adapter: [sent_bps, recv_bps]})
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, history: float = DEFAULT_HISTORY):
+        self.interval = max(interval, 0.1)
+        self.samples = deque(maxlen=max(int(history / self.interval), 1))
+        self.stats = {"samples": 0, "sample_ms": 0.0, "errors": 0}
+        self.interfaces = InterfaceCache()
+
+        self._last_counters = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------- sampling ----------
+
+    def start(self) -> threading.Thread:
+        """Start the sampler thread (no-op when already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        # Prime psutil's CPU baselines so the first real sample covers one interval
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+        self.interfaces.rebuild()
+        self._last_counters = self._read_counters()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="kore-sysmon", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """Stop the sampler thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"   [Sysmon Error] Sample failed: {e}")
+
+    def sample(self) -> Dict:
+        """Take one sample now and append it to the history"""
+        start = time.perf_counter()
+        now = time.time()
+        cpu = psutil.cpu_percent(interval=None)
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
+        mem = psutil.virtual_memory()
+        counters = self._read_counters()
+
+        sample = {
+            "time": now,
+            "cpu_percent": cpu,
+            "per_cpu": per_cpu,
+            "memory_percent": mem.percent,
+            "memory_available": mem.available,
+        }
+        sample.update(self._rates(self._last_counters, counters))
+        self._last_counters = counters
+        if counters["net"] is not None:
+            self.interfaces.check(counters["net"])
+
+        with self._lock:
+            self.samples.append(sample)
+        self.stats["samples"] += 1
+        self.stats["sample_ms"] = (time.perf_counter() - start) * 1000
+        return sample
+
+    @staticmethod
+    def _read_counters() -> Dict:
+        counters = {"time": time.monotonic(), "disk": None, "net": None}
+        try:
+            counters["disk"] = psutil.disk_io_counters()
+        except Exception:
+            pass    # No disks or counters disabled (e.g. 'diskperf -N' on Windows)
+        try:
+            counters["net"] = psutil.net_io_counters(pernic=True)
+        except Exception:
+            pass
+        return counters
+
+    def _rates(self, before: Optional[Dict], after: Dict) -> Dict:
+        """Bytes/second between two counter readings; 0.0 when a counter is missing or wrapped"""
+        rates = {"disk_read_bps": 0.0, "disk_write_bps": 0.0, "net_sent_bps": 0.0, "net_recv_bps": 0.0,
+                 "nic_bps": {}}
+        if not before:
+            return rates
+        elapsed = after["time"] - before["time"]
+        if elapsed <= 0:
+            return rates
+        if before["disk"] is not None and after["disk"] is not None:
+            rates["disk_read_bps"] = max(after["disk"].read_bytes - before["disk"].read_bytes, 0) / elapsed
+            rates["disk_write_bps"] = max(after["disk"].write_bytes - before["disk"].write_bytes, 0) / elapsed
+        if before["net"] is not None and after["net"] is not None:
+            # Adapters that appeared since the last sample have no baseline yet
+            for name, now in after["net"].items():
+                then = before["net"].get(name)
+                if then is None:
+                    continue
+                sent = max(now.bytes_sent - then.bytes_sent, 0) / elapsed
+                recv = max(now.bytes_recv - then.bytes_recv, 0) / elapsed
+                rates["nic_bps"][name] = [sent, recv]
+                if name in self.interfaces.loopback:
+                    continue
+                rates["net_sent_bps"] += sent
+                rates["net_recv_bps"] += recv
+        return rates
+
+    # ---------- reading ----------
+
+    def latest(self) -> Optional[Dict]:
+        """Most recent sample, or None before the first interval has passed"""
+        with self._lock:
+            return self.samples[-1] if self.samples else None
+
+    def history(self, seconds: Optional[float] = None) -> List[Dict]:
+        """Samples from the last `seconds` (all history when None), oldest first"""
+        with self._lock:
+            samples = list(self.samples)
+        if seconds is None:
+            return samples
+        cutoff = time.time() - seconds
+        return [sample for sample in samples if sample["time"] >= cutoff]
+
+    def window(self, seconds: float) -> Dict:
+        """Averages and peaks over the last `seconds`; empty when there are no samples yet"""
+        samples = self.history(seconds)
+        if not samples:
+            return {}
+        result = {"samples": len(samples), "seconds": round(samples[-1]["time"] - samples[0]["time"], 1)}
+        for field in AVERAGED_FIELDS:
+            values = [sample[field] for sample in samples]
+            result[f"{field}_avg"] = sum(values) / len(values)
+            result[f"{field}_max"] = max(values)
+        cores = len(samples[-1]["per_cpu"])
+        per_cpu = [sample["per_cpu"] for sample in samples if len(sample["per_cpu"]) == cores]
+        result["per_cpu_avg"] = [round(sum(core) / len(per_cpu), 1) for core in zip(*per_cpu)]
+        return result
+
+    def sustained_above(self, field: str, threshold: float) -> float:
+        """Seconds that `field` has stayed above `threshold`, counting back from the latest sample"""
+        with self._lock:
+            samples = list(self.samples)
+        since = None
+        for sample in reversed(samples):
+            if sample[field] <= threshold:
+                break
+            since = sample["time"]
+        if since is None:
+            return 0.0
+        return samples[-1]["time"] - since + self.interval
+
+
+# Global instance
+_sampler_instance = None
+
+def get_system_sampler(interval: float = DEFAULT_INTERVAL, history: float = DEFAULT_HISTORY) -> SystemSampler:
+    """Get or create the global sampler and make sure its thread is running"""
+    global _sampler_instance
+    if _sampler_instance is None:
+        _sampler_instance = SystemSampler(interval=interval, history=history)
+    if not _sampler_instance.running:
+        _sampler_instance.start()
+    return _sampler_instance
@@ -0,0 +1,147 @@
+"""
+Kore Lookup Tables
+Static name -> target tables shared by kore_control and the local intent matcher
+"""
+
+import os
+
+# Common applications mapping (spoken name -> executable or URI)
+APP_MAP = {
+    # Basic Windows Apps
+    "notepad": "notepad.exe",
+    "calculator": "calc.exe",
+    "paint": "mspaint.exe",
+    "cmd": "cmd.exe",
+    "command prompt": "cmd.exe",
+    "powershell": "powershell.exe",
+    "explorer": "explorer.exe",
+    "file explorer": "explorer.exe",
+    
+    # Browsers
+    "chrome": "chrome.exe",
+    "google chrome": "chrome.exe",
+    "firefox": "firefox.exe",
+    "edge": "msedge.exe",
+    "microsoft edge": "msedge.exe",
+    "internet explorer": "iexplore.exe",
+    
+    # Windows Settings & Control Panel
+    "settings": "ms-settings:",
+    "windows settings": "ms-settings:",
+    "control panel": "control.exe",
+    "control": "control.exe",
+    
+    # Specific Settings Pages
+    "wifi settings": "ms-settings:network-wifi",
+    "network settings": "ms-settings:network",
+    "bluetooth settings": "ms-settings:bluetooth",
+    "sound settings": "ms-settings:sound",
+    "display settings": "ms-settings:display",
+    "personalization": "ms-settings:personalization",
+    "privacy settings": "ms-settings:privacy",
+    "update settings": "ms-settings:windowsupdate",
+    "storage settings": "ms-settings:storagesense",
+    "apps settings": "ms-settings:appsfeatures",
+    "power settings": "ms-settings:powersleep",
+    "battery settings": "ms-settings:batterysaver",
+    "notifications settings": "ms-settings:notifications",
+    "accounts settings": "ms-settings:yourinfo",
+    "time settings": "ms-settings:dateandtime",
+    "region settings": "ms-settings:regionlanguage",
+    "accessibility settings": "ms-settings:easeofaccess",
+    
+    # System Tools
+    "task manager": "taskmgr.exe",
+    "taskmgr": "taskmgr.exe",
+    "registry editor": "regedit.exe",
+    "regedit": "regedit.exe",
+    "system information": "msinfo32.exe",
+    "msinfo32": "msinfo32.exe",
+    "device manager": "devmgmt.msc",
+    "disk management": "diskmgmt.msc",
+    "services": "services.msc",
+    "event viewer": "eventvwr.msc",
+    "performance monitor": "perfmon.exe",
+    "resource monitor": "resmon.exe",
+    
+    # Office & Productivity
+    "word": "winword.exe",
+    "excel": "excel.exe",
+    "powerpoint": "powerpnt.exe",
+    "outlook": "outlook.exe",
+    "onenote": "onenote.exe",
+    "teams": "teams.exe",
+    "microsoft teams": "teams.exe",
+    
+    # Media
+    "media player": "wmplayer.exe",
+    "windows media player": "wmplayer.exe",
+    "movies": "ms-video:",
+    "photos": "ms-photos:",
+    "camera": "microsoft.windows.camera:",
+    "voice recorder": "ms-voicerecorder:",
+    
+    # Accessories
+    "snipping tool": "SnippingTool.exe",
+    "snip": "SnippingTool.exe",
+    "screenshot": "SnippingTool.exe",
+    "sticky notes": "ms-stickynotes:",
+    "notes": "ms-stickynotes:",
+    "magnifier": "magnify.exe",
+    "narrator": "narrator.exe",
+    "on-screen keyboard": "osk.exe",
+    "character map": "charmap.exe",
+    
+    # Store & Xbox
+    "store": "ms-windows-store:",
+    "microsoft store": "ms-windows-store:",
+    "xbox": "xbox:",
+    "xbox game bar": "xbox:",
+    
+    # Communication
+    "mail": "outlookmail:",
+    "calendar": "outlookcal:",
+    "skype": "skype.exe",
+    
+    # Development
+    "visual studio code": "code.exe",
+    "vscode": "code.exe",
+    "vs code": "code.exe",
+    "visual studio": "devenv.exe",
+    "git bash": "git-bash.exe",
+    
+    # Other
+    "clock": "ms-clock:",
+    "alarms": "ms-clock:",
+    "weather": "bingweather:",
+    "maps": "bingmaps:",
+    "news": "bingnews:",
+    "cortana": "ms-cortana:",
+}
+
+def get_folder_map():
+    """Common folder mappings (spoken name -> path) for the current user"""
+    # Get username for dynamic paths
+    username = os.environ.get('USERNAME', 'User')
+    
+    return {
+        "downloads": f"C:\\Users\\{username}\\Downloads",
+        "documents": f"C:\\Users\\{username}\\Documents",
+        "desktop": f"C:\\Users\\{username}\\Desktop",
+        "pictures": f"C:\\Users\\{username}\\Pictures",
+        "videos": f"C:\\Users\\{username}\\Videos",
+        "music": f"C:\\Users\\{username}\\Music",
+        "onedrive": f"C:\\Users\\{username}\\OneDrive",
+        "appdata": f"C:\\Users\\{username}\\AppData",
+        "temp": os.environ.get('TEMP', f"C:\\Users\\{username}\\AppData\\Local\\Temp"),
+        "program files": "C:\\Program Files",
+        "program files (x86)": "C:\\Program Files (x86)",
+        "windows": "C:\\Windows",
+        "system32": "C:\\Windows\\System32",
+        "users": "C:\\Users",
+        "c:": "C:\\",
+        "d:": "D:\\",
+        "this pc": "::{20D04FE0-3AEA-1069-A2D8-08002B30309D}",
+        "recycle bin": "::{645FF040-5081-101B-9F08-00AA002F954E}",
+        "network": "::{F02C1A0D-BE21-4350-88B0-7367FC96EF3C}"
+    }
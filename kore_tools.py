@@ -0,0 +1,153 @@
+"""
+Kore Tool Registry
+Table-driven dispatch for the actions the agents can pick: each tool registers a
+handler plus metadata (destructive, idempotent, cacheable, expected latency,
+parameter schema, bubble messages) and every call is timed
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ProgressCallback = Callable[[str], None]
+
+# A call slower than this multiple of its expected latency is logged as slow
+SLOW_FACTOR = 3
+
+
+class ToolResult:
+    """What a handler reports back: success plus the bubble text and spoken reply"""
+
+    def __init__(self, success: bool, thought: Optional[str] = None, speech: Optional[str] = None,
+                 duration: int = 120, output: Any = None):
+        self.success = success
+        self.thought = thought
+        self.speech = speech
+        self.duration = duration    # bubble frames, as in KoreOverlay.show_thought
+        # What dependent plan steps receive (the full answer, a path, ...); defaults to the thought
+        self.output = output if output is not None else thought
+
+
+class Tool:
+    """One registered action"""
+
+    def __init__(self, name: str, handler: Callable[[Any, ProgressCallback], ToolResult],
+                 start: Optional[str] = None, destructive: bool = False, idempotent: bool = True,
+                 cacheable: bool = True, expected_ms: int = 500, schema: Optional[Dict] = None,
+                 concurrency: Optional[int] = None, serialize_paths: bool = False):
+        self.name = name
+        self.handler = handler
+        self.start = start              # persistent bubble while running; "{param}" is filled in
+        self.destructive = destructive  # deletes, kills or overwrites something
+        self.idempotent = idempotent    # running it twice leaves the same result as once
+        self.cacheable = cacheable      # router plans for it may be replayed from the plan cache
+        self.expected_ms = expected_ms
+        self.schema = schema            # JSON schema of the parameter (None: free-form string)
+        self.concurrency = concurrency  # max calls running at once (None: unlimited)
+        self.serialize_paths = serialize_paths  # calls touching the same path run one at a time
+
+        self.calls = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def start_message(self, param) -> Optional[str]:
+        if not self.start:
+            return None
+        return self.start.format(param=param) if "{param}" in self.start else self.start
+
+    def paths(self, param) -> List[str]:
+        """Paths a call locks: the string parameter, or the path/source/destination fields"""
+        if not self.serialize_paths or not param or param == "null":
+            return []
+        if isinstance(param, dict):
+            return [param[key] for key in ("path", "source", "destination") if param.get(key)]
+        return [str(param)]
+
+    def accepts(self, param) -> bool:
+        """Cheap shape check of the parameter against the schema"""
+        if not self.schema:
+            return True
+        if self.schema.get("type") == "object":
+            return isinstance(param, dict) and all(key in param for key in self.schema.get("required", []))
+        return True
+
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 1),
+            "last_ms": round(self.last_ms, 1),
+            "expected_ms": self.expected_ms
+        }
+
+
+class ToolRegistry:
+    """Name -> Tool table; dispatch is a dict lookup followed by a timed handler call"""
+
+    def __init__(self):
+        self.tools = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, **metadata):
+        """Decorator: @registry.register("OPEN_APP", start="Opening {param}...", expected_ms=800)"""
+        def decorator(handler):
+            self.tools[name] = Tool(name, handler, **metadata)
+            return handler
+        return decorator
+
+    def get(self, name: str) -> Optional[Tool]:
+        return self.tools.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.tools
+
+    def names(self) -> List[str]:
+        return list(self.tools)
+
+    def uncacheable(self) -> List[str]:
+        return [name for name, tool in self.tools.items() if not tool.cacheable]
+
+    def dispatch(self, name: str, param, progress: Optional[ProgressCallback] = None) -> ToolResult:
+        """Run the tool's handler; unknown tools and handler exceptions come back as failures"""
+        tool = self.tools.get(name)
+        if tool is None:
+            return ToolResult(False, f"Unknown action: {name}")
+        if not tool.accepts(param):
+            return ToolResult(False, f"Missing details for {name.lower().replace('_', ' ')}")
+
+        start = time.perf_counter()
+        try:
+            result = tool.handler(param, progress or (lambda message: None))
+        except Exception as e:
+            print(f"   [Execution Error] {e}")
+            result = ToolResult(False, f"Error: {str(e)[:50]}", duration=180)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            tool.calls += 1
+            tool.failures += not result.success
+            tool.total_ms += elapsed_ms
+            tool.max_ms = max(tool.max_ms, elapsed_ms)
+            tool.last_ms = elapsed_ms
+
+        slow = " (slow)" if elapsed_ms > tool.expected_ms * SLOW_FACTOR else ""
+        print(f"   [Tools] {name} {'ok' if result.success else 'failed'} in {elapsed_ms:.0f} ms{slow}")
+        return result
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {name: tool.stats() for name, tool in self.tools.items() if tool.calls}
+
+
+# Global instance
+_registry_instance = None
+
+def get_tool_registry() -> ToolRegistry:
+    """Get or create the global tool registry"""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = ToolRegistry()
+    return _registry_instance
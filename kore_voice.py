@@ -2,6 +2,10 @@ import speech_recognition as sr
 import pyttsx3
 import threading
 import queue
+import time
+
+from kore_stream_asr import EnergyVAD, MicrophoneSource, StreamingRecognizer, default_backend
+from kore_wakeword import WAKEWORD_PATH, WakeWordDetector
 
 class KoreVoice:
     """Handles speech recognition and text-to-speech for Kore"""
@@ -21,6 +25,16 @@ class KoreVoice:
             self.recognizer.adjust_for_ambient_noise(source, duration=1)
         print("   [Voice] Ready!")
         
+        # Streaming recognition: VAD endpointing, partial transcripts with the offline backend
+        self.asr = StreamingRecognizer(default_backend(self.recognizer),
+                                       vad=EnergyVAD(min_rms=self.recognizer.energy_threshold))
+        print(f"   [Voice] Speech backend: {self.asr.backend.name}")
+        
+        # Offline wake word spotter once enrolled (python kore_wakeword.py enroll kore1.wav ...)
+        self.wake_detector = WakeWordDetector.load()
+        if self.wake_detector is None:
+            print(f"   [Voice] No wake word enrollment at {WAKEWORD_PATH}, using cloud transcription")
+        
         # Queue for speech output to avoid blocking
         self.speech_queue = queue.Queue()
         self.speech_thread = threading.Thread(target=self._speech_worker, daemon=True)
@@ -68,27 +82,25 @@ class KoreVoice:
             except Exception as e:
                 print(f"   [Voice Error] {e}")
     
-    def listen_once(self, timeout=5):
-        """Listen for a single command"""
+    def listen_once(self, timeout=5, on_partial=None):
+        """
+        Listen for a single command, streamed: the utterance ends on trailing silence
+        and on_partial(text) gets the transcript so far while the user is still talking
+        """
         print("   [Voice] Listening...")
         
         try:
-            with self.microphone as source:
-                # Listen for audio
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
+            text = self.asr.listen(MicrophoneSource(), timeout=timeout, on_partial=on_partial)
             
-            # Recognize speech using Google Speech Recognition
-            print("   [Voice] Processing...")
-            text = self.recognizer.recognize_google(audio)
-            print(f"   [Voice] Heard: {text}")
+            if text is None:
+                print("   [Voice] Timeout - no speech detected")
+                return None
+            if not text:
+                print("   [Voice] Could not understand audio")
+                return None
+            print(f"   [Voice] Heard: {text} (final result in {self.asr.timings['final_ms']:.0f} ms)")
             return text
             
-        except sr.WaitTimeoutError:
-            print("   [Voice] Timeout - no speech detected")
-            return None
-        except sr.UnknownValueError:
-            print("   [Voice] Could not understand audio")
-            return None
         except sr.RequestError as e:
             print(f"   [Voice] Recognition error: {e}")
             return None
@@ -98,6 +110,22 @@ class KoreVoice:
     
     def listen_for_wake_word(self, callback):
         """Continuously listen for wake word in background"""
+        def spot_loop():
+            print(f"   [Voice] Listening for wake word '{self.wake_word}' (offline)...")
+            
+            while True:
+                try:
+                    # wait() releases the microphone before the callback listens for the command
+                    score = self.wake_detector.wait(MicrophoneSource())
+                    if score is not None:
+                        print(f"   [Voice] Wake word detected! (score {score:.2f})")
+                        self.wake_detector.reset()
+                        callback()
+                        
+                except Exception as e:
+                    print(f"   [Voice] Wake word error: {e}")
+                    time.sleep(1)
+        
         def listen_loop():
             print(f"   [Voice] Listening for wake word '{self.wake_word}'...")
             
@@ -123,7 +151,7 @@ class KoreVoice:
                     continue
         
         # Run in background thread
-        wake_thread = threading.Thread(target=listen_loop, daemon=True)
+        wake_thread = threading.Thread(target=spot_loop if self.wake_detector else listen_loop, daemon=True)
         wake_thread.start()
     
     def stop_speaking(self):
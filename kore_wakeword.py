@@ -0,0 +1,360 @@
+"""
+Kore Wake Word Detector
+Local keyword spotting for "kore" without sending audio anywhere: MFCCs computed
+with NumPy on streaming 10 ms hops, matched against a few enrolled recordings of
+the wake word by online subsequence DTW (one row of the DTW matrix per hop, so the
+cost is a handful of small vector operations per 10 ms). A detection fires when the
+best normalized match distance drops below a threshold set by the sensitivity.
+Each enrollment recording is also stored with background noise mixed in, so a noisier
+room than the one enrolled in still matches.
+
+Enroll once from WAV recordings of yourself saying the wake word:
+    python kore_wakeword.py enroll kore1.wav kore2.wav kore3.wav
+"""
+
+import os
+import wave
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from kore_stream_asr import SAMPLE_RATE, to_pcm16_mono
+
+WIN_MS = 25
+HOP_MS = 10
+N_FFT = 512
+N_MELS = 40
+N_MFCC = 20                 # c0 (loudness) is dropped before matching
+PRE_EMPHASIS = 0.97
+NOISE_ADAPT = 0.05          # how fast the background noise estimate follows quiet frames
+
+DEFAULT_SENSITIVITY = 0.5
+THRESHOLD_RANGE = (0.9, 1.6)    # match distance accepted at sensitivity 0 and 1
+WARP_PENALTY = 0.5          # extra local cost (fraction) for stretching or skipping template frames
+REFRACTORY_MS = 1000        # no second detection right after one
+MIN_TEMPLATE_MS = 150
+ENROLL_NOISE_DB = (15.0, 8.0)   # SNRs of the noisy copies added for each enrollment recording
+WAKEWORD_PATH = os.environ.get("KORE_WAKEWORD", "kore_wakeword.npz")
+
+
+def hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+
+
+def mel_to_hz(mel):
+    return 700.0 * (10 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+
+def mel_filterbank(n_mels: int = N_MELS, n_fft: int = N_FFT, rate: int = SAMPLE_RATE,
+                   fmin: float = 20.0, fmax: Optional[float] = None) -> np.ndarray:
+    """Triangular filters, shape (n_mels, n_fft // 2 + 1)"""
+    fmax = fmax or rate / 2
+    edges = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def dct_matrix(n_out: int = N_MFCC, n_in: int = N_MELS) -> np.ndarray:
+    """Orthonormal DCT-II, shape (n_out, n_in)"""
+    k = np.arange(n_out)[:, None]
+    n = np.arange(n_in)[None, :]
+    matrix = np.cos(np.pi * k * (2 * n + 1) / (2 * n_in)) * np.sqrt(2.0 / n_in)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+class MFCC:
+    """
+    Log-mel / MFCC features, streaming (push samples as they arrive, get the
+    frames completed so far) or for a whole signal at once
+    """
+
+    def __init__(self, rate: int = SAMPLE_RATE, win_ms: int = WIN_MS, hop_ms: int = HOP_MS,
+                 n_fft: int = N_FFT, n_mels: int = N_MELS, n_mfcc: int = N_MFCC):
+        self.win = rate * win_ms // 1000
+        self.hop = rate * hop_ms // 1000
+        self.n_fft = n_fft
+        self.window = np.hamming(self.win).astype(np.float32)
+        self.filters = mel_filterbank(n_mels, n_fft, rate)
+        self.dct = dct_matrix(n_mfcc, n_mels)
+        self.reset()
+
+    def reset(self):
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._last = 0.0
+        self.noise = None
+        self.loud = np.zeros(0, dtype=bool)     # per row of the last push: above the noise
+
+    def log_mel(self, frames: np.ndarray) -> np.ndarray:
+        spectrum = np.abs(np.fft.rfft(frames * self.window, self.n_fft)) ** 2
+        mel = spectrum @ self.filters.T + 1e-6
+        self.loud = np.zeros(len(mel), dtype=bool)
+        for i, row in enumerate(mel):
+            if self.noise is None:
+                self.noise = row.copy()
+            elif row.sum() < 3 * self.noise.sum():
+                self.noise += NOISE_ADAPT * (row - self.noise)
+            else:
+                self.loud[i] = True
+        return np.log(mel)
+
+    def _frames(self, samples: np.ndarray) -> np.ndarray:
+        count = 1 + (len(samples) - self.win) // self.hop
+        index = np.arange(self.win)[None, :] + self.hop * np.arange(count)[:, None]
+        return samples[index]
+
+    def _emphasize(self, samples: np.ndarray) -> np.ndarray:
+        emphasized = np.empty_like(samples)
+        emphasized[0] = samples[0] - PRE_EMPHASIS * self._last
+        emphasized[1:] = samples[1:] - PRE_EMPHASIS * samples[:-1]
+        self._last = float(samples[-1])
+        return emphasized
+
+    def push(self, samples: np.ndarray) -> np.ndarray:
+        """MFCC rows (n, n_mfcc) for every hop completed by these samples"""
+        if len(samples):
+            samples = self._emphasize(np.asarray(samples, dtype=np.float32) / 32768.0)
+            self._pending = np.concatenate([self._pending, samples])
+        if len(self._pending) < self.win:
+            self.loud = np.zeros(0, dtype=bool)
+            return np.zeros((0, self.dct.shape[0]), dtype=np.float32)
+        frames = self._frames(self._pending)
+        self._pending = self._pending[len(frames) * self.hop:]
+        return self.log_mel(frames) @ self.dct.T
+
+    def compute(self, samples: np.ndarray) -> np.ndarray:
+        """MFCC rows for a whole signal"""
+        self.reset()
+        features = self.push(samples)
+        self.reset()
+        return features
+
+
+def read_wav(path: str) -> np.ndarray:
+    """16 kHz mono int16 samples of a WAV file"""
+    with wave.open(path, "rb") as wav:
+        data = wav.readframes(wav.getnframes())
+        return to_pcm16_mono(data, wav.getframerate(), wav.getnchannels(), wav.getsampwidth())
+
+
+def voiced_range(samples: np.ndarray, win: int, hop: int, above_floor_db: float = 10.0,
+                 below_peak_db: float = 30.0) -> Tuple[int, int]:
+    """Feature frames [start, stop) from the first to the last one clearly louder than the quietest ones"""
+    count = 1 + (len(samples) - win) // hop
+    if count <= 0:
+        return 0, 0
+    power = np.array([np.mean(samples[i * hop:i * hop + win].astype(np.float64) ** 2) for i in range(count)])
+    loudness_db = 10 * np.log10(power + 1e-9)
+    floor = np.percentile(loudness_db, 10)
+    peak = loudness_db.max()
+    voiced = np.where(loudness_db >= min(max(floor + above_floor_db, peak - below_peak_db), peak))[0]
+    return int(voiced[0]), int(voiced[-1]) + 1
+
+
+def add_noise(samples: np.ndarray, snr_db: float, rng: np.random.Generator,
+              reference: Optional[np.ndarray] = None) -> np.ndarray:
+    """Samples plus pink noise at snr_db below the power of reference (default: the samples)"""
+    reference = samples if reference is None else reference
+    spectrum = np.fft.rfft(rng.normal(0, 1, len(samples)))
+    spectrum /= np.sqrt(np.maximum(np.arange(len(spectrum)), 1))
+    noise = np.fft.irfft(spectrum, len(samples))
+    power = np.mean(reference.astype(np.float64) ** 2)
+    noise *= np.sqrt(power / 10 ** (snr_db / 10) / max(np.mean(noise ** 2), 1e-12))
+    return np.clip(samples + noise, -32768, 32767).astype(np.int16)
+
+
+class SpottingDTW:
+    """
+    Online subsequence DTW of an input stream against a set of templates at once
+    (padded into one array): the keyword may start at any input frame and must end at
+    the current one. Steps advance a template by 0, 1 or 2 frames per input frame
+    (0.5x-2x speaking rate, roughly); the uneven ones cost a bit extra so other words
+    are not warped into a match.
+    """
+
+    def __init__(self, templates: List[np.ndarray]):
+        longest = max(len(t) for t in templates)
+        self.templates = np.zeros((len(templates), longest, templates[0].shape[1]), dtype=np.float32)
+        self.padding = np.ones((len(templates), longest), dtype=bool)
+        for i, template in enumerate(templates):
+            self.templates[i, :len(template)] = template
+            self.padding[i, :len(template)] = False
+        self.rows = np.arange(len(templates))
+        self.ends = np.array([len(t) - 1 for t in templates])
+        self.reset()
+
+    def reset(self):
+        self.cost = np.full(self.padding.shape, np.inf, dtype=np.float32)
+        self.length = np.ones(self.padding.shape, dtype=np.float32)
+
+    def step(self, frame: np.ndarray) -> float:
+        """Feed one feature row; returns the best normalized distance of a match ending here"""
+        local = np.sqrt(((self.templates - frame) ** 2).mean(axis=2))
+        local[self.padding] = np.inf
+        candidates = np.full((3,) + self.cost.shape, np.inf, dtype=np.float32)
+        lengths = np.zeros((3,) + self.cost.shape, dtype=np.float32)
+        candidates[0] = self.cost + WARP_PENALTY * local                 # stay on the template frame
+        lengths[0] = self.length
+        candidates[1, :, 1:] = self.cost[:, :-1]                         # advance one
+        lengths[1, :, 1:] = self.length[:, :-1]
+        candidates[2, :, 2:] = self.cost[:, :-2] + WARP_PENALTY * local[:, 2:]   # skip one
+        lengths[2, :, 2:] = self.length[:, :-2]
+
+        # Compare predecessors by average cost so long paths are not penalized
+        best = np.argmin(candidates / np.maximum(lengths, 1.0), axis=0)[None]
+        self.cost = np.take_along_axis(candidates, best, axis=0)[0] + local
+        self.length = np.take_along_axis(lengths, best, axis=0)[0] + 1.0
+
+        # A match may start at this frame
+        self.cost[:, 0] = local[:, 0]
+        self.length[:, 0] = 1.0
+        return float((self.cost[self.rows, self.ends] / self.length[self.rows, self.ends]).min())
+
+
+class WakeWordDetector:
+    """
+    Keyword spotter over enrolled templates:
+        detector = WakeWordDetector.load()
+        if detector.process(pcm_bytes): ...     # feed 16 kHz mono int16 audio in any chunk size
+    sensitivity (0..1) sets the accepted match distance within THRESHOLD_RANGE: higher
+    wakes more easily (fewer false rejects, more false accepts). While the room is
+    quiet for longer than the wake word lasts the DTW is skipped, so idle listening
+    costs little more than the FFTs.
+    """
+
+    def __init__(self, templates: List[np.ndarray], sensitivity: float = DEFAULT_SENSITIVITY,
+                 refractory_ms: int = REFRACTORY_MS):
+        if not templates:
+            raise ValueError("at least one wake word template is needed")
+        self.templates = [np.asarray(t, dtype=np.float32) for t in templates]
+        self.features = MFCC()
+        self.spotter = SpottingDTW([t[:, 1:] for t in self.templates])
+        self.sensitivity = sensitivity
+        self.refractory_hops = refractory_ms // HOP_MS
+        self.max_quiet_hops = max(len(t) for t in self.templates)
+
+        self.last_score = np.inf
+        self._cooldown = 0
+        self._quiet_hops = 0
+        self.stats = {"hops": 0, "skipped": 0, "detections": 0}
+
+    @property
+    def threshold(self) -> float:
+        low, high = THRESHOLD_RANGE
+        return low + (high - low) * self.sensitivity
+
+    # ---------- enrollment ----------
+
+    @classmethod
+    def enroll(cls, samples: Iterable[np.ndarray], noise_snrs: Iterable[float] = ENROLL_NOISE_DB,
+               seed: int = 0, **kwargs) -> "WakeWordDetector":
+        """
+        From recordings of the wake word (int16 sample arrays): silence is trimmed, and
+        each recording also goes in with background noise added at noise_snrs, so a
+        louder room than the one enrolled in still matches
+        """
+        mfcc = MFCC()
+        rng = np.random.default_rng(seed)
+        clean, noisy = [], []
+        for clip in samples:
+            features = mfcc.compute(clip)
+            start, stop = voiced_range(clip, mfcc.win, mfcc.hop)
+            if (stop - start) * HOP_MS < MIN_TEMPLATE_MS:
+                continue
+            clean.append(features[start:stop])
+            speech = clip[start * mfcc.hop:(stop - 1) * mfcc.hop + mfcc.win]
+            for snr_db in noise_snrs:
+                noisy.append(mfcc.compute(add_noise(clip, snr_db, rng, reference=speech))[start:stop])
+        return cls(clean + noisy, **kwargs)
+
+    @classmethod
+    def from_wavs(cls, paths: Iterable[str], **kwargs) -> "WakeWordDetector":
+        return cls.enroll((read_wav(path) for path in paths), **kwargs)
+
+    def save(self, path: str = WAKEWORD_PATH):
+        np.savez(path, **{f"template_{i}": t for i, t in enumerate(self.templates)})
+
+    @classmethod
+    def load(cls, path: str = WAKEWORD_PATH, **kwargs) -> Optional["WakeWordDetector"]:
+        """The enrolled detector, or None if nobody has enrolled yet"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            templates = [data[key] for key in sorted((k for k in data.files if k.startswith("template_")),
+                                                     key=lambda k: int(k.split("_")[1]))]
+            return cls(templates, **kwargs)
+
+    # ---------- detection ----------
+
+    def reset(self):
+        self.features.reset()
+        self.spotter.reset()
+        self._cooldown = 0
+        self._quiet_hops = 0
+
+    def process(self, audio) -> bool:
+        """Feed audio (int16 bytes or samples); True when the wake word just ended"""
+        samples = np.frombuffer(audio, dtype=np.int16) if isinstance(audio, (bytes, bytearray)) else audio
+        detected = False
+        rows = self.features.push(samples)
+        for row, loud in zip(rows, self.features.loud):
+            self.stats["hops"] += 1
+            self._quiet_hops = 0 if loud else self._quiet_hops + 1
+            if self._quiet_hops > self.max_quiet_hops:
+                # Only background noise for longer than any template: no match can end here
+                if self._quiet_hops == self.max_quiet_hops + 1:
+                    self.spotter.reset()
+                self.stats["skipped"] += 1
+                self.last_score = np.inf
+                self._cooldown = max(self._cooldown - 1, 0)
+                continue
+            score = self.spotter.step(row[1:])
+            self.last_score = score
+            if self._cooldown:
+                self._cooldown -= 1
+            elif score < self.threshold:
+                detected = True
+                self.stats["detections"] += 1
+                self._cooldown = self.refractory_hops
+        return detected
+
+    def wait(self, source) -> Optional[float]:
+        """Block on a frame source until the wake word is heard; returns its score (None if the source ends)"""
+        frames = source.frames()
+        try:
+            for frame in frames:
+                if self.process(frame):
+                    return self.last_score
+            return None
+        finally:
+            frames.close()
+
+
+# Enrollment / quick test
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) >= 3 and sys.argv[1] == "enroll":
+        detector = WakeWordDetector.from_wavs(sys.argv[2:])
+        detector.save()
+        print(f"   [WakeWord] Enrolled {len(sys.argv) - 2} recordings ({len(detector.templates)} templates) "
+              f"-> {WAKEWORD_PATH}")
+    elif len(sys.argv) == 3 and sys.argv[1] == "test":
+        from kore_stream_asr import WavSource
+        detector = WakeWordDetector.load()
+        if detector is None:
+            print(f"   [WakeWord] Not enrolled yet ({WAKEWORD_PATH} missing)")
+            sys.exit(1)
+        best, detected = np.inf, False
+        for frame in WavSource(sys.argv[2]).frames():
+            detected = detector.process(frame)
+            best = min(best, detector.last_score)
+            if detected:
+                break
+        print(f"   [WakeWord] {'Detected' if detected else 'Not detected'} "
+              f"(best score {best:.2f}, threshold {detector.threshold:.2f})")
+    else:
+        print("Usage: python kore_wakeword.py enroll kore1.wav kore2.wav ... | test clip.wav")